@@ -0,0 +1,160 @@
+# Import required libraries for the expiry heap, timing, memory estimates, and type hints
+import heapq
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class ActiveQuestion:
+    """A trivia question message whose buttons are still enabled.
+
+    Attributes:
+        interaction_id (int): The ID of the /trivia interaction that posted the question
+        token (str): The interaction token, used to edit the message once it expires
+        question_id (int): The ID of the question in the question bank
+        permutation_id (int): The ID of the answer order shown in the message
+        expires_at (float): time.monotonic() value after which the buttons are disabled
+    """
+    __slots__ = ('interaction_id', 'token', 'question_id', 'permutation_id', 'expires_at')
+
+    def __init__(self, interaction_id: int, token: str, question_id: int, permutation_id: int, expires_at: float):
+        self.interaction_id = interaction_id
+        self.token = token
+        self.question_id = question_id
+        self.permutation_id = permutation_id
+        self.expires_at = expires_at
+
+
+class ActiveQuestionRegistry:
+    """Central, bounded registry of the trivia questions that can still be answered.
+
+    Every question posted by /trivia is registered here instead of keeping a
+    View alive for it. Expiry times are kept in a single heap, so one periodic
+    sweep finds every expired question without a timer task per question.
+    When more than max_active questions are live, the oldest ones are evicted.
+
+    claim() resolves a question atomically: it runs without awaiting, so when
+    several users click at once only the first click wins.
+
+    The registry only tracks state; the caller disables the buttons of the
+    questions returned by add() and pop_expired().
+    """
+
+    def __init__(self, max_active: int = 1000, ttl: float = 600.0):
+        """Initialize an empty registry.
+
+        Args:
+            max_active (int): Maximum number of live questions before the oldest are evicted.
+            ttl (float): Seconds a question stays answerable. Must stay below Discord's
+                       15 minute interaction token lifetime so expired messages can still be edited.
+        """
+        self.max_active = max_active
+        self.ttl = ttl
+        # interaction_id -> question; dictionaries keep insertion order, so the first entry is the oldest
+        self._questions: Dict[int, ActiveQuestion] = {}
+        # (expires_at, interaction_id) pairs; entries of removed questions are skipped lazily
+        self._expiry_heap: List[Tuple[float, int]] = []
+        # Keys of recently answered questions, so repeat clicks are rejected even for questions
+        # that were never registered (for example ones posted before a restart)
+        self._claimed: Dict[int, None] = {}
+        # Lifetime counters
+        self.registered = 0
+        self.evicted = 0
+        self.expired = 0
+        self.resolved = 0
+        self.rejected = 0
+
+    def add(self, interaction_id: int, token: str, question_id: int, permutation_id: int) -> List[ActiveQuestion]:
+        """Register a newly posted question.
+
+        Returns:
+            List[ActiveQuestion]: The oldest questions that were evicted to stay within max_active.
+        """
+        expires_at = time.monotonic() + self.ttl
+        self._questions[interaction_id] = ActiveQuestion(interaction_id, token, question_id, permutation_id, expires_at)
+        heapq.heappush(self._expiry_heap, (expires_at, interaction_id))
+        self.registered += 1
+
+        evicted = []
+        while len(self._questions) > self.max_active:
+            oldest_id = next(iter(self._questions))
+            evicted.append(self._questions.pop(oldest_id))
+            self.evicted += 1
+        return evicted
+
+    def get(self, interaction_id: int) -> Optional[ActiveQuestion]:
+        """Return a live question, or None if it was never registered or is no longer live."""
+        return self._questions.get(interaction_id)
+
+    def claim(self, key: int) -> bool:
+        """Mark a question as answered, if nobody answered it yet.
+
+        Args:
+            key (int): The interaction ID of a registered question, or any other
+                     unique ID of the question message if it isn't registered
+
+        Returns:
+            bool: True for the first click on a question, False for every later click.
+        """
+        if key in self._claimed:
+            self.rejected += 1
+            return False
+        self._claimed[key] = None
+        # Remember about as many answered questions as there can be live ones
+        if len(self._claimed) > self.max_active:
+            del self._claimed[next(iter(self._claimed))]
+        self._questions.pop(key, None)
+        self.resolved += 1
+        return True
+
+    def pop_expired(self, now: Optional[float] = None) -> List[ActiveQuestion]:
+        """Remove and return every question whose TTL has passed.
+
+        Args:
+            now (float, optional): The current time.monotonic() value. Uses the current time if None.
+        """
+        now = time.monotonic() if now is None else now
+        expired = []
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, interaction_id = heapq.heappop(self._expiry_heap)
+            question = self._questions.get(interaction_id)
+            # Skip heap entries of questions that were already answered or evicted
+            if question is not None and question.expires_at == expires_at:
+                del self._questions[interaction_id]
+                expired.append(question)
+                self.expired += 1
+        # Drop stale heap entries if they make up most of the heap
+        if len(self._expiry_heap) > 2 * len(self._questions) + 64:
+            self._expiry_heap = [(q.expires_at, q.interaction_id) for q in self._questions.values()]
+            heapq.heapify(self._expiry_heap)
+        return expired
+
+    def __len__(self) -> int:
+        """Return the number of live questions."""
+        return len(self._questions)
+
+    def memory_bytes(self) -> int:
+        """Estimate the memory held by the registry in bytes."""
+        size = sys.getsizeof(self._questions) + sys.getsizeof(self._expiry_heap) + sys.getsizeof(self._claimed)
+        for question in self._questions.values():
+            size += sys.getsizeof(question) + sys.getsizeof(question.token)
+        # Each heap entry is a 2-tuple of a float and an int
+        size += len(self._expiry_heap) * (sys.getsizeof((0.0, 0)) + sys.getsizeof(0.0))
+        return size
+
+    def metrics(self) -> Dict[str, int]:
+        """Return the registry counters.
+
+        Returns:
+            Dict[str, int]: live, registered, resolved, evicted and expired question counts,
+            the number of rejected repeat clicks, and the estimated memory use in bytes.
+        """
+        return {
+            'live': len(self._questions),
+            'registered': self.registered,
+            'resolved': self.resolved,
+            'evicted': self.evicted,
+            'expired': self.expired,
+            'rejected': self.rejected,
+            'memory_bytes': self.memory_bytes(),
+        }
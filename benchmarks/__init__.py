@@ -0,0 +1,6 @@
+"""
+Offline benchmarks for the trivia bot.
+
+Run them from the repository root, for example:
+    python -m benchmarks.bot_benchmark --users 1000 --concurrency 50
+"""
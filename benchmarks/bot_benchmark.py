@@ -0,0 +1,265 @@
+"""
+Offline load test for the trivia bot's slash commands and buttons.
+
+The bot is built with setup_bot() exactly as in production, but interactions
+are fake objects (see benchmarks/fakes.py), so no Discord connection or token
+is needed. Each scenario runs a number of operations through a pool of
+concurrent workers and reports throughput, p50/p99 latency and peak Python
+memory, so changes to the handlers can be compared before and after. Latency
+is timed with memory tracing off; peak memory comes from a second, traced run
+of the same scenario, since tracing slows every allocation down.
+
+Usage (from the repository root):
+    python -m benchmarks.bot_benchmark --users 1000 10000 --concurrency 1 50
+    python -m benchmarks.bot_benchmark --backend sqlite --json results.json
+"""
+# Import required libraries for the event loop, CLI options, timing, memory tracing, and temp files
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bot import ANSWER_BUTTON_TEMPLATE, HINT_BUTTON_TEMPLATE, AnswerButton, HintButton, LeaderboardView, setup_bot
+from active_questions import ActiveQuestionRegistry
+from benchmarks.fakes import FakeGuild, FakeInteraction, FakeMessage, FakeUser
+from benchmarks.synthetic import build_backend, seed_stats
+from question_bank import ANSWER_LETTERS
+
+# Every scenario the harness can run, in the order they run by default
+SCENARIOS = ('trivia', 'answer', 'hint', 'stats', 'leaderboard', 'leaderboard_page')
+
+# Compiled button templates, used to route a clicked custom ID to its handler
+ANSWER_PATTERN = re.compile(ANSWER_BUTTON_TEMPLATE)
+HINT_PATTERN = re.compile(HINT_BUTTON_TEMPLATE)
+
+GUILD_ID = 1
+
+
+async def click(bot, user: FakeUser, guild: FakeGuild, message: FakeMessage, custom_id: str) -> FakeInteraction:
+    """Click a persistent trivia button, routing it the way discord.py routes dynamic items."""
+    interaction = FakeInteraction(bot, user, guild, message)
+    for item_class, pattern in ((AnswerButton, ANSWER_PATTERN), (HintButton, HINT_PATTERN)):
+        match = pattern.fullmatch(custom_id)
+        if match:
+            item = await item_class.from_custom_id(interaction, None, match)
+            await item.callback(interaction)
+            return interaction
+    raise ValueError(f"No button handles custom ID {custom_id!r}")
+
+
+class Harness:
+    """Drives one bot instance with fake interactions."""
+
+    def __init__(self, users: int, backend: str, directory: str, seed: int = 0,
+                 cached_members: float = 0.5, member_latency: float = 0.0):
+        """Build the bot and its fake guild.
+
+        Args:
+            users (int): Number of users with existing stats, all of them guild members
+            backend (str): Stats backend kind: "csv", "sqlite" or "journal"
+            directory (str): Directory for the stats files
+            seed (int): Seed for every random choice, so runs are repeatable
+            cached_members (float): Fraction of members in the simulated gateway cache
+            member_latency (float): Seconds each simulated member query or fetch takes
+        """
+        self.rng = random.Random(seed)
+        self.users = users
+        stats = seed_stats(users, self.rng, GUILD_ID)
+        self.bot = setup_bot(stats_backend=build_backend(backend, directory, stats))
+        # Keep every posted question live, so evictions don't try to edit messages on Discord
+        self.bot.active_questions = ActiveQuestionRegistry(max_active=10 ** 7)
+        member_ids = range(1, users + 1)
+        cached_ids = [user_id for user_id in member_ids if self.rng.random() < cached_members]
+        self.guild = FakeGuild(GUILD_ID, member_ids, cached_ids, member_latency, member_latency)
+        self.commands = {command.name: command for command in self.bot.tree.get_commands()}
+
+    def random_user(self) -> FakeUser:
+        """Pick a random seeded user."""
+        return FakeUser(self.rng.randint(1, self.users))
+
+    async def command(self, name: str, invoker: FakeUser, **options) -> FakeInteraction:
+        """Invoke a slash command callback with a fake interaction, passing options as keyword arguments."""
+        interaction = FakeInteraction(self.bot, invoker, self.guild)
+        await self.commands[name].callback(interaction, **options)
+        return interaction
+
+    async def post_question(self, user: FakeUser) -> FakeMessage:
+        """Run /trivia and return the posted question message."""
+        interaction = await self.command('trivia', user)
+        return interaction.response.sent_message()
+
+    def operation(self, scenario: str) -> Callable[[], Awaitable[Callable[[], Awaitable[None]]]]:
+        """Return a factory that prepares one operation of a scenario.
+
+        Preparing (for example posting the question an answer click needs) happens
+        before the timed run starts; only the returned coroutine function is timed.
+        """
+        async def trivia():
+            user = self.random_user()
+            return lambda: self.command('trivia', user)
+
+        async def answer():
+            message = await self.post_question(self.random_user())
+            letter = self.rng.choice(ANSWER_LETTERS)
+            custom_id = next(cid for cid in message.custom_ids() if cid.endswith(f':{letter}'))
+            user = self.random_user()
+            return lambda: click(self.bot, user, self.guild, message, custom_id)
+
+        async def hint():
+            message = await self.post_question(self.random_user())
+            custom_id = next(cid for cid in message.custom_ids() if cid.startswith('trivia:hint:'))
+            user = self.random_user()
+            return lambda: click(self.bot, user, self.guild, message, custom_id)
+
+        async def stats():
+            user, target = self.random_user(), self.random_user()
+            return lambda: self.command('stats', user, user=target)
+
+        async def leaderboard():
+            user = self.random_user()
+            return lambda: self.command('leaderboard', user)
+
+        async def leaderboard_page():
+            view = LeaderboardView(self.bot, self.guild)
+            await view.render()
+            # Jump to a random page, then time clicking Next from there
+            pages = max(self.bot.stats_manager.leaderboard_size(GUILD_ID) // view.page_size, 1)
+            view.offset = self.rng.randrange(pages) * view.page_size
+            interaction = FakeInteraction(self.bot, self.random_user(), self.guild, FakeMessage('', view))
+            return lambda: view.next_page.callback(interaction)
+
+        factories = {'trivia': trivia, 'answer': answer, 'hint': hint, 'stats': stats,
+                     'leaderboard': leaderboard, 'leaderboard_page': leaderboard_page}
+        return factories[scenario]
+
+    async def run(self, scenario: str, operations: int, concurrency: int) -> Dict[str, float]:
+        """Run a scenario and measure it.
+
+        Args:
+            scenario (str): One of SCENARIOS
+            operations (int): Total number of timed operations
+            concurrency (int): Number of workers running operations at the same time
+
+        Returns:
+            Dict[str, float]: Throughput in operations per second, latency percentiles
+            in milliseconds (untraced run) and the peak traced memory in bytes during
+            a second, traced run.
+        """
+        latencies, elapsed = await self._run_operations(scenario, operations, concurrency)
+
+        tracemalloc.start()
+        try:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            await self._run_operations(scenario, operations, concurrency)
+            peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'operations': len(latencies),
+            'throughput_ops': len(latencies) / elapsed if elapsed else 0.0,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p99_ms': latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+            'max_ms': latencies[-1] * 1000,
+            'peak_memory_bytes': peak_memory,
+        }
+
+    async def _run_operations(self, scenario: str, operations: int,
+                              concurrency: int) -> Tuple[List[float], float]:
+        """Prepare and run operations through concurrency workers.
+
+        Returns:
+            Tuple[List[float], float]: The latency of every operation and the total elapsed time, in seconds.
+        """
+        prepare = self.operation(scenario)
+        pending = [await prepare() for _ in range(operations)]
+        pending.reverse()
+        latencies: List[float] = []
+
+        async def worker():
+            while pending:
+                run_operation = pending.pop()
+                start = time.perf_counter()
+                await run_operation()
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, time.perf_counter() - started
+
+    def close(self):
+        """Flush and close the stats backend."""
+        self.bot.stats_manager.close()
+
+
+async def run_benchmarks(users_counts: List[int], concurrencies: List[int], scenarios: List[str],
+                         operations: int, backend: str, member_latency: float) -> List[Dict[str, float]]:
+    """Run every scenario for every user count and concurrency level."""
+    results = []
+    for users in users_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            load_started = time.perf_counter()
+            harness = Harness(users, backend, directory, member_latency=member_latency)
+            await harness.bot.wait_for_stats()
+            load_seconds = time.perf_counter() - load_started
+            try:
+                for concurrency in concurrencies:
+                    for scenario in scenarios:
+                        result = await harness.run(scenario, operations, concurrency)
+                        result.update(scenario=scenario, users=users, concurrency=concurrency,
+                                      backend=backend, setup_seconds=load_seconds)
+                        results.append(result)
+            finally:
+                harness.close()
+    return results
+
+
+def format_table(results: List[Dict[str, float]]) -> str:
+    """Format results as a fixed-width text table."""
+    header = f"{'scenario':<17}{'users':>9}{'conc':>6}{'ops/s':>11}{'p50 ms':>9}{'p99 ms':>9}{'peak KiB':>10}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['scenario']:<17}{result['users']:>9}{result['concurrency']:>6}"
+            f"{result['throughput_ops']:>11.0f}{result['p50_ms']:>9.3f}{result['p99_ms']:>9.3f}"
+            f"{result['peak_memory_bytes'] / 1024:>10.0f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Parse the command line, run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description="Offline load test of the trivia bot handlers")
+    parser.add_argument('--users', type=int, nargs='+', default=[1000, 10000], help="Numbers of users with stats")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 50], help="Numbers of concurrent workers")
+    parser.add_argument('--operations', type=int, default=2000, help="Timed operations per scenario")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--backend', choices=('csv', 'sqlite', 'journal'), default='csv')
+    parser.add_argument('--member-latency', type=float, default=0.0,
+                        help="Seconds each simulated member query or fetch takes")
+    parser.add_argument('--json', metavar='FILE', help="Also write the results to a JSON file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    # The handlers log every command at INFO; keep the output readable
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run_benchmarks(args.users, args.concurrency, args.scenarios,
+                                         args.operations, args.backend, args.member_latency))
+
+    print(format_table(results))
+    if args.json == '-':
+        print(json.dumps(results, indent=2))
+    elif args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
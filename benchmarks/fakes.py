@@ -0,0 +1,159 @@
+# Import required libraries for simulated latency, timestamps, and type hints
+import asyncio
+import itertools
+from typing import Any, Dict, Iterable, List, Optional
+
+import discord
+
+# Source of unique snowflake-like IDs for fake interactions and messages
+_ids = itertools.count(10 ** 17)
+
+
+def next_id() -> int:
+    """Return a new unique ID."""
+    return next(_ids)
+
+
+class FakeUser:
+    """The parts of discord.User / discord.Member the handlers use."""
+
+    def __init__(self, user_id: int, name: Optional[str] = None):
+        self.id = user_id
+        self.name = name or f"player{user_id}"
+
+
+class FakeGuild:
+    """A guild whose member lookups behave like a partially cached real guild.
+
+    Members in cached_ids are returned by get_member() without any delay, the
+    rest are only found by query_members() and fetch_member(), which sleep for
+    query_latency and fetch_latency seconds to simulate gateway and REST round trips.
+    """
+
+    def __init__(self, guild_id: int, member_ids: Iterable[int], cached_ids: Iterable[int] = (),
+                 query_latency: float = 0.0, fetch_latency: float = 0.0):
+        self.id = guild_id
+        self.members: Dict[int, FakeUser] = {user_id: FakeUser(user_id) for user_id in member_ids}
+        self.cached_ids = set(cached_ids)
+        self.query_latency = query_latency
+        self.fetch_latency = fetch_latency
+        # Number of simulated network calls, so cache effectiveness can be reported
+        self.query_calls = 0
+        self.fetch_calls = 0
+
+    def get_member(self, user_id: int) -> Optional[FakeUser]:
+        """Return a member from the simulated gateway cache."""
+        return self.members.get(user_id) if user_id in self.cached_ids else None
+
+    async def query_members(self, user_ids: List[int], cache: bool = True) -> List[FakeUser]:
+        """Simulate a bulk gateway member query."""
+        self.query_calls += 1
+        if self.query_latency:
+            await asyncio.sleep(self.query_latency)
+        found = [self.members[user_id] for user_id in user_ids if user_id in self.members]
+        if cache:
+            self.cached_ids.update(member.id for member in found)
+        return found
+
+    async def fetch_member(self, user_id: int) -> FakeUser:
+        """Simulate a REST member fetch."""
+        self.fetch_calls += 1
+        if self.fetch_latency:
+            await asyncio.sleep(self.fetch_latency)
+        member = self.members.get(user_id)
+        if member is None:
+            raise discord.NotFound(_FakeHTTPResponse(404), "Unknown Member")
+        return member
+
+
+class _FakeHTTPResponse:
+    """Just enough of an aiohttp response to build a discord.HTTPException."""
+
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Not Found"
+
+
+class FakeMessage:
+    """A message the bot sent, as seen by a later component interaction."""
+
+    def __init__(self, content: str, view: Optional[discord.ui.View] = None, interaction_id: Optional[int] = None):
+        self.id = next_id()
+        self.content = content
+        self.view = view
+        self.created_at = discord.utils.utcnow()
+        # Component handlers key questions by the ID of the interaction that posted them
+        self.interaction_metadata = _FakeInteractionMetadata(interaction_id) if interaction_id else None
+
+    def custom_ids(self) -> List[str]:
+        """Return the custom IDs of the message's buttons."""
+        if self.view is None:
+            return []
+        return [item.custom_id for item in self.view.children if getattr(item, 'custom_id', None)]
+
+
+class _FakeInteractionMetadata:
+    """The parts of discord.MessageInteractionMetadata the handlers use."""
+
+    def __init__(self, interaction_id: int):
+        self.id = interaction_id
+
+
+class FakeResponse:
+    """Records what a handler sent instead of calling Discord."""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+        self._done = False
+        self.content: Optional[str] = None
+        self.view: Optional[discord.ui.View] = None
+        self.ephemeral = False
+
+    def is_done(self) -> bool:
+        """Return True once the interaction was responded to."""
+        return self._done
+
+    def _respond(self):
+        """Mark the interaction as responded, failing like discord.py does on a second response."""
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        self._done = True
+
+    async def send_message(self, content: Optional[str] = None, *, view: Optional[discord.ui.View] = None,
+                           ephemeral: bool = False, **kwargs: Any):
+        """Record a new message."""
+        self._respond()
+        self.content, self.view, self.ephemeral = content, view, ephemeral
+
+    async def edit_message(self, *, content: Optional[str] = None, view: Optional[discord.ui.View] = None,
+                           **kwargs: Any):
+        """Record an edit of the message the component belongs to."""
+        self._respond()
+        self.content, self.view = content, view
+        if self._interaction.message is not None:
+            if content is not None:
+                self._interaction.message.content = content
+            self._interaction.message.view = view
+
+    async def defer(self, **kwargs: Any):
+        """Record a deferred response."""
+        self._respond()
+
+    def sent_message(self) -> FakeMessage:
+        """Return the message this response created, as a later interaction would see it."""
+        return FakeMessage(self.content or '', self.view, interaction_id=self._interaction.id)
+
+
+class FakeInteraction:
+    """The parts of discord.Interaction the slash command and button handlers use."""
+
+    def __init__(self, client: discord.Client, user: FakeUser, guild: Optional[FakeGuild] = None,
+                 message: Optional[FakeMessage] = None):
+        self.id = next_id()
+        self.token = f"token-{self.id}"
+        self.client = client
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.message = message
+        self.response = FakeResponse(self)
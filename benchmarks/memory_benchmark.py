@@ -0,0 +1,140 @@
+"""
+Memory benchmark of the in-memory stats at large user counts.
+
+For every population size a synthetic CSV stats file is generated and loaded,
+and the memory still held afterwards is reported per user, along with how
+long the load took (measured separately, without memory tracing):
+
+- dicts: the file loaded into one dictionary per user, the layout used before UserStats
+- records: the file loaded into UserStats records, as StatsManager keeps it
+- leaderboard_index: the ranked index StatsManager builds after loading
+- stats_manager: everything a loaded StatsManager holds (records plus indexes)
+
+Usage (from the repository root):
+    python -m benchmarks.memory_benchmark --sizes 10000 100000 1000000
+    python -m benchmarks.memory_benchmark --sizes 1000000 --json memory_results.json
+"""
+# Import required libraries for CLI options, CSV parsing, garbage collection, JSON output, randomness, timing, memory tracing, and temp files
+import argparse
+import csv
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import build_backend, seed_stats
+from leaderboard_index import LeaderboardIndex
+from stats_manager import MIN_LEADERBOARD_QUESTIONS, StatsManager
+from stats_storage import STAT_FIELDS, CSVStatsBackend, StatsKey, UserStats
+
+
+def traced(build: Callable[..., object], *args) -> Tuple[object, int, float]:
+    """Call build(*args) twice: once untraced to time it, then traced to measure the memory its result holds.
+
+    Returns:
+        Tuple[object, int, float]: The result of the traced call, the bytes it holds and the untraced seconds.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, held, elapsed
+
+
+def load_dicts(path: str) -> Dict[StatsKey, Dict[str, int]]:
+    """Load a CSV stats file into one dictionary per user, the layout StatsManager used before UserStats."""
+    stats = {}
+    with open(path, 'r', newline='') as file:
+        for row in csv.DictReader(file):
+            stats[(int(row['guild_id']), int(row['user_id']))] = {field: int(row[field]) for field in STAT_FIELDS}
+    return stats
+
+
+def benchmark_size(users: int, seed: int = 0) -> List[Dict[str, float]]:
+    """Measure the memory of each stats layout for one population size.
+
+    Args:
+        users (int): Number of users in the synthetic stats file
+        seed (int): Seed for the synthetic data, so runs are repeatable
+
+    Returns:
+        List[Dict[str, float]]: One result row per layout.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        backend = build_backend('csv', directory, seed_stats(users, random.Random(seed)))
+        path = backend.filename
+        file_bytes = os.path.getsize(path)
+        gc.collect()
+
+        def row(layout: str, held: int, seconds: float) -> Dict[str, float]:
+            return {'layout': layout, 'users': users, 'bytes_per_user': held / users,
+                    'total_mib': held / 2 ** 20, 'seconds': seconds, 'file_mib': file_bytes / 2 ** 20}
+
+        dicts, held, seconds = traced(lambda: load_dicts(path))
+        results.append(row('dicts', held, seconds))
+        del dicts
+
+        records, held, seconds = traced(lambda: CSVStatsBackend(path).load_all())
+        results.append(row('records', held, seconds))
+
+        def build_index(records: Dict[StatsKey, UserStats]) -> LeaderboardIndex:
+            index = LeaderboardIndex(MIN_LEADERBOARD_QUESTIONS)
+            index.rebuild((user_id, user_stats.correct, user_stats.trivias_answered)
+                          for (_, user_id), user_stats in records.items())
+            return index
+
+        index, held, seconds = traced(build_index, records)
+        results.append(row('leaderboard_index', held, seconds))
+        del index, records
+
+        manager, held, seconds = traced(lambda: StatsManager(backend=CSVStatsBackend(path)))
+        results.append(row('stats_manager', held, seconds))
+        manager.close()
+    return results
+
+
+def format_table(results: List[Dict[str, float]]) -> str:
+    """Format results as a fixed-width text table."""
+    header = f"{'layout':<19}{'users':>9}{'bytes/user':>12}{'total MiB':>11}{'seconds':>9}{'file MiB':>10}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['layout']:<19}{result['users']:>9}{result['bytes_per_user']:>12.1f}"
+            f"{result['total_mib']:>11.1f}{result['seconds']:>9.2f}{result['file_mib']:>10.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Parse the command line, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Memory per user of the in-memory stats layouts")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6], help="Numbers of users")
+    parser.add_argument('--json', metavar='FILE', help="Also write the results to a JSON file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for users in args.sizes:
+        results.extend(benchmark_size(users))
+
+    print(format_table(results))
+    if args.json == '-':
+        print(json.dumps(results, indent=2))
+    elif args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
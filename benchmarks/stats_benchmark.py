@@ -0,0 +1,158 @@
+"""
+Microbenchmarks of StatsManager at large user counts.
+
+For every population size a synthetic stats store is generated with the
+chosen backend, and the main StatsManager operations are timed against it:
+loading, saving everything, answering and hint updates (in write-behind
+mode, plus the flush they cause, and a few write-through updates), and
+building and formatting the leaderboard, both one page and in full, reading
+a page of the rolling weekly leaderboard (filled by the updates), and
+looking up one user's rank.
+
+Usage (from the repository root):
+    python -m benchmarks.stats_benchmark --sizes 10000 100000 1000000
+    python -m benchmarks.stats_benchmark --backend sqlite --json stats_results.json
+    python -m benchmarks.stats_benchmark --sizes 100000 --durability always interval os
+"""
+# Import required libraries for CLI options, JSON output, randomness, timing, and temp files
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import build_backend, seed_stats
+from stats_manager import StatsManager
+from stats_storage import DURABILITY_POLICIES, DurabilityPolicy
+
+# Users per leaderboard page, matching the /leaderboard command
+PAGE_SIZE = 10
+
+
+def measure(operation: str, function: Callable[[], object], calls: int) -> Dict[str, float]:
+    """Call function calls times and summarize how long each call took.
+
+    Returns:
+        Dict[str, float]: The operation name, number of calls, total seconds,
+        and mean, median and 99th percentile call time in microseconds.
+    """
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        'operation': operation,
+        'calls': calls,
+        'total_s': sum(timings),
+        'mean_us': statistics.fmean(timings) * 1e6,
+        'p50_us': statistics.median(timings) * 1e6,
+        'p99_us': timings[min(int(calls * 0.99), calls - 1)] * 1e6,
+    }
+
+
+def benchmark_size(users: int, backend_kind: str, calls: int, bulk_calls: int,
+                   write_through_calls: int, seed: int = 0, durability: str = 'always') -> List[Dict[str, float]]:
+    """Time every StatsManager operation for one population size.
+
+    Args:
+        users (int): Number of users in the synthetic stats store
+        backend_kind (str): Stats backend kind: "csv", "sqlite" or "journal"
+        calls (int): Calls for cheap per-user operations (updates, one leaderboard page)
+        bulk_calls (int): Calls for operations that touch every user (load, save, full leaderboard)
+        write_through_calls (int): Calls of update_stats with write-behind off, each one saving
+        seed (int): Seed for the synthetic data and the users picked, so runs are repeatable
+        durability (str): Durability policy of the backend: "always", "interval" or "os"
+
+    Returns:
+        List[Dict[str, float]]: One result row per operation.
+    """
+    rng = random.Random(seed)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        backend = build_backend(backend_kind, directory, seed_stats(users, rng), DurabilityPolicy(durability))
+        user_ids = [rng.randint(1, users) for _ in range(calls)]
+        picks = iter(user_ids * 2)
+
+        # Loading includes rebuilding the leaderboard index
+        manager = StatsManager(backend=backend, write_behind=True, flush_threshold=10 ** 9)
+        results.append(measure('load_stats', manager.load_stats, bulk_calls))
+        results.append(measure('save_stats', manager.save_stats, bulk_calls))
+
+        # Write-behind updates only touch memory; the flush afterwards writes them out
+        results.append(measure('update_stats', lambda: manager.update_stats(next(picks), rng.random() < 0.5), calls))
+        results.append(measure('increment_hints', lambda: manager.increment_hints(next(picks)), calls))
+        results.append(measure('flush', manager.flush, 1))
+
+        # Without write-behind every update saves immediately
+        manager.write_behind = False
+        results.append(measure('update_stats_write_through',
+                               lambda: manager.update_stats(rng.randint(1, users), True), write_through_calls))
+        manager.write_behind = True
+
+        names = {user_id: f"player{user_id}" for user_id in range(1, users + 1)}
+        offsets = iter([rng.randrange(max(manager.leaderboard_size() - PAGE_SIZE, 1)) for _ in range(calls)])
+        results.append(measure('get_leaderboard_page', lambda: manager.get_leaderboard(PAGE_SIZE, next(offsets)), calls))
+        results.append(measure('get_leaderboard_full', manager.get_leaderboard, bulk_calls))
+        weekly_offsets = iter([rng.randrange(max(manager.leaderboard_size(period='weekly') - PAGE_SIZE, 1))
+                               for _ in range(calls)])
+        results.append(measure('get_leaderboard_page_weekly',
+                               lambda: manager.get_leaderboard(PAGE_SIZE, next(weekly_offsets), period='weekly'), calls))
+        results.append(measure('format_leaderboard_page', lambda: manager.format_leaderboard(names, PAGE_SIZE), calls))
+        results.append(measure('format_leaderboard_full', lambda: manager.format_leaderboard(names), bulk_calls))
+        rank_picks = iter(user_ids)
+        results.append(measure('get_rank', lambda: manager.get_rank(next(rank_picks)), calls))
+        manager.close()
+
+    for result in results:
+        result.update(users=users, backend=backend_kind, durability=durability)
+    return results
+
+
+def format_table(results: List[Dict[str, float]]) -> str:
+    """Format results as a fixed-width text table."""
+    header = (f"{'operation':<28}{'durability':>11}{'users':>9}{'calls':>7}{'mean us':>13}{'p50 us':>13}"
+              f"{'p99 us':>13}{'total s':>9}")
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['operation']:<28}{result['durability']:>11}{result['users']:>9}{result['calls']:>7}"
+            f"{result['mean_us']:>13.1f}"
+            f"{result['p50_us']:>13.1f}{result['p99_us']:>13.1f}{result['total_s']:>9.3f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Parse the command line, run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description="Microbenchmarks of StatsManager at large user counts")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6], help="Numbers of users")
+    parser.add_argument('--backend', choices=('csv', 'sqlite', 'journal'), default='csv')
+    parser.add_argument('--durability', choices=DURABILITY_POLICIES, nargs='+', default=['always'],
+                        help="Durability policies to compare")
+    parser.add_argument('--calls', type=int, default=10000, help="Calls of each per-user operation")
+    parser.add_argument('--bulk-calls', type=int, default=3, help="Calls of each operation that touches every user")
+    parser.add_argument('--write-through-calls', type=int, default=5,
+                        help="Calls of update_stats with write-behind off")
+    parser.add_argument('--json', metavar='FILE', help="Also write the results to a JSON file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for users in args.sizes:
+        for durability in args.durability:
+            results.extend(benchmark_size(users, args.backend, args.calls, args.bulk_calls,
+                                          args.write_through_calls, durability=durability))
+
+    print(format_table(results))
+    if args.json == '-':
+        print(json.dumps(results, indent=2))
+    elif args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
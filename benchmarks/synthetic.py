@@ -0,0 +1,41 @@
+# Import required libraries for randomness, file paths, and type hints
+import os
+import random
+from typing import Dict, Optional
+
+from stats_storage import (DEFAULT_GUILD_ID, CSVStatsBackend, DurabilityPolicy, JournalStatsBackend, StatsBackend,
+                           StatsKey, UserStats, create_backend)
+
+
+def seed_stats(users: int, rng: random.Random, guild_id: int = DEFAULT_GUILD_ID) -> Dict[StatsKey, UserStats]:
+    """Generate stats in one guild for users 1 to users, most of them with enough answers to be on the leaderboard."""
+    stats = {}
+    for user_id in range(1, users + 1):
+        answered = rng.randrange(0, 200)
+        correct = rng.randint(0, answered)
+        stats[(guild_id, user_id)] = UserStats(answered, correct, answered - correct, rng.randrange(0, 20), 0)
+    return stats
+
+
+def build_backend(kind: str, directory: str, stats: Dict[StatsKey, UserStats],
+                  durability: Optional[DurabilityPolicy] = None) -> StatsBackend:
+    """Create a stats backend in directory that already holds the given stats.
+
+    Args:
+        kind (str): One of "csv", "sqlite" or "journal"
+        directory (str): The directory to create the stats file (or journal directory) in
+        stats (Dict[StatsKey, UserStats]): The stats to store, keyed by (guild_id, user_id)
+        durability (DurabilityPolicy, optional): When the backend syncs its saves. Defaults to every save.
+    """
+    if kind == 'csv':
+        backend = CSVStatsBackend(os.path.join(directory, 'trivia_stats.csv'), durability)
+    elif kind == 'sqlite':
+        backend = create_backend('sqlite', os.path.join(directory, 'trivia_stats.db'), durability)
+    else:
+        backend = create_backend(kind, os.path.join(directory, 'trivia_journal'), durability)
+    # The journal only persists whole stats through snapshots
+    if isinstance(backend, JournalStatsBackend):
+        backend.snapshot(stats)
+    else:
+        backend.save(stats, stats.keys())
+    return backend
@@ -1,11 +1,33 @@
-# Import required libraries for Discord bot functionality, HTTP requests, and data management
+# Import required libraries for Discord bot functionality, background loading, and data management
+import asyncio
+import collections
 import discord
-from discord.ext import commands
-import requests
-import html
-import random
+from discord import app_commands
+from discord.ext import commands, tasks
+import datetime
+import logging
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 from stats_manager import StatsManager
-from trivia_questions import TRIVIA_QUESTIONS
+from stats_storage import DEFAULT_GUILD_ID, StatsBackend
+from member_names import MemberNameResolver
+from active_questions import ActiveQuestion, ActiveQuestionRegistry
+from command_sync import CommandSyncCache, fingerprint_commands
+from metrics import METRICS, instrumented
+from question_bank import ANSWER_LETTERS, CORRECT_LETTERS, Question, deal_question, draw_question, find_category, find_question, get_question, load_question_bank, suggest_categories
+from startup import STARTUP
+from windowed_leaderboards import PERIOD_ALL, PERIOD_TITLES, PERIODS
+
+logger = logging.getLogger(__name__)
+
+# Number of users shown per /leaderboard page
+# Each entry takes at most ~160 characters, so a page stays well below Discord's 2000 character limit
+LEADERBOARD_PAGE_SIZE = 10
+
+# Seconds a handler waits for stats that are still loading at startup
+# Discord needs a response within 3 seconds, so this leaves time to send a "still starting" reply
+STATS_LOAD_WAIT = 2.0
 
 class TriviaBot(commands.Bot):
     """A Discord bot that provides computer science trivia functionality.
@@ -14,11 +36,13 @@ class TriviaBot(commands.Bot):
     - Interactive trivia questions with multiple choice answers
     - Hint system for questions
     - User statistics tracking
-    - Leaderboard system
+    - Leaderboard system, kept separately for every guild
     - Persistent storage of user statistics
     """
     
-    def __init__(self):
+    def __init__(self, stats_flush_interval: float = 5.0, stats_backend: StatsBackend = None,
+                 sync_guild_ids: Iterable[int] = (), metrics_file: Optional[str] = None,
+                 global_stats: bool = False, **options):
         """Initialize the Discord bot with required intents and components.
         
         Sets up the following intents:
@@ -27,7 +51,19 @@ class TriviaBot(commands.Bot):
         - guilds: Allows bot to access server information
         - guild_messages: Allows bot to access server messages
         
-        Also initializes the stats manager for tracking user statistics.
+        Also initializes the stats manager for tracking user statistics,
+        the member name resolver used by the leaderboard and the registry
+        of trivia questions that can still be answered.
+        The stats manager runs in write-behind mode and is flushed every
+        stats_flush_interval seconds and once more when the bot shuts down.
+        Stats are not loaded here; setup_hook loads them in a worker thread
+        while the bot connects to the gateway.
+        If stats_backend is None, stats are stored in the default CSV file.
+        Stats are kept per guild. If global_stats is True, every user's totals across
+        guilds are kept as well, and shown by /stats and /leaderboard in direct messages.
+        Slash commands are synced globally, and also to every guild in sync_guild_ids.
+        If metrics_file is set, metrics are written to it in Prometheus text format.
+        Any other keyword arguments (such as shard_id and shard_count) are passed on to commands.Bot.
         """
         # Initialize Discord intents - these are required permissions for the bot to function
         intents = discord.Intents.default()
@@ -35,216 +71,708 @@ class TriviaBot(commands.Bot):
         intents.members = True  # Allows bot to access member information
         intents.guilds = True  # Allows bot to access server information
         intents.guild_messages = True  # Allows bot to access server messages
-        super().__init__(command_prefix="!", intents=intents)
+        super().__init__(command_prefix="!", intents=intents, **options)
         # Initialize the stats manager to track user statistics
-        self.stats_manager = StatsManager()
-        print("Bot initialized with intents:", intents)
+        self.stats_manager = StatsManager(write_behind=True, flush_interval=stats_flush_interval,
+                                          backend=stats_backend, load_on_init=False, global_stats=global_stats)
+        # Background startup work: loading stats and warming the question bank, and syncing commands
+        self._stats_loading: Optional[asyncio.Task] = None
+        self._startup_tasks: List[asyncio.Task] = []
+        self._connect_started: Optional[float] = None
+        # Cache of member names used by the leaderboard
+        self.member_names = MemberNameResolver()
+        # Trivia questions that can still be answered, expired by the expire_questions task
+        self.active_questions = ActiveQuestionRegistry()
+        # Guilds that also get a guild-scoped copy of the commands, and the fingerprints of the last syncs
+        self.sync_guild_ids = list(sync_guild_ids)
+        self.command_sync_cache = CommandSyncCache()
+        # File the Prometheus metrics are exported to, if any
+        self.metrics_file = metrics_file
+        logger.info("Bot initialized intents=%s", intents.value)
 
     async def setup_hook(self):
         """Called when the bot is starting up, before it's ready.
         
         This method:
+        - Registers the persistent hint and answer buttons
+        - Starts loading the stats and the question bank in worker threads
+        - Starts the background task that flushes pending stats to disk
+        - Starts the background task that disables expired trivia questions
+        - Starts the background task that exports metrics, if a metrics file is configured
         - Prints all registered slash commands for debugging purposes
         - Helps verify that all commands are properly registered
+        - Starts syncing slash commands with Discord if they changed since the last sync
+        
+        The gateway connection only starts once this method returns, so anything
+        slow (loading stats, syncing commands) runs in the background instead.
         """
-        print("Starting setup_hook...")
+        with STARTUP.phase('setup_hook'):
+            await self._setup_hook()
+        self._connect_started = time.perf_counter()
+
+    async def _setup_hook(self):
+        """The work of setup_hook, timed as one startup phase."""
+        logger.info("Starting setup_hook")
+        # Register the persistent trivia buttons so clicks are handled even after a restart
+        self.add_dynamic_items(AnswerButton, HintButton)
+        # Load the stats and compile the question bank while the gateway connects
+        self.start_stats_loading()
+        self._startup_tasks.append(asyncio.create_task(self.warm_question_bank()))
+        # Start the periodic write-behind flush of the stats file
+        self.flush_stats.change_interval(seconds=self.stats_manager.flush_interval)
+        self.flush_stats.start()
+        # Start the periodic sweep that disables the buttons of expired questions
+        self.expire_questions.start()
+        # Start exporting metrics for Prometheus if a metrics file was configured
+        if self.metrics_file:
+            self.export_metrics.start()
         # Print all registered commands for debugging purposes
-        print("\nRegistered commands:")
         for command in self.tree.get_commands():
-            print(f"- /{command.name}: {command.description}")
+            logger.info("Registered command name=/%s description=%r", command.name, command.description)
+        # Copy the global commands to the configured guilds and sync whatever changed
+        for guild_id in self.sync_guild_ids:
+            self.tree.copy_global_to(guild=discord.Object(id=guild_id))
+        # With shards split across processes, only the process running shard 0 syncs the commands
+        if self.is_primary_process:
+            self._startup_tasks.append(asyncio.create_task(self.sync_commands_on_startup()))
+
+    async def login(self, token: str):
+        """Logs in with the bot token, timed as a startup phase."""
+        with STARTUP.phase('login'):
+            await super().login(token)
 
     async def on_ready(self):
         """Called when the bot has successfully connected to Discord.
         
-        This method:
-        - Prints connection information
-        - Syncs slash commands with Discord
-        - Handles command syncing for both global and guild-specific commands
-        - Includes error handling and logging for command syncing
+        This method only prints connection information, and the startup timeline
+        the first time. It runs again after every reconnect, so command syncing
+        happens once in setup_hook instead.
+        """
+        logger.info("Bot is ready user=%s bot_id=%s guilds=%d", self.user, self.user.id, len(self.guilds))
+        if self._connect_started is not None:
+            STARTUP.record('gateway_connect', self._connect_started)
+            self._connect_started = None
+            STARTUP.finish()
+
+    def start_stats_loading(self) -> asyncio.Task:
+        """Starts loading the stats in a worker thread, unless that already started.
+        
+        Returns:
+            asyncio.Task: The task that completes once the stats are loaded.
+        """
+        if self._stats_loading is None:
+            self._stats_loading = asyncio.create_task(self.load_stats())
+        return self._stats_loading
+
+    async def load_stats(self):
+        """Loads the stats and builds the leaderboard index in a worker thread, timed as a startup phase."""
+        try:
+            with STARTUP.phase('stats_load'):
+                await asyncio.to_thread(self.stats_manager.load_stats)
+        except Exception:
+            logger.exception("Error loading stats")
+            raise
+        logger.info("Stats loaded players=%d guilds=%d",
+                    len(self.stats_manager.stats), len(self.stats_manager.leaderboard_indexes))
+
+    async def wait_for_stats(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the stats are loaded, starting the load if needed.
+        
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Waits as long as it takes if None.
+            
+        Returns:
+            bool: True once the stats are loaded, False if they are still loading after timeout seconds.
         """
-        print(f'Bot is ready! Logged in as {self.user}')
-        print(f'Bot ID: {self.user.id}')
-        print(f'Connected to {len(self.guilds)} guilds:')
+        if self.stats_manager.loaded:
+            return True
+        try:
+            # Shield the load so a handler giving up doesn't cancel it for everyone else
+            await asyncio.wait_for(asyncio.shield(self.start_stats_loading()), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def warm_question_bank(self):
+        """Compiles the question bank in a worker thread, so the first /trivia doesn't pay for it."""
+        with STARTUP.phase('question_bank'):
+            await asyncio.to_thread(load_question_bank)
+
+    async def sync_commands_on_startup(self):
+        """Syncs the slash commands in the background, timed as a startup phase."""
+        with STARTUP.phase('command_sync'):
+            await self.sync_commands()
+
+    async def sync_commands(self, force: bool = False):
+        """Syncs slash commands with Discord, but only the scopes whose commands changed.
+        
+        Args:
+            force (bool): Sync every scope even if its fingerprint didn't change
+            
+        Commands are synced globally, plus to each guild in sync_guild_ids (useful
+        for test servers, where guild commands show up instantly). The serialized
+        commands of each scope are hashed and compared with the hash stored after
+        the last successful sync, so restarts don't spend rate-limited requests
+        re-uploading identical commands.
+        """
+        scopes = [(None, "global")] + [(discord.Object(id=guild_id), str(guild_id)) for guild_id in self.sync_guild_ids]
+        for guild, scope in scopes:
+            try:
+                fingerprint = fingerprint_commands(self.tree, guild=guild)
+                if not force and self.command_sync_cache.is_current(self.application_id, scope, fingerprint):
+                    logger.info("Commands unchanged, skipping sync scope=%s", scope)
+                    continue
+                logger.info("Syncing commands scope=%s", scope)
+                synced = await self.tree.sync(guild=guild)
+                self.command_sync_cache.store(self.application_id, scope, fingerprint)
+                logger.info("Synced commands scope=%s count=%d", scope, len(synced))
+            except Exception:
+                logger.exception("Error syncing commands scope=%s", scope)
+
+    @tasks.loop(seconds=5.0)
+    async def flush_stats(self):
+        """Periodically writes pending write-behind stats changes to disk.
         
-        # Sync slash commands with Discord
+        The write runs on the stats writer thread; this task only awaits it.
+        Nothing is flushed while the stats are still loading at startup.
+        """
+        if not self.stats_manager.loaded:
+            return
         try:
-            # First sync commands globally
-            print("\nSyncing commands globally...")
-            synced = await self.tree.sync()
-            print(f"Successfully synced {len(synced)} command(s) globally")
+            await self.stats_manager.flush_async()
+        except Exception:
+            # Failed writes keep their changes for the next flush; errors raised on the loop are only seen here
+            logger.exception("Error flushing stats")
+
+    @tasks.loop(seconds=10.0)
+    async def expire_questions(self):
+        """Periodically disables the buttons of trivia questions whose time ran out.
+        
+        A single sweep of the registry's expiry heap replaces a timeout task per question.
+        """
+        expired = self.active_questions.pop_expired()
+        if expired:
+            logger.info("Expiring trivia questions count=%d live=%d", len(expired), len(self.active_questions))
+            await self.disable_questions(expired)
+
+    async def disable_questions(self, questions: List[ActiveQuestion]):
+        """Disables all buttons of the given questions with one message edit each.
+        
+        Args:
+            questions (List[ActiveQuestion]): The expired or evicted questions
             
-            # Then sync commands to each individual server
-            for guild in self.guilds:
-                print(f'\nSyncing commands to guild: {guild.name}')
-                try:
-                    synced = await self.tree.sync(guild=guild)
-                    print(f"Successfully synced {len(synced)} command(s) to {guild.name}")
-                except Exception as e:
-                    print(f"Failed to sync commands to {guild.name}: {e}")
-        except Exception as e:
-            print(f"Error syncing commands: {e}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
-
-def get_trivia_question() -> dict:
-    """Gets a random computer science trivia question from our custom database.
+        The messages are edited through the /trivia interaction's webhook,
+        so no per-message View or Message object has to be kept around.
+        """
+        for question in questions:
+            try:
+                webhook = discord.Webhook.partial(self.application_id, question.token, client=self)
+                await webhook.edit_message(
+                    "@original",
+                    view=build_question_view(question.question_id, question.permutation_id, disabled=True),
+                )
+            except discord.HTTPException as e:
+                # The message may have been deleted, or the interaction token may have expired
+                logger.warning("Could not disable expired question interaction_id=%s error=%s", question.interaction_id, e)
+
+    @property
+    def is_primary_process(self) -> bool:
+        """Whether this process runs shard 0, and so does the work that only one process should do."""
+        return (self.shard_id or 0) == 0
+
+    def shard_latencies(self) -> List[Tuple[int, float]]:
+        """Returns (shard ID, gateway latency in seconds) for every shard this process runs."""
+        return [(self.shard_id or 0, self.latency)]
+
+    def shard_guild_counts(self) -> Dict[int, int]:
+        """Returns the number of guilds on every shard this process runs."""
+        counts = collections.Counter(guild.shard_id for guild in self.guilds)
+        return {shard_id: counts.get(shard_id, 0) for shard_id, _ in self.shard_latencies()}
+
+    def update_metric_gauges(self):
+        """Copies point-in-time values (connection, shard, registry and stats sizes) into the metrics gauges."""
+        # latency is NaN until the first heartbeat is acknowledged
+        if not math.isnan(self.latency):
+            METRICS.set_gauge('trivia_bot_gateway_latency_seconds', self.latency)
+        METRICS.set_gauge('trivia_bot_guilds', len(self.guilds))
+        guild_counts = self.shard_guild_counts()
+        for shard_id, latency in self.shard_latencies():
+            if not math.isnan(latency):
+                METRICS.set_gauge('trivia_bot_shard_latency_seconds', latency, shard=shard_id)
+            METRICS.set_gauge('trivia_bot_shard_guilds', guild_counts.get(shard_id, 0), shard=shard_id)
+        METRICS.set_gauge('trivia_bot_stats_users', len(self.stats_manager.stats))
+        METRICS.set_gauge('trivia_bot_stats_pending_changes', self.stats_manager.pending_changes)
+        for name, value in self.active_questions.metrics().items():
+            METRICS.set_gauge(f'trivia_bot_active_questions_{name}', value)
+
+    @tasks.loop(seconds=15.0)
+    async def export_metrics(self):
+        """Periodically writes all metrics in Prometheus text format to metrics_file."""
+        self.update_metric_gauges()
+        try:
+            METRICS.write_prometheus_file(self.metrics_file)
+        except OSError as e:
+            logger.warning("Could not write metrics file=%s error=%s", self.metrics_file, e)
+
+    async def close(self):
+        """Stops the background tasks, forces a final stats flush and closes the stats storage before shutting down."""
+        self.flush_stats.cancel()
+        self.expire_questions.cancel()
+        self.export_metrics.cancel()
+        for task in self._startup_tasks:
+            task.cancel()
+        # The load runs in a thread and can't be cancelled; let it finish before the final flush
+        if self._stats_loading is not None and not self._stats_loading.done():
+            await asyncio.wait([self._stats_loading])
+        try:
+            await self.stats_manager.flush_async()
+        except Exception:
+            logger.exception("Error in final stats flush")
+        try:
+            self.stats_manager.close()
+        except Exception:
+            logger.exception("Error closing stats storage")
+        await super().close()
+
+class ShardedTriviaBot(TriviaBot, commands.AutoShardedBot):
+    """A TriviaBot that runs several gateway shards in one process.
+    
+    If shard_count is None, Discord's recommended shard count is used. To split
+    the shards across processes, start every process with the same shard_count
+    and its own shard_ids; only the process running shard 0 syncs the slash commands.
+    
+    All shards of one process share the bot's single StatsManager on one event
+    loop, so its writes need no coordination between shards. Processes that
+    share one stats store need a backend whose shared flag is set.
+    """
+    
+    @property
+    def is_primary_process(self) -> bool:
+        """Whether this process runs shard 0, and so does the work that only one process should do."""
+        return self.shard_ids is None or 0 in self.shard_ids
+    
+    def shard_latencies(self) -> List[Tuple[int, float]]:
+        """Returns (shard ID, gateway latency in seconds) for every connected shard of this process."""
+        return self.latencies
+    
+    async def on_shard_ready(self, shard_id: int):
+        """Called when a shard has connected and received its guilds."""
+        guilds = sum(1 for guild in self.guilds if guild.shard_id == shard_id)
+        logger.info("Shard is ready shard=%s shard_count=%s guilds=%d", shard_id, self.shard_count, guilds)
+    
+    async def on_shard_disconnect(self, shard_id: int):
+        """Called when a shard lost its gateway connection; discord.py reconnects it."""
+        logger.warning("Shard disconnected shard=%s", shard_id)
+
+class LeaderboardView(discord.ui.View):
+    """Prev/Next buttons for paging through the /leaderboard message.
+    
+    Only the current page is rendered, and only the users on that page
+    have their names resolved, every time a button is clicked.
+    The leaderboard shown is the guild's own; see stats_scope for direct messages.
+    """
+    
+    def __init__(self, bot: TriviaBot, guild: discord.Guild, page_size: int = LEADERBOARD_PAGE_SIZE,
+                 period: str = PERIOD_ALL):
+        """Initialize the view on the first page.
+        
+        Args:
+            bot (TriviaBot): The bot whose stats are displayed
+            guild (discord.Guild): The guild to resolve member names in
+            page_size (int): The number of users per page
+            period (str): The period to rank: PERIOD_ALL, or a rolling window such as "weekly"
+        """
+        super().__init__()
+        self.bot = bot
+        self.guild = guild
+        self.guild_id = stats_scope(bot, guild.id if guild is not None else None)
+        self.page_size = page_size
+        self.period = period
+        self.offset = 0
+    
+    async def render(self) -> str:
+        """Render the current page and update which buttons are enabled.
+        
+        Returns:
+            str: The page wrapped in a code block, ready to send.
+        """
+        stats_manager = self.bot.stats_manager
+        # Clamp the offset in case the leaderboard shrank since the last page was shown
+        last_offset = max(stats_manager.leaderboard_size(self.guild_id, self.period) - 1, 0) // self.page_size * self.page_size
+        self.offset = min(self.offset, last_offset)
+        rows = stats_manager.get_leaderboard(self.page_size, self.offset, self.guild_id, self.period)
+        user_names = await self.bot.member_names.resolve(self.guild, [row[0] for row in rows])
+        page = stats_manager.format_leaderboard_page(user_names, self.offset, self.page_size, self.guild_id,
+                                                     self.period, leaderboard=rows)
+        self.previous_page.disabled = self.offset == 0
+        self.next_page.disabled = self.offset >= last_offset
+        return f"```\n{page}\n```"
+    
+    @discord.ui.button(label="Prev", style=discord.ButtonStyle.grey)
+    @instrumented("leaderboard_page")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Shows the previous page of the leaderboard."""
+        self.offset = max(self.offset - self.page_size, 0)
+        await interaction.response.edit_message(content=await self.render(), view=self)
+    
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.grey)
+    @instrumented("leaderboard_page")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Shows the next page of the leaderboard."""
+        self.offset += self.page_size
+        await interaction.response.edit_message(content=await self.render(), view=self)
+
+# Custom ID patterns of the persistent trivia buttons. The fingerprint (8 hex digits) identifies the question
+# if the bank changed since the button was made; buttons posted before fingerprints were added have none
+ANSWER_BUTTON_TEMPLATE = (r'trivia:answer:(?P<question_id>\d+)(?::(?P<fingerprint>[0-9a-f]{8}))?'
+                          r':(?P<permutation_id>\d+):(?P<letter>[A-D])')
+HINT_BUTTON_TEMPLATE = r'trivia:hint:(?P<question_id>\d+)(?::(?P<fingerprint>[0-9a-f]{8}))?'
+# Reply to clicks on a question that was removed from (or changed in) the question bank since it was posted
+QUESTION_UNAVAILABLE_MESSAGE = "```\nThis question is no longer available.\n```"
+
+def parse_fingerprint(match) -> Optional[int]:
+    """Returns the question fingerprint of a matched button custom ID, or None if it has none."""
+    return int(match['fingerprint'], 16) if match['fingerprint'] else None
+
+class AnswerButton(discord.ui.DynamicItem[discord.ui.Button], template=ANSWER_BUTTON_TEMPLATE):
+    """A persistent answer button for a trivia question.
+    
+    The question ID and fingerprint, answer permutation and chosen letter are
+    encoded in the button's custom ID, so no per-message state is kept in memory
+    and the button still works after the bot restarts or reconnects, even if
+    questions were added to or removed from the bank in between.
+    """
     
+    def __init__(self, question_id: int, fingerprint: Optional[int], permutation_id: int, letter: str,
+                 disabled: bool = False):
+        """Create the button for one answer letter of a question.
+        
+        Args:
+            question_id (int): The ID of the question in the question bank
+            fingerprint (int, optional): The question's fingerprint, None for buttons posted before fingerprints
+            permutation_id (int): The ID of the answer order shown in the message
+            letter (str): The answer letter (A-D) of this button
+            disabled (bool): Whether the button is shown disabled
+        """
+        question_ref = question_id if fingerprint is None else f"{question_id}:{fingerprint:08x}"
+        super().__init__(discord.ui.Button(
+            label=letter,
+            style=discord.ButtonStyle.blurple,
+            custom_id=f"trivia:answer:{question_ref}:{permutation_id}:{letter}",
+            disabled=disabled,
+        ))
+        self.question_id = question_id
+        self.fingerprint = fingerprint
+        self.permutation_id = permutation_id
+        self.letter = letter
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        """Rebuild the button from the custom ID of a clicked component."""
+        return cls(int(match['question_id']), parse_fingerprint(match), int(match['permutation_id']), match['letter'])
+    
+    @instrumented("answer_button")
+    async def callback(self, interaction: discord.Interaction):
+        """Handles when a user clicks an answer button.
+        
+        This callback:
+        - Rejects clicks on questions that have expired or are no longer in the question bank
+        - Claims the question, so only the first click counts when several users click at once
+        - Checks if the answer is correct
+        - Updates user statistics
+        - Shows the result and disables all buttons with a single message edit
+        
+        Later clicks only get a short ephemeral reply and don't touch the stats.
+        """
+        bot = interaction.client
+        # Wait for the stats before claiming, so the claim and the stats update happen without awaiting in between
+        if not await ensure_stats_loaded(interaction):
+            return
+        key = question_key(interaction)
+        if is_question_expired(bot, interaction, key):
+            await interaction.response.send_message("```\nThis question has expired.\n```", ephemeral=True)
+            return
+        # Look the question up before claiming, so a question that is gone can't use up the claim
+        question = find_question(self.question_id, self.fingerprint)
+        if question is None:
+            await interaction.response.send_message(QUESTION_UNAVAILABLE_MESSAGE, ephemeral=True)
+            return
+        # Claiming doesn't await, so no other click can run between the check and the claim
+        if not bot.active_questions.claim(key):
+            await interaction.response.send_message("```\nSomeone already answered this question.\n```", ephemeral=True)
+            return
+        selected_answer = question.answer_for(self.permutation_id, self.letter)
+        is_correct = self.letter == CORRECT_LETTERS[self.permutation_id]
+        
+        # Update the user's statistics
+        bot.stats_manager.update_stats(interaction.user.id, is_correct, interaction.guild_id or DEFAULT_GUILD_ID)
+        
+        # Create appropriate response message
+        if is_correct:
+            response = f"```\n{interaction.user.name} got it right! The answer was {selected_answer}!\n```"
+        else:
+            response = f"```\n{interaction.user.name} got it wrong... The correct answer was {question.correct_answer}!\n```"
+        
+        # Show the result under the question and disable all buttons in one request
+        await interaction.response.edit_message(
+            content=f"{interaction.message.content}\n{response}",
+            view=build_question_view(question.id, self.permutation_id, disabled=True),
+        )
+
+class HintButton(discord.ui.DynamicItem[discord.ui.Button], template=HINT_BUTTON_TEMPLATE):
+    """A persistent hint button for a trivia question, identified by the question ID and fingerprint in its custom ID."""
+    
+    def __init__(self, question_id: int, fingerprint: Optional[int], disabled: bool = False):
+        """Create the hint button for a question.
+        
+        Args:
+            question_id (int): The ID of the question in the question bank
+            fingerprint (int, optional): The question's fingerprint, None for buttons posted before fingerprints
+            disabled (bool): Whether the button is shown disabled
+        """
+        question_ref = question_id if fingerprint is None else f"{question_id}:{fingerprint:08x}"
+        super().__init__(discord.ui.Button(
+            label="Get Hint",
+            style=discord.ButtonStyle.grey,
+            custom_id=f"trivia:hint:{question_ref}",
+            disabled=disabled,
+        ))
+        self.question_id = question_id
+        self.fingerprint = fingerprint
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        """Rebuild the button from the custom ID of a clicked component."""
+        return cls(int(match['question_id']), parse_fingerprint(match))
+    
+    @instrumented("hint_button")
+    async def callback(self, interaction: discord.Interaction):
+        """Handles when a user clicks the hint button.
+        
+        This callback:
+        - Increments the user's hint count
+        - Shows the hint as an ephemeral message (only visible to the user)
+        
+        Hints for questions that are no longer in the question bank aren't counted.
+        """
+        if not await ensure_stats_loaded(interaction):
+            return
+        question = find_question(self.question_id, self.fingerprint)
+        if question is None:
+            await interaction.response.send_message(QUESTION_UNAVAILABLE_MESSAGE, ephemeral=True)
+            return
+        # Increment the user's hint count
+        interaction.client.stats_manager.increment_hints(interaction.user.id, interaction.guild_id or DEFAULT_GUILD_ID)
+        
+        # Get the hint from the question
+        hint = question.hint
+        
+        # Send the hint as an ephemeral message (only visible to the user who requested it)
+        await interaction.response.send_message(f"```\nHint: {hint}\n```", ephemeral=True)
+
+async def ensure_stats_loaded(interaction: discord.Interaction) -> bool:
+    """Waits briefly for stats that are still loading at startup.
+    
+    Args:
+        interaction (discord.Interaction): The interaction about to use the stats
+        
     Returns:
-        dict: A dictionary containing:
-            - question: The trivia question text
-            - answers: A dictionary mapping letters (A-D) to answer choices
-            - correct_answer: The letter corresponding to the correct answer
-            - hint: A helpful hint for the question
+        bool: True if the stats are loaded. False if they are still loading after
+            STATS_LOAD_WAIT seconds; the user was then asked to try again.
+    """
+    if await interaction.client.wait_for_stats(STATS_LOAD_WAIT):
+        return True
+    await interaction.response.send_message("```\nThe bot is still starting up. Please try again in a few seconds.\n```", ephemeral=True)
+    return False
+
+def stats_scope(bot: 'TriviaBot', guild_id: Optional[int]) -> Optional[int]:
+    """Returns the guild whose stats /stats and /leaderboard show.
+    
+    In a guild that is the guild itself. In direct messages it is the users'
+    totals across all guilds (None) if the bot keeps them, otherwise the stats
+    of questions answered in direct messages (DEFAULT_GUILD_ID).
+    """
+    if guild_id:
+        return guild_id
+    return None if bot.stats_manager.global_stats else DEFAULT_GUILD_ID
+
+def question_key(interaction: discord.Interaction) -> int:
+    """Returns the registry key of the question a button belongs to.
+    
+    The key is the ID of the /trivia interaction that posted the question message.
+    If Discord didn't include it, the message ID is used instead, which still
+    identifies the question for claiming but never matches a registered question.
+    """
+    metadata = interaction.message.interaction_metadata
+    return metadata.id if metadata else interaction.message.id
+
+def is_question_expired(bot: 'TriviaBot', interaction: discord.Interaction, key: int) -> bool:
+    """Checks whether a button click belongs to a question whose time ran out.
+    
+    Questions in the registry are live. Questions that aren't (because they expired,
+    were evicted, or the bot restarted since they were posted) are judged by the
+    age of their message, so buttons from before a restart keep working until their TTL.
+    """
+    if bot.active_questions.get(key) is not None:
+        return False
+    age = discord.utils.utcnow() - interaction.message.created_at
+    return age > datetime.timedelta(seconds=bot.active_questions.ttl)
+
+def build_question_view(question_id: int, permutation_id: int, disabled: bool = False) -> discord.ui.View:
+    """Builds the row of hint and answer buttons for a trivia question.
+    
+    Args:
+        question_id (int): The ID of the question in the question bank
+        permutation_id (int): The ID of the answer order shown in the message
+        disabled (bool): Whether the buttons are shown disabled
+        
+    Returns:
+        discord.ui.View: A view that only carries the buttons. It is already stopped,
+            so discord.py doesn't keep a copy of it for every message; clicks are
+            handled by the registered AnswerButton and HintButton items instead.
+    """
+    fingerprint = get_question(question_id).fingerprint
+    view = discord.ui.View(timeout=None)
+    view.add_item(HintButton(question_id, fingerprint, disabled=disabled))
+    for letter in ANSWER_LETTERS:
+        view.add_item(AnswerButton(question_id, fingerprint, permutation_id, letter, disabled=disabled))
+    view.stop()
+    return view
+
+def get_trivia_question(deck_state: int = 0, category_id: Optional[int] = None) -> Optional[Tuple[Question, int, int]]:
+    """Deals the next computer science trivia question from a player's shuffled deck.
+    
+    Args:
+        deck_state (int): The player's stored deck state, 0 for a player without a deck
+        category_id (int, optional): Draw a random question from this category instead of the deck
+    
+    Returns:
+        Tuple[Question, int, int]: The question record, the ID of the answer permutation
+            that decides which letter (A-D) shows which answer, and the player's new deck state
+            (unchanged when a category was requested).
             
     Returns None if there's an error fetching the question.
-    The answers are randomly shuffled to prevent pattern recognition.
+    Players see every question once before any question repeats.
+    The answers are randomly ordered to prevent pattern recognition.
     """
     try:
-        # Get a random question from our database
-        question_data = random.choice(TRIVIA_QUESTIONS)
-        
-        # Format the question and answers
-        question = question_data['question']
-        correct_answer = question_data['correct_answer']
-        incorrect_answers = question_data['incorrect_answers']
-        hint = question_data['hint']
-        
-        # Combine all answers and shuffle them
-        all_answers = [correct_answer] + incorrect_answers
-        random.shuffle(all_answers)
-        
-        # Create answer mapping
-        answer_mapping = {
-            'A': all_answers[0],
-            'B': all_answers[1],
-            'C': all_answers[2],
-            'D': all_answers[3]
-        }
-        
-        # Find the correct answer letter
-        correct_letter = next(letter for letter, answer in answer_mapping.items() 
-                            if answer == correct_answer)
-        
-        return {
-            'question': question,
-            'answers': answer_mapping,
-            'correct_answer': correct_letter,
-            'hint': hint
-        }
-        
-    except Exception as e:
-        print(f"Error fetching trivia question: {e}")
+        if category_id is not None:
+            # Pick a random question from the category's precomputed question list
+            question, permutation_id = draw_question(category_id=category_id)
+            return question, permutation_id, deck_state
+        # Take the next question from the deck and pick one of the precomputed answer orderings
+        return deal_question(deck_state)
+    except Exception:
+        logger.exception("Error fetching trivia question")
         return None
 
-def setup_bot():
+def setup_bot(stats_backend: StatsBackend = None, sync_guild_ids: Iterable[int] = (), metrics_file: Optional[str] = None,
+              sharded: bool = False, shard_count: Optional[int] = None, shard_ids: Optional[List[int]] = None,
+              global_stats: bool = False):
     """Sets up and configures all the bot's commands.
     
+    Args:
+        stats_backend (StatsBackend, optional): The storage backend for user statistics.
+            Defaults to the CSV file backend.
+        sync_guild_ids (Iterable[int], optional): Guilds that get guild-scoped copies of the
+            slash commands in addition to the global sync.
+        metrics_file (str, optional): File to export Prometheus metrics to every 15 seconds.
+        sharded (bool): Run several gateway shards with ShardedTriviaBot instead of a single connection.
+        shard_count (int, optional): The total number of shards across all processes.
+            Discord's recommended count is used if None.
+        shard_ids (List[int], optional): The shards this process runs, when shards are split
+            across processes. Requires shard_count. Runs every shard if None.
+        global_stats (bool): Also keep every user's totals across guilds, shown in direct messages.
+    
     Returns:
         TriviaBot: The configured bot instance with all commands registered.
+    
+    Raises:
+        ValueError: If shards are split across processes (shard_ids is given) and the stats backend
+            is not shared, since every process would overwrite the others' stats.
         
     This function sets up the following slash commands:
     - /trivia: Start a computer science trivia question
     - /stats: View trivia statistics for yourself or another user
     - /leaderboard: View the trivia leaderboard
+    - /botmetrics: View handler latency and error metrics (administrators only)
     """
-    bot = TriviaBot()
+    if sharded:
+        # Processes running different shards write to the same store, which only a shared backend supports
+        if shard_ids is not None and (stats_backend is None or not stats_backend.shared):
+            backend_name = type(stats_backend).__name__ if stats_backend is not None else "default CSV"
+            raise ValueError(f"Shards are split across processes but the {backend_name} stats backend is not shared; "
+                             "use the shared-sqlite backend so processes don't overwrite each other's stats")
+        bot = ShardedTriviaBot(stats_backend=stats_backend, sync_guild_ids=sync_guild_ids, metrics_file=metrics_file,
+                               global_stats=global_stats, shard_count=shard_count, shard_ids=shard_ids)
+    else:
+        bot = TriviaBot(stats_backend=stats_backend, sync_guild_ids=sync_guild_ids, metrics_file=metrics_file,
+                        global_stats=global_stats)
 
     @bot.tree.command(name="trivia", description="Start a computer science trivia question")
-    async def trivia(interaction: discord.Interaction):
+    @app_commands.describe(category="Only ask a question from this category")
+    @instrumented("trivia")
+    async def trivia(interaction: discord.Interaction, category: Optional[str] = None):
         """Handles the /trivia command - displays a trivia question with multiple choice answers.
         
+        Args:
+            interaction (discord.Interaction): The interaction that triggered the command
+            category (str, optional): The category to pick a question from
+        
         This command:
-        - Fetches a random trivia question
+        - Deals the next question from the user's shuffled deck, so questions don't repeat
+          until the user has seen the whole question bank
+        - Picks a random question from the category instead, if one was given
         - Displays the question with multiple choice answers
         - Provides a hint button for users
         - Tracks user answers and updates statistics
         - Shows appropriate feedback messages
         
-        The hint button is only visible to the user who clicked it.
+        The hint is only visible to the user who clicked the hint button.
         All buttons are disabled after an answer is selected.
+        The buttons are stateless and keep working across bot restarts.
         """
-        print(f"Trivia command triggered by {interaction.user.name}")
-        trivia_data = get_trivia_question()
+        logger.info("Trivia command user=%s category=%r", interaction.user.id, category)
+        if not await ensure_stats_loaded(interaction):
+            return
+        category_id = None
+        if category:
+            category_id = find_category(category)
+            if category_id is None:
+                await interaction.response.send_message(f"```\nUnknown category: {category}\n```", ephemeral=True)
+                return
+        guild_id = interaction.guild_id or DEFAULT_GUILD_ID
+        trivia_data = get_trivia_question(bot.stats_manager.get_deck_state(interaction.user.id, guild_id), category_id)
         if trivia_data:
-            # Extract question data
-            question = trivia_data["question"]
-            answers = trivia_data["answers"]
-            correct_answer = trivia_data["correct_answer"]
+            # Extract question data and remember how far the user is through their deck
+            question, permutation_id, deck_state = trivia_data
+            if category_id is None:
+                bot.stats_manager.set_deck_state(interaction.user.id, deck_state, guild_id)
+            answers = question.shuffled_answers(permutation_id)
             
             # Format the question and answers with letters (A, B, C, D)
-            message = f"```\n{question}\n\n"
-            for letter, answer in answers.items():
-                message += f"{letter}. {answer}\n"
-            message += "```"
+            lines = [f"```\n{question.text}\n"]
+            lines.extend(f"{letter}. {answer}" for letter, answer in zip(ANSWER_LETTERS, answers))
+            message = "\n".join(lines) + "\n```"
             
-            # Create a view for the interactive buttons
-            view = discord.ui.View()
-            
-            # Create a dictionary mapping letters to answers
-            answer_dict = {letter: answer for letter, answer in answers.items()}
-            
-            # Create a hint button
-            hint_button = discord.ui.Button(label="Get Hint", style=discord.ButtonStyle.grey)
-            
-            async def hint_callback(interaction: discord.Interaction):
-                """Handles when a user clicks the hint button.
-                
-                This callback:
-                - Increments the user's hint count
-                - Shows the hint as an ephemeral message (only visible to the user)
-                """
-                # Increment the user's hint count
-                bot.stats_manager.increment_hints(interaction.user.id)
-                
-                # Get the hint from the trivia data
-                hint = trivia_data["hint"]
-                
-                # Send the hint as an ephemeral message (only visible to the user who requested it)
-                await interaction.response.send_message(f"```\nHint: {hint}\n```", ephemeral=True)
-            
-            hint_button.callback = hint_callback
-            view.add_item(hint_button)
-            
-            # Create a button for each answer choice
-            for letter in answer_dict:
-                button = discord.ui.Button(label=letter, style=discord.ButtonStyle.blurple)
-                
-                async def button_callback(interaction: discord.Interaction, selected_letter=letter):
-                    """Handles when a user clicks an answer button.
-                    
-                    This callback:
-                    - Checks if the answer is correct
-                    - Updates user statistics
-                    - Shows appropriate feedback
-                    - Disables all buttons after answering
-                    """
-                    selected_answer = answer_dict[selected_letter]
-                    is_correct = selected_answer == correct_answer
-                    
-                    # Update the user's statistics
-                    bot.stats_manager.update_stats(interaction.user.id, is_correct)
-                    
-                    # Create appropriate response message
-                    if is_correct:
-                        response = f"```\n{interaction.user.name} got it right! The answer was {selected_answer}!\n```"
-                    else:
-                        response = f"```\n{interaction.user.name} got it wrong... The correct answer was {answer_dict[correct_answer]}!\n```"
-                    
-                    # Send response and disable all buttons
-                    await interaction.response.send_message(response)
-                    for item in view.children:
-                        item.disabled = True
-                    await interaction.message.edit(view=view)
-                
-                button.callback = lambda i, l=letter: button_callback(i, l)
-                view.add_item(button)
-
+            # Create the hint and answer buttons; everything they need is encoded in their custom IDs
+            view = build_question_view(question.id, permutation_id)
             await interaction.response.send_message(message, view=view)
+            
+            # Track the question until it is answered or expires; disable any questions pushed out by the cap
+            evicted = bot.active_questions.add(interaction.id, interaction.token, question.id, permutation_id)
+            if evicted:
+                await bot.disable_questions(evicted)
         else:
             await interaction.response.send_message("```\nSorry, I couldn't fetch a trivia question. Please try again.\n```")
 
+    @trivia.autocomplete("category")
+    async def trivia_category_autocomplete(interaction: discord.Interaction, current: str):
+        """Suggests categories matching what the user has typed so far, using the precomputed prefix index."""
+        return [app_commands.Choice(name=name, value=name) for name in suggest_categories(current)]
+
     @bot.tree.command(name="stats", description="View trivia statistics for yourself or another user")
+    @instrumented("stats")
     async def stats(interaction: discord.Interaction, user: discord.Member = None):
         """Handles the /stats command - displays trivia statistics for a user.
         
@@ -257,22 +785,35 @@ def setup_bot():
         - Correct/incorrect answers
         - Success rate
         - Hints used
+        
+        The stats are the ones from this guild (see stats_scope for direct messages).
         """
         # If no user is specified, show stats for the command user
         target_user = user or interaction.user
-        stats_message = bot.stats_manager.format_stats_message(target_user.id, target_user.name)
+        if not await ensure_stats_loaded(interaction):
+            return
+        stats_message = bot.stats_manager.format_stats_message(target_user.id, target_user.name,
+                                                               stats_scope(bot, interaction.guild_id))
         await interaction.response.send_message(f"```\n{stats_message}\n```")
 
     @bot.tree.command(name="leaderboard", description="View the trivia leaderboard")
-    async def leaderboard(interaction: discord.Interaction):
+    @app_commands.describe(period="Rank only the answers of a recent period (defaults to all time)")
+    @app_commands.choices(period=[app_commands.Choice(name=PERIOD_TITLES[period], value=period) for period in PERIODS])
+    @instrumented("leaderboard")
+    async def leaderboard(interaction: discord.Interaction, period: str = PERIOD_ALL):
         """Handles the /leaderboard command - displays rankings of all users by trivia performance.
         
         Args:
             interaction (discord.Interaction): The interaction that triggered the command
+            period (str): PERIOD_ALL, or a rolling window of days: "daily", "weekly" or "monthly"
             
         Features:
+        - Only ranks the players of this guild (see stats_scope for direct messages)
+        - Ranks all-time stats, or only the answers of the chosen rolling period
         - Only shows users who have answered at least 10 questions
-        - Sorts users by success rate and total questions
+        - Shows LEADERBOARD_PAGE_SIZE users per page, ranked by success rate and total questions
+        - Prev/Next buttons render other pages on demand
+        - Only looks up the names of the users on the displayed page
         - Shows comprehensive statistics for each user
         - Handles errors gracefully with appropriate error messages
         
@@ -283,42 +824,68 @@ def setup_bot():
         - Correct/incorrect counts
         - Hints used
         """
-        print(f"Leaderboard command triggered by {interaction.user.name}")
+        logger.info("Leaderboard command user=%s guild=%s period=%s", interaction.user.id, interaction.guild_id, period)
+        if not await ensure_stats_loaded(interaction):
+            return
         try:
-            # Get all users who have played trivia
-            user_ids = set(bot.stats_manager.stats.keys())
-            print(f"Found {len(user_ids)} users in stats")
-            
-            # Create a mapping of user IDs to their Discord usernames
-            user_names = {}
-            for user_id in user_ids:
-                try:
-                    print(f"Fetching member info for user ID: {user_id}")
-                    user = await interaction.guild.fetch_member(user_id)
-                    user_names[user_id] = user.name
-                    print(f"Successfully fetched user: {user.name}")
-                except discord.NotFound:
-                    print(f"User {user_id} not found in guild")
-                    user_names[user_id] = f"User {user_id}"
-                except discord.HTTPException as e:
-                    print(f"HTTP error fetching user {user_id}: {e}")
-                    user_names[user_id] = f"User {user_id}"
-                except Exception as e:
-                    print(f"Unexpected error fetching user {user_id}: {e}")
-                    user_names[user_id] = f"User {user_id}"
-            
-            print(f"Successfully processed {len(user_names)} users")
-            
-            # Get and display the formatted leaderboard
-            leaderboard_message = bot.stats_manager.format_leaderboard(user_names)
-            print("Successfully formatted leaderboard message")
-            await interaction.response.send_message(f"```\n{leaderboard_message}\n```")
-            print("Successfully sent leaderboard message")
-        except Exception as e:
-            print(f"Error in leaderboard command: {e}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            # Render the first page; the buttons render the other pages on demand
+            view = LeaderboardView(bot, interaction.guild, period=period)
+            leaderboard_message = await view.render()
+            await interaction.response.send_message(leaderboard_message, view=view)
+            logger.info("Sent leaderboard ranked_users=%d", bot.stats_manager.leaderboard_size(view.guild_id, period))
+        except Exception:
+            logger.exception("Error in leaderboard command")
             await interaction.response.send_message("```\nSorry, there was an error displaying the leaderboard. Please try again later.\n```")
 
-    return bot 
+    @bot.tree.command(name="botmetrics", description="View bot performance metrics")
+    @app_commands.guild_only()
+    @app_commands.default_permissions(administrator=True)
+    @instrumented("botmetrics")
+    async def botmetrics(interaction: discord.Interaction):
+        """Handles the /botmetrics command - shows latency and error metrics to administrators.
+        
+        Shows, only to the user who ran the command:
+        - Gateway latency, and the latency and guild count of every shard when sharded
+        - Call count, error count and p50/p99 latency of every command and button handler
+        - Time spent in stats storage I/O
+        - Active trivia question registry counters
+        
+        The command is guild-only, because default permissions don't apply in direct
+        messages, and the invoker's administrator permission is checked again here
+        in case a guild overrode the default permissions.
+        """
+        if interaction.guild is None or not interaction.permissions.administrator:
+            await interaction.response.send_message("```\nOnly server administrators can view bot metrics.\n```",
+                                                    ephemeral=True)
+            return
+        bot.update_metric_gauges()
+        latency = "n/a" if math.isnan(bot.latency) else f"{bot.latency * 1000:.0f} ms"
+        lines = [f"Gateway latency: {latency}"]
+        shard_latencies = bot.shard_latencies()
+        if len(shard_latencies) > 1:
+            guild_counts = bot.shard_guild_counts()
+            for shard_id, shard_latency in shard_latencies:
+                shard_latency = "n/a" if math.isnan(shard_latency) else f"{shard_latency * 1000:.0f} ms"
+                lines.append(f"Shard {shard_id}: {shard_latency} | {guild_counts.get(shard_id, 0)} guilds")
+        lines.extend(["", "Handlers:"])
+        for labels, histogram in sorted(METRICS.histograms.get('trivia_bot_handler_seconds', {}).items()):
+            handler = dict(labels)['handler']
+            errors = METRICS.get_counter('trivia_bot_handler_calls_total', handler=handler, status='error')
+            lines.append(f"/{handler}: {histogram.count} calls | {errors:.0f} errors | "
+                         f"p50 {histogram.quantile(0.5) * 1000:.1f} ms | p99 {histogram.quantile(0.99) * 1000:.1f} ms")
+        lines.append("")
+        lines.append("Stats I/O:")
+        for labels, histogram in sorted(METRICS.histograms.get('trivia_bot_stats_io_seconds', {}).items()):
+            labels = dict(labels)
+            name = f"{labels['operation']} ({labels['durability']})" if 'durability' in labels else labels['operation']
+            lines.append(f"{name}: {histogram.count} calls | {histogram.sum * 1000:.1f} ms total | "
+                         f"p99 {histogram.quantile(0.99) * 1000:.1f} ms")
+        for labels, histogram in sorted(METRICS.histograms.get('trivia_bot_stats_fsync_seconds', {}).items()):
+            labels = dict(labels)
+            lines.append(f"fsync {labels['target']} ({labels['policy']}): {histogram.count} calls | "
+                         f"p99 {histogram.quantile(0.99) * 1000:.1f} ms")
+        lines.append("")
+        lines.append("Active questions: " + ", ".join(f"{name} {value}" for name, value in bot.active_questions.metrics().items()))
+        await interaction.response.send_message("```\n" + "\n".join(lines)[:1900] + "\n```", ephemeral=True)
+
+    return bot
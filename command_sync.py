@@ -0,0 +1,61 @@
+# Import required libraries for hashing, JSON state files, and type hints
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+import discord
+from discord import app_commands
+
+
+def fingerprint_commands(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """Hash the serialized slash commands of one scope of a command tree.
+
+    Args:
+        tree (app_commands.CommandTree): The command tree to fingerprint
+        guild (discord.abc.Snowflake, optional): The guild whose commands to hash. Hashes the global commands if None.
+
+    Returns:
+        str: A SHA-256 hex digest that changes whenever the commands Discord would receive change.
+    """
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command.get('type', 1), command['name']),
+    )
+    serialized = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class CommandSyncCache:
+    """Remembers the fingerprint of the commands last synced to each scope.
+
+    The fingerprints are stored in a small JSON file, keyed by application ID
+    and then by scope ("global" or a guild ID), so a restart can tell whether
+    syncing is needed without calling Discord.
+    """
+
+    def __init__(self, filename: str = ".command_sync.json"):
+        """Load the stored fingerprints.
+
+        Args:
+            filename (str): The JSON file holding the fingerprints. A missing or unreadable file counts as empty.
+        """
+        self.filename = filename
+        self._fingerprints: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(filename):
+            try:
+                with open(filename, 'r') as file:
+                    self._fingerprints = json.load(file)
+            except (OSError, ValueError):
+                self._fingerprints = {}
+
+    def is_current(self, application_id: int, scope: str, fingerprint: str) -> bool:
+        """Return True if this fingerprint was already synced to the scope."""
+        return self._fingerprints.get(str(application_id), {}).get(scope) == fingerprint
+
+    def store(self, application_id: int, scope: str, fingerprint: str):
+        """Record a successful sync and write the file."""
+        self._fingerprints.setdefault(str(application_id), {})[scope] = fingerprint
+        with open(self.filename + '.tmp', 'w') as file:
+            json.dump(self._fingerprints, file, indent=2)
+        os.replace(self.filename + '.tmp', self.filename)
@@ -0,0 +1,92 @@
+# Import required libraries for binary search and type hints
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class LeaderboardIndex:
+    """Keeps the users that qualify for the leaderboard in ranked order.
+
+    Users are ordered by success rate (descending), then by total questions
+    answered (descending), then by user ID so ties always rank the same way.
+    The index is updated one user at a time, which takes a binary search plus
+    a single list insert/delete, and the top k users are read with a slice,
+    so nothing has to be re-sorted when the leaderboard is displayed.
+    """
+
+    def __init__(self, min_questions: int = 10):
+        """Initialize an empty index.
+
+        Args:
+            min_questions (int): The number of questions a user must have answered to be ranked.
+        """
+        self.min_questions = min_questions
+        # Sorted list of ranking keys: (-success_rate, -total, user_id)
+        self._keys: List[Tuple[float, int, int]] = []
+        # The current ranking key of every ranked user
+        self._key_by_user: Dict[int, Tuple[float, int, int]] = {}
+
+    @staticmethod
+    def _make_key(user_id: int, correct: int, total: int) -> Tuple[float, int, int]:
+        """Build the ranking key for a user, smallest key ranks first."""
+        return (-(correct / total), -total, user_id)
+
+    def rebuild(self, entries: Iterable[Tuple[int, int, int]]):
+        """Replace the index contents with a single sort.
+
+        Args:
+            entries (Iterable[Tuple[int, int, int]]): (user_id, correct, total) for every user
+        """
+        self._key_by_user = {
+            user_id: self._make_key(user_id, correct, total)
+            for user_id, correct, total in entries
+            if total >= self.min_questions
+        }
+        self._keys = sorted(self._key_by_user.values())
+
+    def update(self, user_id: int, correct: int, total: int):
+        """Move a user to their new position after their stats changed.
+
+        Args:
+            user_id (int): The Discord user ID of the player
+            correct (int): The user's number of correct answers
+            total (int): The user's total number of questions answered
+        """
+        self.remove(user_id)
+        if total >= self.min_questions:
+            key = self._make_key(user_id, correct, total)
+            self._key_by_user[user_id] = key
+            insort(self._keys, key)
+
+    def remove(self, user_id: int):
+        """Remove a user from the index if they are ranked."""
+        key = self._key_by_user.pop(user_id, None)
+        if key is not None:
+            del self._keys[bisect_left(self._keys, key)]
+
+    def top(self, limit: Optional[int] = None, offset: int = 0) -> List[int]:
+        """Return the user IDs of a slice of the ranking.
+
+        Args:
+            limit (int, optional): The maximum number of users to return. Returns everyone if None.
+            offset (int): The number of top-ranked users to skip.
+
+        Returns:
+            List[int]: User IDs in rank order, best first.
+        """
+        end = None if limit is None else offset + limit
+        return [key[2] for key in self._keys[offset:end]]
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """Return a user's 1-based position in the ranking, or None if they are not ranked.
+
+        The user's key is found with a binary search of the sorted keys, so this
+        takes O(log n) time no matter how many users are ranked.
+        """
+        key = self._key_by_user.get(user_id)
+        if key is None:
+            return None
+        return bisect_left(self._keys, key) + 1
+
+    def __len__(self) -> int:
+        """Return the number of ranked users."""
+        return len(self._keys)
@@ -1,11 +1,13 @@
-# Import required libraries for environment variables, bot setup, and logging
+# Import required libraries for environment variables, startup timing, and logging
+# The bot itself (and discord.py) is imported inside main(), so the import is timed as a startup phase
 import os
-from bot import setup_bot
+from startup import STARTUP
 import logging
 
 # Configure logging to display INFO level messages and above
-# This will help with debugging and monitoring the bot's operation
-logging.basicConfig(level=logging.INFO)
+# This will help with debugging and monitoring the bot's operation.
+# Log lines carry a timestamp, level and logger name, and messages use key=value fields.
+logging.basicConfig(level=logging.INFO, format="%(asctime)s level=%(levelname)s logger=%(name)s %(message)s")
 
 def main():
     """Main entry point for the Discord bot application"""
@@ -23,9 +25,44 @@ def main():
     logging.info(f"Token length: {len(TOKEN)} characters")
     
     try:
+        with STARTUP.phase('import'):
+            from bot import setup_bot
+            from stats_storage import DurabilityPolicy, create_backend
+
         # Initialize and configure the bot
+        # Choose where user statistics are stored: "csv" (default), "sqlite", "shared-sqlite" or "journal"
+        # Use "shared-sqlite" when several bot processes (for example split shards) share one database
+        # To migrate existing stats, run: python stats_storage.py trivia_stats.csv trivia_stats.db
+        backend_kind = os.getenv('STATS_BACKEND', 'csv')
+        # Upgrading from a version that kept one set of stats across all guilds: the bot refuses to open the old
+        # stats until LEGACY_GUILD_ID names the guild they belong to (0 shows them in direct messages instead).
+        # They are migrated to that guild on the first start, after which the variable can be removed
+        legacy_guild_id = int(os.environ['LEGACY_GUILD_ID']) if os.getenv('LEGACY_GUILD_ID') else None
+        # Choose when stats writes are forced to disk: "always" (default), "interval" or "os".
+        # With "interval", a write is synced if the last sync was STATS_FSYNC_INTERVAL (default 5) seconds ago
+        durability = DurabilityPolicy(os.getenv('STATS_DURABILITY', 'always'),
+                                      float(os.getenv('STATS_FSYNC_INTERVAL', '5')))
+        logging.info(f"Using {backend_kind} stats backend durability={durability.mode}")
         logging.info("Setting up bot...")
-        bot = setup_bot()
+        # Optionally sync commands to specific guilds too, e.g. SYNC_GUILD_IDS="123,456" for test servers
+        sync_guild_ids = [int(guild_id) for guild_id in os.getenv('SYNC_GUILD_IDS', '').split(',') if guild_id.strip()]
+        # Optionally export Prometheus metrics to a file, e.g. METRICS_FILE="/var/lib/node_exporter/trivia_bot.prom"
+        # Optionally run several gateway shards, e.g. SHARDED=1 for Discord's recommended shard count.
+        # To split shards across processes, give each process SHARD_COUNT="4" and its own SHARD_IDS="0,1".
+        # Split shards need STATS_BACKEND="shared-sqlite"; the bot refuses to start with any other backend
+        shard_count = int(os.environ['SHARD_COUNT']) if os.getenv('SHARD_COUNT') else None
+        shard_ids = [int(shard_id) for shard_id in os.getenv('SHARD_IDS', '').split(',') if shard_id.strip()] or None
+        sharded = os.getenv('SHARDED', '').lower() in ('1', 'true', 'yes') or shard_count is not None
+        # Stats are kept per guild; GLOBAL_STATS=1 also keeps totals across guilds, shown in direct messages
+        global_stats = os.getenv('GLOBAL_STATS', '').lower() in ('1', 'true', 'yes')
+        if sharded:
+            logging.info(f"Running sharded: shard_count={shard_count or 'auto'} shard_ids={shard_ids or 'all'}")
+        with STARTUP.phase('setup_bot'):
+            bot = setup_bot(stats_backend=create_backend(backend_kind, os.getenv('STATS_FILE'), durability,
+                                                         legacy_guild_id),
+                            sync_guild_ids=sync_guild_ids, metrics_file=os.getenv('METRICS_FILE'),
+                            sharded=sharded, shard_count=shard_count, shard_ids=shard_ids,
+                            global_stats=global_stats)
         logging.info("Bot setup complete")
         
         # Start the bot and connect to Discord
@@ -0,0 +1,144 @@
+# Import required libraries for Discord member lookups, concurrency, timing, and type hints
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Discord accepts at most 100 user IDs per member query
+QUERY_MEMBERS_LIMIT = 100
+
+
+class MemberNameResolver:
+    """Resolves Discord user IDs to display names as cheaply as possible.
+
+    Names are looked up in this order, each step only handling what the
+    previous steps could not find:
+    1. A TTL cache of names resolved earlier
+    2. The gateway member cache of the guild (no network traffic)
+    3. Bulk gateway member queries, up to 100 users per request
+    4. Individual REST fetches, with a bound on how many run at once, only
+       for users whose member query failed
+
+    Users that can't be found fall back to "User <id>", and that fallback is
+    cached too so missing members are not fetched again on every call.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_concurrency: int = 5, max_entries: int = 10000):
+        """Initialize the resolver with an empty cache.
+
+        Args:
+            ttl (float): Seconds a resolved name stays cached.
+            max_concurrency (int): Maximum number of REST member fetches running at the same time.
+            max_entries (int): Maximum number of cached names before the oldest ones are dropped.
+        """
+        self.ttl = ttl
+        self.max_concurrency = max_concurrency
+        self.max_entries = max_entries
+        # (guild_id, user_id) -> (name, expiry time)
+        self._cache: Dict[Tuple[int, int], Tuple[str, float]] = {}
+
+    def _remember(self, guild_id: int, user_id: int, name: str):
+        """Store a resolved name in the cache, dropping the oldest entry if the cache is full."""
+        key = (guild_id, user_id)
+        self._cache.pop(key, None)
+        if len(self._cache) >= self.max_entries:
+            # Dictionaries keep insertion order, so the first key is the oldest entry
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = (name, time.monotonic() + self.ttl)
+
+    def _cached(self, guild_id: int, user_id: int) -> Optional[str]:
+        """Return a cached name if it hasn't expired yet."""
+        entry = self._cache.get((guild_id, user_id))
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del self._cache[(guild_id, user_id)]
+            return None
+        return entry[0]
+
+    async def resolve(self, guild: Optional[discord.Guild], user_ids: Iterable[int]) -> Dict[int, str]:
+        """Resolve user IDs to names for one guild.
+
+        Args:
+            guild (discord.Guild, optional): The guild to look members up in. If None (for example
+                                           in direct messages) every user gets the fallback name.
+            user_ids (Iterable[int]): The users to resolve. Only pass the users that will be shown.
+
+        Returns:
+            Dict[int, str]: A mapping of every requested user ID to a name.
+        """
+        user_ids = list(user_ids)
+        if guild is None:
+            return {user_id: f"User {user_id}" for user_id in user_ids}
+
+        names: Dict[int, str] = {}
+        missing: List[int] = []
+        for user_id in user_ids:
+            name = self._cached(guild.id, user_id)
+            if name is None:
+                member = guild.get_member(user_id)
+                if member is not None:
+                    name = member.name
+                    self._remember(guild.id, user_id, name)
+            if name is None:
+                missing.append(user_id)
+            else:
+                names[user_id] = name
+
+        if missing:
+            missing = await self._query_members(guild, missing, names)
+        if missing:
+            await self._fetch_members(guild, missing, names)
+        return names
+
+    async def _query_members(self, guild: discord.Guild, user_ids: List[int], names: Dict[int, str]) -> List[int]:
+        """Look up members in bulk over the gateway, 100 users per request.
+
+        A successful query returns every requested user that is in the guild, so
+        users it leaves out get the (cached) fallback name without a REST fetch.
+
+        Returns:
+            List[int]: The users that could not be queried and still need a REST fetch.
+        """
+        for start in range(0, len(user_ids), QUERY_MEMBERS_LIMIT):
+            chunk = user_ids[start:start + QUERY_MEMBERS_LIMIT]
+            try:
+                members = await guild.query_members(user_ids=chunk, cache=True)
+            except (asyncio.TimeoutError, discord.ClientException) as e:
+                # Member queries need the members intent and can time out; the REST fallback handles the rest
+                logger.warning("Member query failed guild=%s users=%d: %s", guild.id, len(user_ids) - start, e)
+                return user_ids[start:]
+            for member in members:
+                names[member.id] = member.name
+                self._remember(guild.id, member.id, member.name)
+            for user_id in chunk:
+                if user_id not in names:
+                    names[user_id] = f"User {user_id}"
+                    self._remember(guild.id, user_id, names[user_id])
+        return []
+
+    async def _fetch_members(self, guild: discord.Guild, user_ids: List[int], names: Dict[int, str]):
+        """Fetch the remaining members over REST, at most max_concurrency at a time."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(user_id: int):
+            async with semaphore:
+                try:
+                    member = await guild.fetch_member(user_id)
+                    name = member.name
+                except discord.NotFound:
+                    logger.info("Member not found guild=%s user=%s", guild.id, user_id)
+                    name = f"User {user_id}"
+                except discord.HTTPException as e:
+                    # Don't cache transient errors, the next call may succeed
+                    logger.warning("HTTP error fetching member guild=%s user=%s: %s", guild.id, user_id, e)
+                    names[user_id] = f"User {user_id}"
+                    return
+            names[user_id] = name
+            self._remember(guild.id, user_id, name)
+
+        await asyncio.gather(*(fetch(user_id) for user_id in user_ids))
@@ -0,0 +1,210 @@
+# Import required libraries for timing, decorators, atomic file writes, locking, and type hints
+import functools
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Metric labels as a sorted tuple of (name, value) pairs, so they can be used as dictionary keys
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """A fixed-bucket latency histogram, in the same shape Prometheus uses."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize an empty histogram.
+
+        Args:
+            buckets (Sequence[float]): Sorted bucket upper bounds; an implicit +Inf bucket is added.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Per-bucket counts, the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile (0 to 1) by linear interpolation inside the matching bucket.
+
+        Returns 0.0 if nothing was observed. Observations above the largest bucket
+        are reported as the largest bucket bound.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Collects counters, gauges and histograms and renders them for Prometheus.
+
+    Metric names follow Prometheus conventions; labels are passed as keyword arguments:
+        METRICS.inc('trivia_bot_handler_calls_total', handler='trivia', status='ok')
+
+    Metrics may be recorded from worker threads (such as the stats writer), so
+    updates and rendering are serialized by a lock.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.descriptions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels: Dict[str, object]) -> Labels:
+        """Convert keyword labels into a hashable, sorted tuple."""
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def describe(self, name: str, description: str):
+        """Set the HELP text of a metric."""
+        self.descriptions[name] = description
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add to a counter."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to a value."""
+        key = self._labels(labels)
+        with self._lock:
+            self.gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value (usually a duration in seconds) in a histogram."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, name: str, **labels) -> Iterator[None]:
+        """Time a block of code into a histogram.
+
+        Example:
+            with METRICS.time('trivia_bot_stats_io_seconds', operation='flush'):
+                backend.save(...)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def get_counter(self, name: str, **labels) -> float:
+        """Return the current value of a counter, 0 if it was never incremented."""
+        return self.counters.get(name, {}).get(self._labels(labels), 0)
+
+    def get_histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """Return a histogram, or None if nothing was observed for these labels."""
+        return self.histograms.get(name, {}).get(self._labels(labels))
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        """Format labels in Prometheus text syntax, e.g. {handler="trivia"}."""
+        pairs = labels + extra
+        if not pairs:
+            return ''
+        escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+        return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            return self._render_prometheus()
+
+    def _render_prometheus(self) -> str:
+        """Render every metric; the caller holds the lock."""
+        lines: List[str] = []
+        for kind, metrics in (('counter', self.counters), ('gauge', self.gauges)):
+            for name, series in sorted(metrics.items()):
+                if name in self.descriptions:
+                    lines.append(f"# HELP {name} {self.descriptions[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{self._format_labels(labels)} {value}")
+        for name, series in sorted(self.histograms.items()):
+            if name in self.descriptions:
+                lines.append(f"# HELP {name} {self.descriptions[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{self._format_labels(labels, (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus_file(self, filename: str):
+        """Write the Prometheus text to a file atomically, e.g. for the node_exporter textfile collector."""
+        with open(filename + '.tmp', 'w') as file:
+            file.write(self.render_prometheus())
+        os.replace(filename + '.tmp', filename)
+
+
+# The registry used by the whole bot
+METRICS = MetricsRegistry()
+METRICS.describe('trivia_bot_handler_seconds', 'Time spent in slash command and component handlers')
+METRICS.describe('trivia_bot_handler_calls_total', 'Handler calls by outcome')
+METRICS.describe('trivia_bot_stats_io_seconds', 'Time spent in StatsManager storage I/O')
+
+
+def instrumented(handler: str):
+    """Decorator that records latency, call count and errors of an async handler.
+
+    Args:
+        handler (str): The handler name used as the "handler" label, e.g. "trivia" or "answer_button"
+
+    The wrapped function keeps its signature, so it can still be registered as a
+    slash command or button callback.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            status = 'ok'
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                status = 'error'
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                METRICS.observe('trivia_bot_handler_seconds', elapsed, handler=handler)
+                METRICS.inc('trivia_bot_handler_calls_total', handler=handler, status=status)
+                logger.debug("handler=%s status=%s duration_ms=%.2f", handler, status, elapsed * 1000)
+        return wrapper
+    return decorator
@@ -0,0 +1,292 @@
+"""
+Compiled, indexed form of the trivia question database.
+
+TRIVIA_QUESTIONS is compiled once, on first use, into immutable Question
+records with integer IDs, so drawing a question is an index lookup plus one
+of the 24 precomputed answer orderings instead of rebuilding dictionaries
+every time. Importing this module doesn't load the question database; the
+bot warms it up in the background while it connects to Discord.
+deal_question() deals questions from a per-player shuffled deck so players
+don't see repeats until they have worked through the whole bank.
+Question IDs are positions in the bank and change when questions are added
+or removed, so buttons also carry a fingerprint of their question's content,
+which find_question() uses to find it again (or to tell it is gone).
+"""
+# Import required libraries for answer permutations, randomness, caching, checksums, and type hints
+import functools
+import itertools
+import random
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Letters shown on the answer buttons, in display order
+ANSWER_LETTERS = ('A', 'B', 'C', 'D')
+
+# Every ordering of the four answers; each entry lists answer indexes in display order.
+# Index 0 of Question.answers is always the correct answer.
+PERMUTATIONS: Tuple[Tuple[int, ...], ...] = tuple(itertools.permutations(range(len(ANSWER_LETTERS))))
+
+# The letter the correct answer ends up on, for every permutation
+CORRECT_LETTERS: Tuple[str, ...] = tuple(ANSWER_LETTERS[permutation.index(0)] for permutation in PERMUTATIONS)
+
+# Category used for questions that don't name one
+DEFAULT_CATEGORY = "General"
+
+# Maximum number of suggestions Discord shows for an autocomplete option
+MAX_AUTOCOMPLETE_CHOICES = 25
+
+# Number of low bits of a deck state that hold the cursor; the bits above hold the seed
+DECK_CURSOR_BITS = 16
+
+
+class Question(NamedTuple):
+    """A single compiled trivia question.
+
+    Attributes:
+        id (int): Position of the question in QUESTIONS
+        category_id (int): Position of the question's category in CATEGORIES
+        text (str): The question text
+        answers (Tuple[str, ...]): All answers, with the correct answer first
+        hint (str): A helpful hint for the question
+        fingerprint (int): A 32-bit checksum of the text and answers, the same in every process
+                           and restart as long as the question itself is unchanged
+    """
+    id: int
+    category_id: int
+    text: str
+    answers: Tuple[str, ...]
+    hint: str
+    fingerprint: int
+
+    @property
+    def correct_answer(self) -> str:
+        """The text of the correct answer."""
+        return self.answers[0]
+
+    def shuffled_answers(self, permutation_id: int) -> Tuple[str, ...]:
+        """Return the answers in the display order of a permutation."""
+        return tuple(self.answers[index] for index in PERMUTATIONS[permutation_id])
+
+    def answer_for(self, permutation_id: int, letter: str) -> str:
+        """Return the answer shown on a letter's button for a permutation."""
+        return self.answers[PERMUTATIONS[permutation_id][ANSWER_LETTERS.index(letter)]]
+
+
+def compile_questions(raw_questions: List[dict]) -> Tuple[Tuple[str, ...], Tuple[Question, ...]]:
+    """Compile question dictionaries into category names and Question records.
+
+    Args:
+        raw_questions (List[dict]): Questions in the TRIVIA_QUESTIONS format, optionally with a "category" key
+
+    Returns:
+        Tuple[Tuple[str, ...], Tuple[Question, ...]]: The category names (indexed by category ID)
+        and the compiled questions (indexed by question ID).
+    """
+    category_ids: Dict[str, int] = {}
+    questions = []
+    for question_id, entry in enumerate(raw_questions):
+        category = entry.get('category', DEFAULT_CATEGORY)
+        category_id = category_ids.setdefault(category, len(category_ids))
+        answers = (entry['correct_answer'], *entry['incorrect_answers'])
+        questions.append(Question(
+            id=question_id,
+            category_id=category_id,
+            text=entry['question'],
+            answers=answers,
+            hint=entry['hint'],
+            fingerprint=question_fingerprint(entry['question'], answers),
+        ))
+    return tuple(category_ids), tuple(questions)
+
+
+def question_fingerprint(text: str, answers: Tuple[str, ...]) -> int:
+    """Return a stable 32-bit checksum of a question's text and answers.
+
+    Unlike hash(), it doesn't change between processes, so it can be stored in button custom IDs.
+    """
+    return zlib.crc32('\x1f'.join((text, *answers)).encode())
+
+
+def build_category_index(categories: Tuple[str, ...], questions: Tuple[Question, ...]) -> Tuple[Tuple[int, ...], ...]:
+    """Group question IDs by category.
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: For every category ID, the IDs of its questions.
+    """
+    question_ids: List[List[int]] = [[] for _ in categories]
+    for question in questions:
+        question_ids[question.category_id].append(question.id)
+    return tuple(tuple(ids) for ids in question_ids)
+
+
+def build_autocomplete_index(categories: Tuple[str, ...]) -> Dict[str, Tuple[str, ...]]:
+    """Map every lowercase prefix of every word of a category name to the matching category names.
+
+    Only word prefixes match, so typing "sec" suggests "Computer Security" but
+    not "Cybersecurity", and "net" suggests "Computer Networks".
+    The empty prefix lists every category.
+    """
+    matches: Dict[str, List[str]] = {'': list(categories)}
+    for category in categories:
+        lowered = category.lower()
+        prefixes = {lowered[:end] for end in range(1, len(lowered) + 1)}
+        # Also match from the start of every later word, e.g. "net" for "Computer Networks"
+        for start in (index + 1 for index, char in enumerate(lowered) if char == ' '):
+            prefixes.update(lowered[start:end] for end in range(start + 1, len(lowered) + 1))
+        for prefix in prefixes:
+            matches.setdefault(prefix, []).append(category)
+    return {prefix: tuple(names[:MAX_AUTOCOMPLETE_CHOICES]) for prefix, names in matches.items()}
+
+
+class QuestionBank(NamedTuple):
+    """The compiled question bank and its lookup indexes.
+
+    Attributes:
+        categories (Tuple[str, ...]): Category names, indexed by category ID
+        questions (Tuple[Question, ...]): Compiled questions, indexed by question ID
+        category_ids (Dict[str, int]): Lowercase category name -> category ID
+        category_question_ids (Tuple[Tuple[int, ...], ...]): Category ID -> IDs of the questions in that category
+        category_autocomplete (Dict[str, Tuple[str, ...]]): Lowercase typed text -> category names to suggest
+        fingerprint_ids (Dict[int, int]): Question fingerprint -> question ID
+    """
+    categories: Tuple[str, ...]
+    questions: Tuple[Question, ...]
+    category_ids: Dict[str, int]
+    category_question_ids: Tuple[Tuple[int, ...], ...]
+    category_autocomplete: Dict[str, Tuple[str, ...]]
+    fingerprint_ids: Dict[int, int]
+
+
+@functools.lru_cache(maxsize=None)
+def load_question_bank() -> QuestionBank:
+    """Import and compile the question database. Only the first call does any work.
+
+    Safe to call from a worker thread, so the bank can be built while the bot connects.
+    """
+    from trivia_questions import TRIVIA_QUESTIONS
+    categories, questions = compile_questions(TRIVIA_QUESTIONS)
+    return QuestionBank(
+        categories=categories,
+        questions=questions,
+        category_ids={name.lower(): category_id for category_id, name in enumerate(categories)},
+        category_question_ids=build_category_index(categories, questions),
+        category_autocomplete=build_autocomplete_index(categories),
+        # Questions with the same text and answers are interchangeable, so the first one is enough
+        fingerprint_ids={question.fingerprint: question.id for question in reversed(questions)},
+    )
+
+
+# Module attributes that are served from the lazily loaded question bank
+_BANK_ATTRIBUTES = {
+    'CATEGORIES': 'categories',
+    'QUESTIONS': 'questions',
+    'CATEGORY_IDS': 'category_ids',
+    'CATEGORY_QUESTION_IDS': 'category_question_ids',
+    'CATEGORY_AUTOCOMPLETE': 'category_autocomplete',
+}
+
+
+def __getattr__(name: str):
+    """Load the question bank the first time one of its module attributes (e.g. QUESTIONS) is used."""
+    if name in _BANK_ATTRIBUTES:
+        return getattr(load_question_bank(), _BANK_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_question(question_id: int) -> Question:
+    """Look a question up by its ID.
+
+    Raises:
+        IndexError: If no question has that ID
+    """
+    return load_question_bank().questions[question_id]
+
+
+def find_question(question_id: int, fingerprint: Optional[int] = None) -> Optional[Question]:
+    """Find the question a button was made for, even if the bank changed since.
+
+    Args:
+        question_id (int): The ID the question had when the button was made
+        fingerprint (int, optional): The question's fingerprint. Buttons made before fingerprints
+                                     were added have none; their question is trusted to still be at question_id.
+
+    Returns:
+        Optional[Question]: The question, or None if it was removed or changed.
+    """
+    bank = load_question_bank()
+    if 0 <= question_id < len(bank.questions):
+        question = bank.questions[question_id]
+        if fingerprint is None or question.fingerprint == fingerprint:
+            return question
+    if fingerprint is None:
+        return None
+    moved_id = bank.fingerprint_ids.get(fingerprint)
+    return None if moved_id is None else bank.questions[moved_id]
+
+
+def find_category(name: str) -> Optional[int]:
+    """Return the ID of a category by name (case-insensitive), or None if there is no such category."""
+    return load_question_bank().category_ids.get(name.strip().lower())
+
+
+def suggest_categories(current: str) -> Tuple[str, ...]:
+    """Return the category names to suggest while a user is typing a category."""
+    return load_question_bank().category_autocomplete.get(current.strip().lower(), ())
+
+
+def draw_question(rng: random.Random = random, category_id: Optional[int] = None) -> Tuple[Question, int]:
+    """Draw a random question and a random answer order.
+
+    Args:
+        rng (random.Random): The random number generator to use. Defaults to the random module.
+        category_id (int, optional): Only draw from this category. Draws from every question if None.
+
+    Returns:
+        Tuple[Question, int]: The question and the ID of its answer permutation.
+    """
+    bank = load_question_bank()
+    if category_id is None:
+        question = bank.questions[rng.randrange(len(bank.questions))]
+    else:
+        question_ids = bank.category_question_ids[category_id]
+        question = bank.questions[question_ids[rng.randrange(len(question_ids))]]
+    return question, rng.randrange(len(PERMUTATIONS))
+
+
+@functools.lru_cache(maxsize=1024)
+def _deck(seed: int, size: int) -> Tuple[int, ...]:
+    """Return the shuffled question IDs for a deck seed.
+
+    Decks are cached, so dealing from a recently used deck is a tuple lookup.
+    """
+    deck = list(range(size))
+    random.Random(seed).shuffle(deck)
+    return tuple(deck)
+
+
+def deal_question(deck_state: int, rng: random.Random = random) -> Tuple[Question, int, int]:
+    """Deal the next question from a player's shuffled deck.
+
+    Every player works through the whole question bank in a shuffled order
+    before seeing a question again. A deck is stored as one integer: the seed
+    of its shuffle, shifted left by DECK_CURSOR_BITS, plus the number of
+    questions already dealt from it. When the deck runs out (or the number of
+    questions changed so the cursor no longer fits) a new seed is drawn.
+
+    Args:
+        deck_state (int): The player's current deck state, 0 for a new player
+        rng (random.Random): The random number generator to use. Defaults to the random module.
+
+    Returns:
+        Tuple[Question, int, int]: The question, the ID of its answer permutation,
+        and the new deck state to store for the player.
+    """
+    questions = load_question_bank().questions
+    seed = deck_state >> DECK_CURSOR_BITS
+    cursor = deck_state & ((1 << DECK_CURSOR_BITS) - 1)
+    if seed == 0 or cursor >= len(questions):
+        seed = rng.randrange(1, 1 << 32)
+        cursor = 0
+    question = questions[_deck(seed, len(questions))[cursor]]
+    new_state = (seed << DECK_CURSOR_BITS) | (cursor + 1)
+    return question, rng.randrange(len(PERMUTATIONS)), new_state
@@ -0,0 +1,68 @@
+# Import required libraries for timing, logging, and type hints
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+METRICS.describe('trivia_bot_startup_phase_seconds', 'Duration of each startup phase')
+METRICS.describe('trivia_bot_startup_seconds', 'Time from process start until the bot was first ready')
+
+
+class StartupTimeline:
+    """Records how long each phase of starting the bot takes.
+
+    Phases may overlap (stats load in the background while the gateway
+    connects), so every phase keeps its start offset as well as its duration.
+    Each phase is logged at INFO when it ends, and finish() logs the whole
+    timeline once the bot is ready for the first time.
+    """
+
+    def __init__(self):
+        """Start the timeline now; offsets are measured from this moment."""
+        self.started_at = time.perf_counter()
+        # (phase name, start offset in seconds, duration in seconds), in the order phases ended
+        self.phases: List[Tuple[str, float, float]] = []
+        self.finished_at: Optional[float] = None
+
+    def elapsed(self) -> float:
+        """Return the seconds since the timeline started."""
+        return time.perf_counter() - self.started_at
+
+    def record(self, name: str, start: float):
+        """Record a phase that started at a time.perf_counter() value and ends now."""
+        duration = time.perf_counter() - start
+        offset = start - self.started_at
+        self.phases.append((name, offset, duration))
+        METRICS.set_gauge('trivia_bot_startup_phase_seconds', duration, phase=name)
+        logger.info("Startup phase=%s start_ms=%.1f duration_ms=%.1f", name, offset * 1000, duration * 1000)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of startup code as one phase.
+
+        Example:
+            with STARTUP.phase('login'):
+                await super().login(token)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def finish(self):
+        """Log the full timeline. Only the first call does anything, so reconnects don't log it again."""
+        if self.finished_at is not None:
+            return
+        self.finished_at = self.elapsed()
+        METRICS.set_gauge('trivia_bot_startup_seconds', self.finished_at)
+        phases = " ".join(f"{name}={duration * 1000:.0f}ms" for name, _, duration in self.phases)
+        logger.info("Startup complete total_ms=%.1f %s", self.finished_at * 1000, phases)
+
+
+# The timeline of this process, started when this module is first imported
+STARTUP = StartupTimeline()
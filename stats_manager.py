@@ -1,7 +1,18 @@
-# Import required libraries for CSV file handling, operating system operations, and type hints
-import csv
-import os
-from typing import Dict, Tuple, List
+# Import required libraries for the event loop, timing, type hints, and the storage backends
+import asyncio
+import collections
+import concurrent.futures
+import time
+from typing import Deque, Dict, Iterator, Tuple, List, Set, Optional
+from stats_storage import (StatsBackend, CSVStatsBackend, StatsKey, UserStats, DEFAULT_GUILD_ID,
+                           EVENT_CORRECT, EVENT_INCORRECT, EVENT_HINT, EVENT_DECK)
+from leaderboard_index import LeaderboardIndex
+from metrics import METRICS
+from stats_writer import StatsEvent, StatsWriter
+from windowed_leaderboards import PERIOD_ALL, PERIOD_TITLES, WindowEntry, WindowedLeaderboards
+
+# Number of questions a user must answer before appearing on the leaderboard
+MIN_LEADERBOARD_QUESTIONS = 10
 
 class StatsManager:
     """Manages the storage and retrieval of trivia game statistics for users.
@@ -12,125 +23,377 @@ class StatsManager:
     - Tracking hint usage
     - Calculating success rates
     - Generating leaderboards
-    - Persistent storage in CSV format
+    - Keeping separate stats and leaderboards for every guild, with optional totals across guilds
+    - Rolling daily, weekly and monthly leaderboards next to the lifetime ones
+    - Persistent storage through a pluggable backend (CSV by default, SQLite, or an event journal)
+    - Optional write-behind mode that batches writes instead of saving on every change
+    - Writing on a dedicated writer thread, so the event loop never waits for the disk
     """
     
-    def __init__(self, filename: str = "trivia_stats.csv"):
-        """Initialize the stats manager with a CSV file for persistent storage.
+    def __init__(self, filename: str = "trivia_stats.csv", write_behind: bool = False,
+                 flush_interval: float = 5.0, flush_threshold: int = 100,
+                 backend: Optional[StatsBackend] = None, load_on_init: bool = True,
+                 global_stats: bool = False):
+        """Initialize the stats manager with a storage backend for persistent storage.
         
         Args:
             filename (str): The name of the CSV file to store stats. Defaults to "trivia_stats.csv".
-                          The file will be created if it doesn't exist.
+                          The file will be created if it doesn't exist. Ignored if backend is given.
+            write_behind (bool): If True, changes are only marked dirty in memory and written
+                               in one batch by flush() instead of saving on every change.
+            flush_interval (float): Seconds between timed flushes in write-behind mode.
+            flush_threshold (int): Number of pending changes that forces an immediate flush
+                                 in write-behind mode.
+            backend (StatsBackend, optional): The storage backend to use. Defaults to a
+                                            CSVStatsBackend for filename.
+            load_on_init (bool): If False, stats are not loaded until load_stats() is called,
+                               for example from a worker thread while the bot connects.
+                               No other method may be used before that call completes.
+            global_stats (bool): If True, also keep every user's totals across all guilds
+                               and a global leaderboard, read by passing guild_id=None.
         """
         self.filename = filename  # Name of the CSV file to store stats
-        # Dictionary to store user stats in memory: user_id -> {trivias_answered, correct, incorrect, hints_used}
-        self.stats: Dict[int, Dict[str, int]] = {}
-        self.load_stats()  # Load existing stats from file on startup
+        # Storage backend that persists the stats (CSV file unless another backend is given)
+        self.backend = backend if backend is not None else CSVStatsBackend(filename)
+        # Dictionary to store user stats in memory: (guild_id, user_id) -> UserStats record
+        # with trivias_answered, correct, incorrect, hints_used and deck_state
+        self.stats: Dict[StatsKey, UserStats] = {}
+        # Per guild, a ranked index of users with at least MIN_LEADERBOARD_QUESTIONS answers, kept up to date by update_stats
+        self.leaderboard_indexes: Dict[int, LeaderboardIndex] = {}
+        # Optional totals across all guilds: user_id -> the same counters, and their ranked index
+        self.global_stats = global_stats
+        self.global_totals: Dict[int, UserStats] = {}
+        self.global_index = LeaderboardIndex(MIN_LEADERBOARD_QUESTIONS)
+        # Per-day counters of recently active users, ranked over every period such as the last 7 days
+        self.windowed_leaderboards = WindowedLeaderboards(MIN_LEADERBOARD_QUESTIONS)
+        # Write-behind settings and bookkeeping
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._dirty: Set[StatsKey] = set()  # (guild_id, user_id) pairs changed since the last flush
+        self._pending_changes = 0  # Number of changes since the last flush
+        self._events: List[StatsEvent] = []  # Changes recorded since the last flush, for the backend
+        # Users changed by other processes, read by the writer thread and applied on the next flush
+        self._refreshed: Deque[Dict[StatsKey, UserStats]] = collections.deque()
+        # Thread that performs every backend write, coalescing flushes requested while one is in flight
+        self.writer = StatsWriter(self._write)
+        self.loaded = False  # Whether load_stats() has completed
+        if load_on_init:
+            self.load_stats()  # Load existing stats from the backend on startup
 
     def load_stats(self):
-        """Load user statistics from the CSV file into memory.
-        
-        This method reads the CSV file and populates the stats dictionary.
-        If the file doesn't exist, it will be created when stats are first saved.
-        The method handles backward compatibility by defaulting hints_used to 0
-        for existing entries that don't have this field.
-        """
-        if os.path.exists(self.filename):
-            with open(self.filename, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Convert user_id to integer and store their stats
-                    user_id = int(row['user_id'])
-                    self.stats[user_id] = {
-                        'trivias_answered': int(row['trivias_answered']),
-                        'correct': int(row['correct']),
-                        'incorrect': int(row['incorrect']),
-                        'hints_used': int(row.get('hints_used', 0))  # Default to 0 if not present
-                    }
+        """Load user statistics from the storage backend into memory.
+        
+        This method reads every stored user and populates the stats dictionary.
+        If nothing has been stored yet, the stats dictionary stays empty.
+        The leaderboard indexes (and the global totals, if enabled) are rebuilt from the loaded stats.
+        The windowed leaderboards are rebuilt from the backend's per-day counters
+        (see StatsBackend.load_daily_counts).
+        """
+        with METRICS.time('trivia_bot_stats_io_seconds', operation='load'):
+            self.stats.update(self.backend.load_all())
+        # Group the leaderboard entries by guild, then build every guild's index in one pass
+        entries: Dict[int, List[Tuple[int, int, int]]] = {}
+        for (guild_id, user_id), stats in self.stats.items():
+            entries.setdefault(guild_id, []).append((user_id, stats.correct, stats.trivias_answered))
+        self.leaderboard_indexes = {}
+        for guild_id, guild_entries in entries.items():
+            self._index(guild_id).rebuild(guild_entries)
+        if self.global_stats:
+            self.global_totals = {}
+            for (_, user_id), stats in self.stats.items():
+                self._add_to_global(user_id, stats.trivias_answered, stats.correct, stats.incorrect, stats.hints_used,
+                                    update_index=False)
+            self.global_index.rebuild(
+                (user_id, totals.correct, totals.trivias_answered) for user_id, totals in self.global_totals.items()
+            )
+        self.windowed_leaderboards.load(self._window_history())
+        self.loaded = True
+
+    def _window_history(self) -> Iterator[WindowEntry]:
+        """Yield the backend's per-day counters within the longest leaderboard window, for every scope they count in."""
+        for entry in self.backend.load_daily_counts(self.windowed_leaderboards.window_start()):
+            yield entry
+            if self.global_stats:
+                yield (entry[0], None, *entry[2:])
+
+    def _add_to_windows(self, guild_id: int, user_id: int, correct: int = 0, total: int = 0, hints: int = 0):
+        """Count counter changes made now in the windowed leaderboards of a guild, and the global ones if enabled."""
+        self.windowed_leaderboards.add(guild_id, user_id, correct, total, hints)
+        if self.global_stats:
+            self.windowed_leaderboards.add(None, user_id, correct, total, hints)
+
+    def _index(self, guild_id: int) -> LeaderboardIndex:
+        """Return a guild's leaderboard index, creating an empty one for a new guild."""
+        index = self.leaderboard_indexes.get(guild_id)
+        if index is None:
+            index = self.leaderboard_indexes[guild_id] = LeaderboardIndex(MIN_LEADERBOARD_QUESTIONS)
+        return index
+
+    def _user_stats(self, guild_id: int, user_id: int) -> UserStats:
+        """Return a player's stats in a guild, initializing stats for new players."""
+        key = (guild_id, user_id)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = UserStats()
+        return stats
+
+    def _add_to_global(self, user_id: int, trivias_answered: int = 0, correct: int = 0, incorrect: int = 0,
+                       hints_used: int = 0, update_index: bool = True):
+        """Add counter changes to a user's totals across guilds, if global stats are enabled.
+        
+        Args:
+            user_id (int): The Discord user ID of the player
+            trivias_answered, correct, incorrect, hints_used (int): Amounts to add to each counter
+            update_index (bool): Whether to move the user in the global leaderboard index
+        """
+        if not self.global_stats:
+            return
+        totals = self.global_totals.get(user_id)
+        if totals is None:
+            totals = self.global_totals[user_id] = UserStats()
+        totals.trivias_answered += trivias_answered
+        totals.correct += correct
+        totals.incorrect += incorrect
+        totals.hints_used += hints_used
+        if update_index:
+            self.global_index.update(user_id, totals.correct, totals.trivias_answered)
+
+    def _scope(self, user_id: int, guild_id: Optional[int]) -> Optional[UserStats]:
+        """Return the stats to read for a user: their stats in a guild, or their totals if guild_id is None."""
+        if guild_id is None:
+            self._require_global_stats()
+            return self.global_totals.get(user_id)
+        return self.stats.get((guild_id, user_id))
+
+    def _scope_index(self, guild_id: Optional[int]) -> LeaderboardIndex:
+        """Return the leaderboard index of a guild, or the global one if guild_id is None."""
+        if guild_id is None:
+            self._require_global_stats()
+            return self.global_index
+        return self._index(guild_id)
+
+    def _require_global_stats(self):
+        """Raise ValueError if totals across guilds are not being kept."""
+        if not self.global_stats:
+            raise ValueError("Global stats are not enabled; create the StatsManager with global_stats=True")
 
     def save_stats(self):
-        """Save current statistics from memory to the CSV file.
-        
-        This method writes all user statistics to the CSV file, creating it if it doesn't exist.
-        The file includes columns for user_id, trivias_answered, correct, incorrect, and hints_used.
-        """
-        with open(self.filename, 'w', newline='') as file:
-            # Create CSV writer with appropriate column headers
-            writer = csv.DictWriter(file, fieldnames=['user_id', 'trivias_answered', 'correct', 'incorrect', 'hints_used'])
-            writer.writeheader()
-            # Write each user's stats to the file
-            for user_id, stats in self.stats.items():
-                writer.writerow({
-                    'user_id': user_id,
-                    'trivias_answered': stats['trivias_answered'],
-                    'correct': stats['correct'],
-                    'incorrect': stats['incorrect'],
-                    'hints_used': stats['hints_used']
-                })
-
-    def update_stats(self, user_id: int, correct: bool):
+        """Save all current statistics from memory to the storage backend.
+        
+        This method writes every user, not only the ones changed since the last flush,
+        and waits until the writer thread has written them.
+        """
+        self._dirty.update(self.stats.keys())
+        self.flush()
+
+    def _mark_dirty(self, key: StatsKey):
+        """Record that a user's stats changed and persist them according to the write mode.
+        
+        Args:
+            key (StatsKey): The guild ID and Discord user ID whose stats changed
+            
+        Without write-behind the stats are saved immediately, like before.
+        In write-behind mode the user is only marked dirty, and once flush_threshold
+        changes have piled up they are handed to the writer thread without waiting.
+        """
+        self._dirty.add(key)
+        self._pending_changes += 1
+        if not self.write_behind:
+            self.flush()
+        elif self._pending_changes >= self.flush_threshold:
+            self._submit()
+
+    def _submit(self) -> Optional[concurrent.futures.Future]:
+        """Hand the pending changes to the writer thread and return the future of their write.
+        
+        The changed users are copied, so the write sees a consistent snapshot while
+        the stats keep changing. Returns None if there is nothing to write.
+        A shared backend is always written to, because the write also reads back
+        the changes of other processes.
+        Does nothing until load_stats() has completed: the load may still be filling
+        the stats and indexes on another thread, and a shared backend would read
+        back every row before the load has recorded what it saw.
+        """
+        if not self.loaded:
+            return None
+        self._apply_refreshed()
+        if not self._dirty and not self._events and not self.backend.shared:
+            return None
+        rows = {key: self.stats[key].copy() for key in self._dirty}
+        events, self._events = self._events, []
+        self._dirty.clear()
+        self._pending_changes = 0
+        return self.writer.submit(rows, events)
+
+    def _write(self, rows: Dict[StatsKey, UserStats], events: List[StatsEvent]):
+        """Write one batch to the backend. Runs on the writer thread.
+        
+        Args:
+            rows (Dict[StatsKey, UserStats]): Copies of the stats of the changed users
+            events (List[StatsEvent]): The changes recorded since the previous batch, in order
+        """
+        # Labelled with the durability policy, so the cost of syncing shows up in the flush times
+        with METRICS.time('trivia_bot_stats_io_seconds', operation='flush', durability=self.backend.durability.mode):
+            for key, event, value, timestamp in events:
+                self.backend.record(key, event, value, timestamp)
+            self.backend.save(rows, rows.keys())
+        if self.backend.shared:
+            with METRICS.time('trivia_bot_stats_io_seconds', operation='refresh'):
+                self._refreshed.append(self.backend.load_changes())
+
+    def flush(self):
+        """Write all pending changes to the storage backend in one batch, and wait until they are written.
+        
+        Writes nothing if no user has changed since the last flush.
+        With a shared backend, changes saved by other processes are then read back in.
+        Call this on shutdown to make sure no write-behind changes are lost.
+        Blocks the calling thread; on the event loop, use flush_async() instead.
+        
+        Raises:
+            Exception: Whatever the backend raised. The changed users are kept and retried by the next flush.
+        """
+        future = self._submit()
+        if future is not None:
+            future.result()
+        self._apply_refreshed()
+
+    async def flush_async(self):
+        """Write all pending changes like flush(), but without blocking the event loop while they are written.
+        
+        Flushes requested while a write is in flight are coalesced by the writer
+        thread, so only the newest stats of each user are written.
+        """
+        future = self._submit()
+        if future is not None:
+            await asyncio.wrap_future(future)
+        self._apply_refreshed()
+
+    def _apply_refreshed(self):
+        """Apply the rows the writer thread read back from a shared store.
+        
+        Users with changes that haven't been written yet are skipped: their rows
+        would be missing those changes, and they are read again after the next write.
+        Nothing is applied until load_stats() has completed.
+        """
+        while self.loaded and self._refreshed:
+            changes = self._refreshed.popleft()
+            for (guild_id, user_id), user_stats in changes.items():
+                key = (guild_id, user_id)
+                if key in self._dirty or self.writer.is_unwritten(key):
+                    continue
+                previous = self.stats.get(key) or UserStats()
+                self.stats[key] = user_stats
+                self._index(guild_id).update(user_id, user_stats.correct, user_stats.trivias_answered)
+                self._add_to_global(user_id, user_stats.trivias_answered - previous.trivias_answered,
+                                    user_stats.correct - previous.correct, user_stats.incorrect - previous.incorrect,
+                                    user_stats.hints_used - previous.hints_used)
+                # The rows carry no timestamps; the changes were made since the last read, so they count as now
+                total = max(user_stats.trivias_answered - previous.trivias_answered, 0)
+                hints = max(user_stats.hints_used - previous.hints_used, 0)
+                if total or hints:
+                    self._add_to_windows(guild_id, user_id, min(max(user_stats.correct - previous.correct, 0), total),
+                                         total, hints)
+
+    def close(self):
+        """Flush any pending changes, stop the writer thread and close the storage backend."""
+        try:
+            self.flush()
+        finally:
+            self.writer.close()
+            self.backend.close()
+
+    @property
+    def pending_changes(self) -> int:
+        """The number of changes made since the last flush."""
+        return self._pending_changes
+
+    def update_stats(self, user_id: int, correct: bool, guild_id: int = DEFAULT_GUILD_ID):
         """Update a user's statistics after they answer a trivia question.
         
         Args:
             user_id (int): The Discord user ID of the player
             correct (bool): Whether the answer was correct or not
+            guild_id (int): The guild the question was answered in, DEFAULT_GUILD_ID for direct messages
             
         This method:
         - Initializes stats for new users if needed
         - Increments the total questions counter
         - Updates correct/incorrect counters
-        - Saves the updated stats to file
+        - Moves the user to their new position in the guild's leaderboard index (and the global one, if enabled)
+        - Counts the answer in today's bucket of the windowed leaderboards
+        - Saves the updated stats to file (or marks them dirty in write-behind mode)
         """
-        # Initialize stats for new users
-        if user_id not in self.stats:
-            self.stats[user_id] = {
-                'trivias_answered': 0,
-                'correct': 0,
-                'incorrect': 0,
-                'hints_used': 0
-            }
+        stats = self._user_stats(guild_id, user_id)
         
         # Increment total questions and correct/incorrect counts
-        self.stats[user_id]['trivias_answered'] += 1
+        stats.trivias_answered += 1
         if correct:
-            self.stats[user_id]['correct'] += 1
+            stats.correct += 1
         else:
-            self.stats[user_id]['incorrect'] += 1
+            stats.incorrect += 1
+        self._events.append(((guild_id, user_id), EVENT_CORRECT if correct else EVENT_INCORRECT, 0, time.time()))
+        self._index(guild_id).update(user_id, stats.correct, stats.trivias_answered)
+        self._add_to_global(user_id, 1, int(correct), int(not correct))
+        self._add_to_windows(guild_id, user_id, int(correct), 1)
         
         # Save updated stats to file
-        self.save_stats()
+        self._mark_dirty((guild_id, user_id))
 
-    def increment_hints(self, user_id: int):
+    def increment_hints(self, user_id: int, guild_id: int = DEFAULT_GUILD_ID):
         """Increment the number of hints used by a user.
         
         Args:
             user_id (int): The Discord user ID of the player
+            guild_id (int): The guild the hint was used in, DEFAULT_GUILD_ID for direct messages
             
         This method:
         - Initializes stats for new users if needed
         - Increments the hints_used counter
-        - Saves the updated stats to file
+        - Saves the updated stats to file (or marks them dirty in write-behind mode)
         """
-        # Initialize stats for new users
-        if user_id not in self.stats:
-            self.stats[user_id] = {
-                'trivias_answered': 0,
-                'correct': 0,
-                'incorrect': 0,
-                'hints_used': 0
-            }
-        
         # Increment hints used
-        self.stats[user_id]['hints_used'] += 1
+        self._user_stats(guild_id, user_id).hints_used += 1
+        self._events.append(((guild_id, user_id), EVENT_HINT, 0, time.time()))
+        self._add_to_global(user_id, hints_used=1, update_index=False)
+        self._add_to_windows(guild_id, user_id, hints=1)
         
         # Save updated stats to file
-        self.save_stats()
+        self._mark_dirty((guild_id, user_id))
 
-    def get_stats(self, user_id: int) -> Tuple[int, int, int, float, int]:
+    def get_deck_state(self, user_id: int, guild_id: int = DEFAULT_GUILD_ID) -> int:
+        """Return a user's question deck state in a guild, or 0 if they have never been dealt a question there.
+        
+        The deck state is the packed seed and cursor used by question_bank.deal_question.
+        Every guild has its own deck, like it has its own stats.
+        """
+        stats = self.stats.get((guild_id, user_id))
+        return stats.deck_state if stats is not None else 0
+
+    def set_deck_state(self, user_id: int, deck_state: int, guild_id: int = DEFAULT_GUILD_ID):
+        """Store a user's question deck state after they were dealt a question.
+        
+        Args:
+            user_id (int): The Discord user ID of the player
+            deck_state (int): The new packed seed and cursor of the user's deck
+            guild_id (int): The guild the question was dealt in, DEFAULT_GUILD_ID for direct messages
+            
+        The state is persisted with the rest of the user's stats so the deck
+        survives restarts.
+        """
+        self._user_stats(guild_id, user_id).deck_state = deck_state
+        self._events.append(((guild_id, user_id), EVENT_DECK, deck_state, time.time()))
+        
+        # Save updated stats to file
+        self._mark_dirty((guild_id, user_id))
+
+    def get_stats(self, user_id: int, guild_id: Optional[int] = DEFAULT_GUILD_ID) -> Tuple[int, int, int, float, int]:
         """Retrieve a user's statistics including their success rate and hints used.
         
         Args:
             user_id (int): The Discord user ID of the player
+            guild_id (int, optional): The guild to read the stats of. Reads the user's totals
+                                    across all guilds if None (requires global_stats).
             
         Returns:
             Tuple[int, int, int, float, int]: A tuple containing:
@@ -143,24 +406,25 @@ class StatsManager:
         Returns zeros for users with no stats or if they haven't answered any questions.
         """
         # Return zeros for users with no stats
-        if user_id not in self.stats:
+        stats = self._scope(user_id, guild_id)
+        if stats is None:
             return 0, 0, 0, 0.0, 0
         
-        stats = self.stats[user_id]
-        total = stats['trivias_answered']
+        total = stats.trivias_answered
         if total == 0:
             return 0, 0, 0, 0.0, 0
         
         # Calculate success rate as percentage
-        ratio = (stats['correct'] / total) * 100
-        return stats['trivias_answered'], stats['correct'], stats['incorrect'], ratio, stats['hints_used']
+        ratio = (stats.correct / total) * 100
+        return stats.trivias_answered, stats.correct, stats.incorrect, ratio, stats.hints_used
 
-    def format_stats_message(self, user_id: int, username: str) -> str:
+    def format_stats_message(self, user_id: int, username: str, guild_id: Optional[int] = DEFAULT_GUILD_ID) -> str:
         """Format a user's statistics into a readable message.
         
         Args:
             user_id (int): The Discord user ID of the player
             username (str): The Discord username of the player
+            guild_id (int, optional): The guild to show the stats of, or None for totals across all guilds
             
         Returns:
             str: A formatted message containing all user statistics including:
@@ -172,20 +436,49 @@ class StatsManager:
                 
         Returns a message indicating no questions answered if the user has no stats.
         """
-        total, correct, incorrect, ratio, hints = self.get_stats(user_id)
+        total, correct, incorrect, ratio, hints = self.get_stats(user_id, guild_id)
         if total == 0:
             return f"{username} hasn't answered any trivia questions yet!"
         
+        # Show where the user stands on the leaderboard, or how far they are from joining it
+        rank = self.get_rank(user_id, guild_id)
+        if rank is None:
+            remaining = self._scope_index(guild_id).min_questions - total
+            standing = f"Unranked (answer {remaining} more to join the leaderboard)"
+        else:
+            position, ranked = rank
+            standing = f"{position} of {ranked} (top {position / ranked * 100:.1f}%)"
+        
         # Create a formatted message with all stats
         return f"{username}'s Statistics:\n" \
                f"Total Questions: {total}\n" \
                f"Correct: {correct}\n" \
                f"Incorrect: {incorrect}\n" \
                f"Success Rate: {ratio:.1f}%\n" \
-               f"Hints Used: {hints}"
+               f"Hints Used: {hints}\n" \
+               f"Rank: {standing}"
+
+    def _leaderboard_index(self, guild_id: Optional[int], period: str) -> LeaderboardIndex:
+        """Return the ranked index of a leaderboard: lifetime or windowed, of a guild or global if guild_id is None."""
+        if period == PERIOD_ALL:
+            return self._scope_index(guild_id)
+        if guild_id is None:
+            self._require_global_stats()
+        return self.windowed_leaderboards.index(guild_id, period)
 
-    def get_leaderboard(self) -> List[Tuple[int, float, int, int, int, int]]:
-        """Generate a sorted list of all users' statistics for the leaderboard.
+    def get_leaderboard(self, limit: Optional[int] = None, offset: int = 0,
+                        guild_id: Optional[int] = DEFAULT_GUILD_ID,
+                        period: str = PERIOD_ALL) -> List[Tuple[int, float, int, int, int, int]]:
+        """Generate a sorted list of users' statistics for the leaderboard.
+        
+        Args:
+            limit (int, optional): The maximum number of ranked users to return.
+                                 Returns every ranked user if None.
+            offset (int): The number of top-ranked users to skip, used for paging.
+            guild_id (int, optional): The guild whose leaderboard to read. Reads the global
+                                    leaderboard of totals across guilds if None (requires global_stats).
+            period (str): PERIOD_ALL for lifetime stats, or a windowed period such as "weekly",
+                        which ranks only the answers of that period.
         
         Returns:
             List[Tuple[int, float, int, int, int, int]]: A list of tuples containing:
@@ -198,34 +491,108 @@ class StatsManager:
                 
         Only includes users who have answered at least 10 questions.
         The list is sorted by success rate (descending) and then by total questions (descending).
+        Rows are read in order from the guild's leaderboard index, so only the returned users are touched.
+        
+        Raises:
+            ValueError: If period is not PERIOD_ALL or one of the windowed periods
         """
+        if period != PERIOD_ALL:
+            return self._get_windowed_leaderboard(limit, offset, guild_id, period)
         leaderboard = []
-        for user_id, stats in self.stats.items():
-            total = stats['trivias_answered']
-            if total >= 10:  # Only include users who have answered at least 10 questions
-                success_rate = (stats['correct'] / total) * 100
-                # Add tuple of (user_id, success_rate, total, correct, incorrect, hints_used)
-                leaderboard.append((
-                    user_id,
-                    success_rate,
-                    total,
-                    stats['correct'],
-                    stats['incorrect'],
-                    stats['hints_used']
-                ))
-        
-        # Sort by success rate (descending) and then by total questions (descending)
-        return sorted(leaderboard, key=lambda x: (-x[1], -x[2]))
-
-    def format_leaderboard(self, user_names: Dict[int, str]) -> str:
+        for user_id in self._scope_index(guild_id).top(limit, offset):
+            stats = self._scope(user_id, guild_id)
+            total = stats.trivias_answered
+            success_rate = (stats.correct / total) * 100
+            # Add tuple of (user_id, success_rate, total, correct, incorrect, hints_used)
+            leaderboard.append((
+                user_id,
+                success_rate,
+                total,
+                stats.correct,
+                stats.incorrect,
+                stats.hints_used
+            ))
+        return leaderboard
+
+    def _get_windowed_leaderboard(self, limit: Optional[int], offset: int, guild_id: Optional[int],
+                                  period: str) -> List[Tuple[int, float, int, int, int, int]]:
+        """Build leaderboard rows like get_leaderboard from the counters of a windowed period."""
+        leaderboard = []
+        for user_id in self._leaderboard_index(guild_id, period).top(limit, offset):
+            correct, total, hints = self.windowed_leaderboards.totals(guild_id, user_id, period)
+            leaderboard.append((user_id, (correct / total) * 100, total, correct, total - correct, hints))
+        return leaderboard
+
+    def leaderboard_size(self, guild_id: Optional[int] = DEFAULT_GUILD_ID, period: str = PERIOD_ALL) -> int:
+        """Return the number of users who qualify for a guild's leaderboard of a period, or the global one if guild_id is None."""
+        return len(self._leaderboard_index(guild_id, period))
+
+    def get_rank(self, user_id: int, guild_id: Optional[int] = DEFAULT_GUILD_ID,
+                 period: str = PERIOD_ALL) -> Optional[Tuple[int, int]]:
+        """Return where a user stands on a leaderboard, without building the leaderboard.
+        
+        Args:
+            user_id (int): The Discord user ID of the player
+            guild_id (int, optional): The guild whose leaderboard to check, or None for the global one
+            period (str): PERIOD_ALL for the lifetime leaderboard, or a windowed period such as "weekly"
+            
+        Returns:
+            Optional[Tuple[int, int]]: The user's 1-based rank and the number of ranked users,
+                                       or None if the user doesn't qualify for the leaderboard.
+                                       
+        The leaderboard index is kept sorted by update_stats, so this is a
+        binary search (O(log n)) rather than a sort of every user.
+        """
+        index = self._leaderboard_index(guild_id, period)
+        position = index.rank(user_id)
+        if position is None:
+            return None
+        return position, len(index)
+
+    @staticmethod
+    def _format_leaderboard_rows(leaderboard: List[Tuple[int, float, int, int, int, int]],
+                                 user_names: Dict[int, str], first_rank: int) -> List[str]:
+        """Format leaderboard rows into a list of lines, numbering ranks from first_rank."""
+        lines = []
+        for i, (user_id, success_rate, total, correct, incorrect, hints) in enumerate(leaderboard, first_rank):
+            username = user_names.get(user_id, f"User {user_id}")
+            lines.append(f"{i}. {username}")
+            lines.append(f"Success Rate: {success_rate:.1f}% | "
+                         f"Total: {total} | "
+                         f"Correct: {correct} | "
+                         f"Incorrect: {incorrect} | "
+                         f"Hints: {hints}")
+        return lines
+
+    @staticmethod
+    def _leaderboard_header(period: str) -> str:
+        """Return the title line of a leaderboard, naming the period unless it is the lifetime one."""
+        if period == PERIOD_ALL:
+            return "Trivia Leaderboard (Minimum 10 questions required)"
+        return f"Trivia Leaderboard: {PERIOD_TITLES.get(period, period)} (Minimum 10 questions required)"
+
+    @staticmethod
+    def _empty_leaderboard_message(period: str) -> str:
+        """Return the message shown when no one qualifies for a leaderboard of a period."""
+        if period == PERIOD_ALL:
+            return "No trivia statistics available yet! Answer at least 10 questions to appear on the leaderboard."
+        return (f"No trivia statistics available for {PERIOD_TITLES.get(period, period)} yet! "
+                f"Answer at least 10 questions in this period to appear on the leaderboard.")
+
+    def format_leaderboard(self, user_names: Dict[int, str], limit: Optional[int] = None,
+                           guild_id: Optional[int] = DEFAULT_GUILD_ID, period: str = PERIOD_ALL) -> str:
         """Format the leaderboard into a readable message with usernames.
         
         Args:
             user_names (Dict[int, str]): A dictionary mapping user IDs to their Discord usernames
+            limit (int, optional): The maximum number of top-ranked users to include.
+                                 Includes every ranked user if None.
+            guild_id (int, optional): The guild whose leaderboard to format, or None for the global one
+            period (str): PERIOD_ALL for lifetime stats, or a windowed period such as "weekly"
             
         Returns:
             str: A formatted message containing:
-                - A header indicating the minimum question requirement
+                - A header naming the period (unless it is all time) and the minimum question requirement
                 - A ranked list of users with their statistics
                 - Each user's entry includes:
                     - Rank
@@ -237,19 +604,44 @@ class StatsManager:
                     
         Returns a message indicating no qualifying users if no one has met the minimum question requirement.
         """
-        leaderboard = self.get_leaderboard()
+        leaderboard = self.get_leaderboard(limit, guild_id=guild_id, period=period)
         if not leaderboard:
-            return "No trivia statistics available yet! Answer at least 10 questions to appear on the leaderboard."
+            return self._empty_leaderboard_message(period)
         
         # Create the leaderboard message with rankings
-        message = "Trivia Leaderboard (Minimum 10 questions required)\n"
-        for i, (user_id, success_rate, total, correct, incorrect, hints) in enumerate(leaderboard, 1):
-            username = user_names.get(user_id, f"User {user_id}")
-            message += f"{i}. {username}\n"
-            message += f"Success Rate: {success_rate:.1f}% | "
-            message += f"Total: {total} | "
-            message += f"Correct: {correct} | "
-            message += f"Incorrect: {incorrect} | "
-            message += f"Hints: {hints}\n"
-        
-        return message 
+        lines = [self._leaderboard_header(period)]
+        lines.extend(self._format_leaderboard_rows(leaderboard, user_names, 1))
+        return "\n".join(lines) + "\n"
+
+    def format_leaderboard_page(self, user_names: Dict[int, str], offset: int, limit: int,
+                                guild_id: Optional[int] = DEFAULT_GUILD_ID, period: str = PERIOD_ALL,
+                                leaderboard: Optional[List[Tuple[int, float, int, int, int, int]]] = None) -> str:
+        """Format one page of the leaderboard into a readable message with usernames.
+        
+        Args:
+            user_names (Dict[int, str]): A dictionary mapping user IDs to their Discord usernames.
+                                       Only the users on this page are needed.
+            offset (int): The number of top-ranked users before this page
+            limit (int): The number of users per page
+            guild_id (int, optional): The guild whose leaderboard to format, or None for the global one
+            period (str): PERIOD_ALL for lifetime stats, or a windowed period such as "weekly"
+            leaderboard (List[Tuple[int, float, int, int, int, int]], optional): The rows of this page,
+                                       if the caller already read them with get_leaderboard.
+            
+        Returns:
+            str: A formatted message with a header showing the page number,
+                 followed by the same per-user entries as format_leaderboard.
+                 
+        Only the users on the requested page are read from the leaderboard index,
+        so the cost doesn't depend on how many users qualify in total.
+        Returns a message indicating no qualifying users if no one has met the minimum question requirement.
+        """
+        if leaderboard is None:
+            leaderboard = self.get_leaderboard(limit, offset, guild_id, period)
+        if not leaderboard:
+            return self._empty_leaderboard_message(period)
+        
+        page_count = (self.leaderboard_size(guild_id, period) + limit - 1) // limit
+        lines = [f"{self._leaderboard_header(period)} - Page {offset // limit + 1}/{page_count}"]
+        lines.extend(self._format_leaderboard_rows(leaderboard, user_names, offset + 1))
+        return "\n".join(lines)
@@ -0,0 +1,1296 @@
+# Import required libraries for CSV and SQLite storage, file handling, logging, timing, and type hints
+import argparse
+import csv
+import glob
+import gzip
+import itertools
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Names of the per-user values stored by every backend, in column order.
+# deck_state is the packed seed and cursor of the user's question deck (see question_bank.deal_question).
+STAT_FIELDS = ('trivias_answered', 'correct', 'incorrect', 'hints_used', 'deck_state')
+
+
+
+class UserStats:
+    """One player's stats in one guild.
+
+    A __slots__ record instead of a dictionary per player: it takes about a
+    third of the memory and is built with a single allocation, which adds up
+    with a million players. Fields are read and written as attributes in hot
+    paths (user_stats.correct += 1), and can also be accessed by name like the
+    dictionaries used before (user_stats['correct']).
+    """
+    __slots__ = STAT_FIELDS
+
+    def __init__(self, trivias_answered: int = 0, correct: int = 0, incorrect: int = 0,
+                 hints_used: int = 0, deck_state: int = 0):
+        self.trivias_answered = trivias_answered
+        self.correct = correct
+        self.incorrect = incorrect
+        self.hints_used = hints_used
+        self.deck_state = deck_state
+
+    def __getitem__(self, field: str) -> int:
+        """Return a field by name."""
+        return getattr(self, field)
+
+    def __setitem__(self, field: str, value: int):
+        """Set a field by name."""
+        setattr(self, field, value)
+
+    def values(self) -> Tuple[int, int, int, int, int]:
+        """Return the fields in STAT_FIELDS order."""
+        return self.trivias_answered, self.correct, self.incorrect, self.hints_used, self.deck_state
+
+    def copy(self) -> 'UserStats':
+        """Return an independent copy of the record."""
+        return UserStats(*self.values())
+
+    def __eq__(self, other: object) -> bool:
+        """Records are equal if all their fields are equal."""
+        return isinstance(other, UserStats) and self.values() == other.values()
+
+    def __repr__(self) -> str:
+        """Show the fields like a dictionary, for logs and debugging."""
+        return f"UserStats({', '.join(f'{field}={value}' for field, value in zip(STAT_FIELDS, self.values()))})"
+
+
+# Event codes written to the journal for every stats change
+EVENT_CORRECT = 'c'  # The user answered a question correctly
+EVENT_INCORRECT = 'i'  # The user answered a question incorrectly
+EVENT_HINT = 'h'  # The user asked for a hint
+EVENT_DECK = 'd'  # The user was dealt a question; carries the new deck state
+
+SECONDS_PER_DAY = 86400
+# Days of per-day counters kept by the CSV and SQLite backends: the longest leaderboard window, plus the day
+# that has just ended, so a restart right after midnight still sees the whole window
+DAILY_COUNT_DAYS = 31
+# Columns of the CSV file of per-day counters
+DAILY_COUNT_FIELDS = ['day', 'guild_id', 'user_id', 'correct', 'total', 'hints']
+# Per-day counters of one user: (UTC day number, guild ID, user ID) -> [correct, total, hints]
+DailyKey = Tuple[int, int, int]
+# One stored per-day counter, or one event, for rebuilding windowed leaderboards:
+# (UNIX time, guild ID, user ID, correct, total, hints)
+DailyCount = Tuple[int, int, int, int, int, int]
+
+# Stats are kept per player per guild, keyed by (guild_id, user_id)
+StatsKey = Tuple[int, int]
+
+# Guild ID of stats recorded in direct messages
+DEFAULT_GUILD_ID = 0
+
+
+
+def legacy_guild(legacy_guild_id: Optional[int], source: str) -> int:
+    """Return the guild chosen for stats stored before they were kept per guild.
+
+    Stats from before the upgrade hold every user's totals across all guilds, so
+    there is no right guild to guess: the operator picks one with LEGACY_GUILD_ID
+    (DEFAULT_GUILD_ID to show them in direct messages).
+
+    Args:
+        legacy_guild_id (int, optional): The chosen guild, or None if none was chosen
+        source (str): The file or database holding the old stats, for the error message
+
+    Raises:
+        ValueError: If no guild was chosen
+    """
+    if legacy_guild_id is None:
+        raise ValueError(f"{source} holds stats saved before they were kept per guild. Set LEGACY_GUILD_ID to the "
+                         f"guild they belong to (or {DEFAULT_GUILD_ID} for direct messages) to migrate them")
+    return legacy_guild_id
+
+
+# Columns of the CSV stats file (and of journal snapshots)
+CSV_FIELDS = ['guild_id', 'user_id', *STAT_FIELDS]
+
+# Durability policies: when a backend forces its writes to disk with fsync
+DURABILITY_ALWAYS = 'always'  # Every save is synced before it counts as written
+DURABILITY_INTERVAL = 'interval'  # A save is synced if the last sync was at least interval seconds ago
+DURABILITY_OS = 'os'  # Writes stay in the OS buffers; a power loss can lose the last saves
+DURABILITY_POLICIES = (DURABILITY_ALWAYS, DURABILITY_INTERVAL, DURABILITY_OS)
+
+METRICS.describe('trivia_bot_stats_fsync_seconds', 'Time spent forcing stats writes to disk, by durability policy')
+
+
+class DurabilityPolicy:
+    """Decides when a backend forces its writes to disk, and times what that costs.
+
+    Whatever the policy, files are replaced atomically (written to a temporary
+    file that is then renamed over the old one), so a crash leaves either the
+    old or the new version. The policy only decides how recent that version is
+    guaranteed to be after a power loss or kernel crash.
+
+    Every sync is timed into trivia_bot_stats_fsync_seconds, labelled with the
+    policy, so the cost of each policy can be compared.
+    """
+
+    def __init__(self, mode: str = DURABILITY_ALWAYS, interval: float = 5.0):
+        """Initialize the policy.
+
+        Args:
+            mode (str): One of DURABILITY_ALWAYS, DURABILITY_INTERVAL or DURABILITY_OS
+            interval (float): Minimum seconds between syncs for DURABILITY_INTERVAL
+
+        Raises:
+            ValueError: If mode is not a known policy
+        """
+        if mode not in DURABILITY_POLICIES:
+            raise ValueError(f"Unknown durability policy: {mode!r} (expected one of {', '.join(DURABILITY_POLICIES)})")
+        self.mode = mode
+        self.interval = interval
+        self._last_sync = time.monotonic()
+
+    def should_sync(self) -> bool:
+        """Return True if the current save must be synced, and if so count it as synced now."""
+        if self.mode == DURABILITY_ALWAYS:
+            return True
+        if self.mode == DURABILITY_INTERVAL and time.monotonic() - self._last_sync >= self.interval:
+            self._last_sync = time.monotonic()
+            return True
+        return False
+
+    def sync_file(self, file: IO):
+        """Flush a file's buffers and force its contents to disk."""
+        file.flush()
+        with METRICS.time('trivia_bot_stats_fsync_seconds', policy=self.mode, target='file'):
+            os.fsync(file.fileno())
+
+    def sync_directory(self, path: str):
+        """Force a directory's entries to disk, so a rename or a new file in it survives a crash.
+
+        Does nothing on platforms that can't open directories, such as Windows.
+        """
+        try:
+            descriptor = os.open(path or '.', os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            with METRICS.time('trivia_bot_stats_fsync_seconds', policy=self.mode, target='directory'):
+                os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+
+class StatsBackend:
+    """Base class for the storage backends used by StatsManager.
+
+    A backend only moves user statistics between memory and persistent storage.
+    All counting, leaderboard and formatting logic stays in StatsManager.
+    Stats are keyed by (guild_id, user_id), so a player has separate stats in every guild.
+    Subclasses must implement load_all() and save().
+
+    StatsManager calls record() and save() from its writer thread (see
+    stats_writer.py), and never from two threads at once.
+
+    Attributes:
+        shared (bool): Whether several bot processes can write to the same store
+                       at once without losing each other's updates.
+        durability (DurabilityPolicy): When saves are forced to disk.
+    """
+    shared = False
+    durability = DurabilityPolicy(DURABILITY_OS)
+
+    def load_all(self) -> Dict[StatsKey, UserStats]:
+        """Load every stored user.
+
+        Returns:
+            Dict[StatsKey, UserStats]: A mapping of (guild ID, user ID) to the player's stats.
+        """
+        raise NotImplementedError
+
+    def save(self, stats: Dict[StatsKey, UserStats], keys: Iterable[StatsKey]):
+        """Persist the given users.
+
+        Args:
+            stats (Dict[StatsKey, UserStats]): The stats of at least the users in keys.
+                                                  StatsManager passes copies of just the changed users.
+            keys (Iterable[StatsKey]): The (guild ID, user ID) pairs that changed since the last save
+
+        Users that are stored but not in keys must be kept as they are.
+        """
+        raise NotImplementedError
+
+    def import_stats(self, stats: Dict[StatsKey, UserStats]):
+        """Store users copied from another store, replacing the stored stats of the same users.
+
+        The default writes them with save(). Backends whose save() only writes the
+        changes passed to record() override this.
+
+        Args:
+            stats (Dict[StatsKey, UserStats]): The users to store
+        """
+        self.save(stats, stats.keys())
+
+    def load_changes(self) -> Dict[StatsKey, UserStats]:
+        """Load the users that other processes changed since the last load.
+
+        Only shared backends return anything; the default returns an empty dictionary.
+
+        Returns:
+            Dict[StatsKey, UserStats]: The changed users, including this process's own unsaved changes.
+        """
+        return {}
+
+    def load_history(self, since: int = 0) -> Iterator[Tuple[int, int, int, str, int]]:
+        """Yield the recorded stats changes made since a point in time, oldest first.
+
+        Only backends that keep individual events return anything; the default yields nothing.
+
+        Args:
+            since (int): UNIX time of the oldest change to yield
+
+        Returns:
+            Iterator[Tuple[int, int, int, str, int]]: (timestamp, guild_id, user_id, event, value) tuples.
+        """
+        return iter(())
+
+    def load_daily_counts(self, since: int) -> Iterator[DailyCount]:
+        """Yield the answers and hints of each user per day since a point in time, to rebuild windowed leaderboards.
+
+        The default turns every event of load_history() into a count of one, so
+        backends that keep their history need nothing else. Backends that only
+        store totals keep per-day counters instead (see add_daily_count).
+
+        Args:
+            since (int): UNIX time of the oldest day to yield
+
+        Returns:
+            Iterator[DailyCount]: (UNIX time, guild_id, user_id, correct, total, hints) tuples, in any order.
+        """
+        for timestamp, guild_id, user_id, event, _ in self.load_history(since):
+            if event != EVENT_DECK:
+                yield (timestamp, guild_id, user_id,
+                       int(event == EVENT_CORRECT), int(event != EVENT_HINT), int(event == EVENT_HINT))
+
+    def record(self, key: StatsKey, event: str, value: int = 0, timestamp: Optional[float] = None):
+        """Called for every single stats change, before it is saved.
+
+        Args:
+            key (StatsKey): The guild ID and Discord user ID of the player
+            event (str): One of EVENT_CORRECT, EVENT_INCORRECT, EVENT_HINT or EVENT_DECK
+            value (int): The new deck state for EVENT_DECK, unused otherwise
+            timestamp (float, optional): UNIX time the change was made. Defaults to now.
+                                       Changes are recorded in batches, so this is usually earlier.
+
+        Most backends only persist the counters and ignore individual events.
+        """
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class CSVStatsBackend(StatsBackend):
+    """Stores all users in a single CSV file.
+
+    This is the original storage format of the bot. The file cannot be updated
+    in place, so every save rewrites the whole file: the unchanged rows are copied
+    from the current file into a new one, which then replaces it.
+
+    The per-day counters of the windowed leaderboards go to a second file next
+    to it (trivia_stats_days.csv for trivia_stats.csv). Each save appends the
+    counts recorded since the previous one, and the first save of every day
+    rewrites the file with the rows of each day merged and the days older than
+    DAILY_COUNT_DAYS left out.
+
+    A file written before stats were kept per guild is rewritten on open with
+    every user moved to legacy_guild_id, and can't be opened without one.
+    """
+
+    def __init__(self, filename: str = "trivia_stats.csv", durability: Optional[DurabilityPolicy] = None,
+                 legacy_guild_id: Optional[int] = None):
+        """Initialize the backend, migrating a file written before stats were kept per guild.
+
+        Args:
+            filename (str): The CSV file to store stats in. It is created on the first save.
+            durability (DurabilityPolicy, optional): When saves are synced. Defaults to every save.
+            legacy_guild_id (int, optional): The guild that users stored before stats were kept
+                                           per guild are moved to (DEFAULT_GUILD_ID for direct messages).
+
+        Raises:
+            ValueError: If the file was written before stats were kept per guild and legacy_guild_id is None
+        """
+        self.filename = filename
+        self.durability = durability or DurabilityPolicy()
+        self.legacy_guild_id = legacy_guild_id
+        self.days_filename = os.path.splitext(filename)[0] + '_days.csv'
+        self._daily: Dict[DailyKey, List[int]] = {}  # Per-day counts recorded since the last save
+        self._compacted_day: Optional[int] = None  # The day the days file was last compacted on
+        if self._has_legacy_rows():
+            legacy_guild(legacy_guild_id, filename)
+            # Rewriting the file converts every row, so the guild only has to be chosen once
+            self.save({}, ())
+            logger.info("Migrated stats to per-guild keys file=%s guild_id=%s", filename, legacy_guild_id)
+
+    def _has_legacy_rows(self) -> bool:
+        """Return True if the file exists and was written before stats were kept per guild."""
+        if not os.path.exists(self.filename):
+            return False
+        with open(self.filename, 'r', newline='') as file:
+            header = file.readline().rstrip('\r\n')
+        return bool(header) and 'guild_id' not in header.split(',')
+
+    def load_all(self) -> Dict[StatsKey, UserStats]:
+        """Read every user from the CSV file.
+
+        Returns an empty dictionary if the file doesn't exist yet.
+        Defaults hints_used to 0 for files written before hints were tracked.
+        """
+        stats = {}
+        if not os.path.exists(self.filename):
+            return stats
+        with open(self.filename, 'r', newline='') as file:
+            header = file.readline()
+            if header.rstrip('\r\n').split(',') == CSV_FIELDS:
+                # Files in the current format are split by hand, which is much faster than csv.DictReader
+                guild_ids: Dict[int, int] = {}
+                for line in file:
+                    values = line.split(',')
+                    if len(values) != len(CSV_FIELDS):
+                        continue
+                    # Share one int object per guild instead of one per row
+                    guild_id = int(values[0])
+                    guild_id = guild_ids.setdefault(guild_id, guild_id)
+                    stats[(guild_id, int(values[1]))] = UserStats(*map(int, values[2:]))
+            else:
+                for row in csv.DictReader(itertools.chain([header], file)):
+                    key, user_stats = self._parse_row(row)
+                    stats[key] = user_stats
+        return stats
+
+    def _parse_row(self, row: Dict[str, str]) -> Tuple[StatsKey, UserStats]:
+        """Convert a row read by csv.DictReader into a key and a stats record."""
+        # Convert the IDs to integers and store their stats; rows without a guild get the chosen legacy guild
+        guild_id = row.get('guild_id')
+        key = (int(guild_id) if guild_id else legacy_guild(self.legacy_guild_id, self.filename), int(row['user_id']))
+        return key, UserStats(
+            trivias_answered=int(row['trivias_answered']),
+            correct=int(row['correct']),
+            incorrect=int(row['incorrect']),
+            hints_used=int(row.get('hints_used') or 0),  # Default to 0 if not present
+            deck_state=int(row.get('deck_state') or 0)  # Default to 0 (no deck yet) if not present
+        )
+
+    @staticmethod
+    def _format_row(key: StatsKey, user_stats: UserStats) -> str:
+        """Format one user as a CSV line. Every value is an integer, so nothing needs quoting."""
+        return ','.join(map(str, (*key, *(user_stats[field] for field in STAT_FIELDS)))) + '\r\n'
+
+    def _stored_rows(self) -> Iterator[Tuple[StatsKey, str]]:
+        """Yield (key, CSV line) for every user in the current file, in the current column format."""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r', newline='') as file:
+            header = file.readline()
+            if header.rstrip('\r\n').split(',') == CSV_FIELDS:
+                # Lines in the current format are copied as they are; only the key is parsed
+                for line in file:
+                    if line.strip():
+                        guild_id, user_id, _ = line.split(',', 2)
+                        yield (int(guild_id), int(user_id)), line
+            else:
+                # Files written before some columns existed are converted row by row
+                for row in csv.DictReader(itertools.chain([header], file)):
+                    key, user_stats = self._parse_row(row)
+                    yield key, self._format_row(key, user_stats)
+
+    def save(self, stats: Dict[StatsKey, UserStats], keys: Iterable[StatsKey]):
+        """Rewrite the CSV file with the changed users merged in.
+
+        The new file is written next to the old one and then replaces it, so a
+        crash during a save leaves the previous file intact. If the durability
+        policy asks for it, the new file is synced before the rename and the
+        directory after it, so the rename can't reach the disk before the data.
+        """
+        changed = {key: stats[key] for key in keys}
+        temporary = self.filename + '.tmp'
+        with open(temporary, 'w', newline='') as file:
+            file.write(','.join(CSV_FIELDS) + '\r\n')
+            # Copy the stored users, replacing the ones that changed
+            for key, line in self._stored_rows():
+                user_stats = changed.pop(key, None)
+                file.write(line if user_stats is None else self._format_row(key, user_stats))
+            # Then add the users that weren't stored yet
+            for key, user_stats in changed.items():
+                file.write(self._format_row(key, user_stats))
+            sync = self.durability.should_sync()
+            if sync:
+                self.durability.sync_file(file)
+        os.replace(temporary, self.filename)
+        if sync:
+            self.durability.sync_directory(os.path.dirname(self.filename))
+        if self._daily:
+            self._save_daily_counts(sync)
+
+    def record(self, key: StatsKey, event: str, value: int = 0, timestamp: Optional[float] = None):
+        """Count an answer or hint towards its day, for the per-day counters written by the next save."""
+        add_daily_count(self._daily, key, event, timestamp)
+
+    def _save_daily_counts(self, sync: bool):
+        """Append the per-day counts recorded since the last save, compacting the file first once a day.
+
+        Args:
+            sync (bool): Whether the durability policy asked for this save to be synced
+        """
+        today = int(time.time() // SECONDS_PER_DAY)
+        exists = os.path.exists(self.days_filename)
+        if exists and self._compacted_day != today:
+            # Merge the stored rows with the new counts, dropping the days that are too old to matter
+            counts = {}
+            for timestamp, guild_id, user_id, correct, total, hints in self.load_daily_counts(
+                    (today - DAILY_COUNT_DAYS + 1) * SECONDS_PER_DAY):
+                add_counts(counts, (timestamp // SECONDS_PER_DAY, guild_id, user_id), correct, total, hints)
+            for key, (correct, total, hints) in self._daily.items():
+                add_counts(counts, key, correct, total, hints)
+            temporary = self.days_filename + '.tmp'
+            with open(temporary, 'w', newline='') as file:
+                file.write(','.join(DAILY_COUNT_FIELDS) + '\r\n')
+                for key in sorted(counts):
+                    file.write(','.join(map(str, (*key, *counts[key]))) + '\r\n')
+                if sync:
+                    self.durability.sync_file(file)
+            os.replace(temporary, self.days_filename)
+        else:
+            with open(self.days_filename, 'a', newline='') as file:
+                if not exists:
+                    file.write(','.join(DAILY_COUNT_FIELDS) + '\r\n')
+                for key, counts in self._daily.items():
+                    file.write(','.join(map(str, (*key, *counts))) + '\r\n')
+                if sync:
+                    self.durability.sync_file(file)
+        if sync and (not exists or self._compacted_day != today):
+            self.durability.sync_directory(os.path.dirname(self.days_filename))
+        self._compacted_day = today
+        self._daily.clear()
+
+    def load_daily_counts(self, since: int) -> Iterator[DailyCount]:
+        """Yield the stored per-day counters of the days starting at or after since."""
+        if not os.path.exists(self.days_filename):
+            return
+        first_day = since // SECONDS_PER_DAY
+        with open(self.days_filename, 'r', newline='') as file:
+            file.readline()
+            for line in file:
+                values = line.split(',')
+                if len(values) != len(DAILY_COUNT_FIELDS):
+                    continue
+                try:
+                    day, guild_id, user_id, correct, total, hints = map(int, values)
+                except ValueError:
+                    continue
+                if day >= first_day:
+                    yield day * SECONDS_PER_DAY, guild_id, user_id, correct, total, hints
+
+
+class SQLiteStatsBackend(StatsBackend):
+    """Stores users as rows of an SQLite table.
+
+    The database runs in WAL mode and a save only upserts the users that
+    changed, so an answer touches one row instead of the whole table.
+    SQLite commits are atomic on their own; the durability policy picks when
+    they are synced: on every commit (synchronous=FULL), at a WAL checkpoint
+    every interval seconds, or only when SQLite checkpoints by itself.
+    Databases created before stats were kept per guild are migrated on open,
+    with every existing user moved to legacy_guild_id, and can't be opened
+    without one.
+    The per-day counters of the windowed leaderboards are added to a
+    user_days table in the same transaction, and days older than
+    DAILY_COUNT_DAYS are deleted by the first save of every day.
+    """
+
+    # The stats table, keyed by guild and user
+    CREATE_TABLE_SQL = (
+        "CREATE TABLE IF NOT EXISTS {table} ("
+        "guild_id INTEGER NOT NULL DEFAULT 0, "
+        "user_id INTEGER NOT NULL, "
+        "trivias_answered INTEGER NOT NULL DEFAULT 0, "
+        "correct INTEGER NOT NULL DEFAULT 0, "
+        "incorrect INTEGER NOT NULL DEFAULT 0, "
+        "hints_used INTEGER NOT NULL DEFAULT 0, "
+        "deck_state INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (guild_id, user_id))"
+    )
+
+    # Per-day counters of every user, keyed by UTC day number, guild and user
+    CREATE_DAYS_TABLE_SQL = (
+        "CREATE TABLE IF NOT EXISTS user_days ("
+        "day INTEGER NOT NULL, "
+        "guild_id INTEGER NOT NULL, "
+        "user_id INTEGER NOT NULL, "
+        "correct INTEGER NOT NULL DEFAULT 0, "
+        "total INTEGER NOT NULL DEFAULT 0, "
+        "hints INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (day, guild_id, user_id))"
+    )
+
+    # Adds the counts recorded since the last save to a user's day; also safe with several processes
+    UPSERT_DAY_SQL = (
+        "INSERT INTO user_days (day, guild_id, user_id, correct, total, hints) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(day, guild_id, user_id) DO UPDATE SET "
+        "correct = correct + excluded.correct, "
+        "total = total + excluded.total, "
+        "hints = hints + excluded.hints"
+    )
+
+    # Prepared upsert statement, reused for every save
+    UPSERT_SQL = (
+        "INSERT INTO user_stats (guild_id, user_id, trivias_answered, correct, incorrect, hints_used, deck_state) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(guild_id, user_id) DO UPDATE SET "
+        "trivias_answered = excluded.trivias_answered, "
+        "correct = excluded.correct, "
+        "incorrect = excluded.incorrect, "
+        "hints_used = excluded.hints_used, "
+        "deck_state = excluded.deck_state"
+    )
+
+    def __init__(self, filename: str = "trivia_stats.db", durability: Optional[DurabilityPolicy] = None,
+                 legacy_guild_id: Optional[int] = None):
+        """Open (and create if needed) the SQLite database.
+
+        Args:
+            filename (str): The database file to store stats in. Defaults to "trivia_stats.db".
+            durability (DurabilityPolicy, optional): When saves are synced. Defaults to every save.
+            legacy_guild_id (int, optional): The guild that users stored before stats were kept
+                                           per guild are moved to (DEFAULT_GUILD_ID for direct messages).
+
+        Raises:
+            ValueError: If the database was created before stats were kept per guild and legacy_guild_id is None
+        """
+        self.filename = filename
+        self.durability = durability or DurabilityPolicy()
+        self.legacy_guild_id = legacy_guild_id
+        # The connection may be used from a different thread than the one that opened it
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode, NORMAL only syncs at checkpoints, and the database stays consistent either way
+        synchronous = 'FULL' if self.durability.mode == DURABILITY_ALWAYS else 'NORMAL'
+        self.connection.execute(f"PRAGMA synchronous={synchronous}")
+        with self.connection:
+            self.connection.execute(self.CREATE_TABLE_SQL.format(table='user_stats'))
+            # Add columns that were introduced after the table was first created
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(user_stats)")}
+            if 'deck_state' not in columns:
+                self.connection.execute("ALTER TABLE user_stats ADD COLUMN deck_state INTEGER NOT NULL DEFAULT 0")
+            if 'guild_id' not in columns:
+                self._migrate_to_guild_keys(legacy_guild(legacy_guild_id, filename))
+            # Indexes for per-guild leaderboard style queries ordered by activity and score
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_user_stats_guild_answered ON user_stats (guild_id, trivias_answered)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_user_stats_guild_correct ON user_stats (guild_id, correct)"
+            )
+            self.connection.execute(self.CREATE_DAYS_TABLE_SQL)
+        self._daily: Dict[DailyKey, List[int]] = {}  # Per-day counts recorded since the last save
+        self._pruned_day: Optional[int] = None  # The day old per-day counters were last deleted on
+
+    def _migrate_to_guild_keys(self, guild_id: int):
+        """Rebuild a table keyed by user only into one keyed by (guild, user), moving every user to guild_id.
+
+        SQLite can't change a primary key in place, so the rows are copied into a new table.
+        Runs inside the caller's transaction.
+        """
+        self.connection.execute("ALTER TABLE user_stats RENAME TO user_stats_before_guilds")
+        self.connection.execute(self.CREATE_TABLE_SQL.format(table='user_stats'))
+        self.connection.execute(
+            "INSERT INTO user_stats (guild_id, user_id, trivias_answered, correct, incorrect, hints_used, deck_state) "
+            "SELECT ?, user_id, trivias_answered, correct, incorrect, hints_used, deck_state "
+            "FROM user_stats_before_guilds", (guild_id,)
+        )
+        self.connection.execute("DROP TABLE user_stats_before_guilds")
+        logger.info("Migrated stats to per-guild keys file=%s guild_id=%s", self.filename, guild_id)
+
+    def load_all(self) -> Dict[StatsKey, UserStats]:
+        """Read every user row from the database."""
+        cursor = self.connection.execute(
+            "SELECT guild_id, user_id, trivias_answered, correct, incorrect, hints_used, deck_state FROM user_stats"
+        )
+        return {(row[0], row[1]): UserStats(*row[2:]) for row in cursor}
+
+    def save(self, stats: Dict[StatsKey, UserStats], keys: Iterable[StatsKey]):
+        """Upsert the changed users in a single transaction."""
+        rows = [
+            (*key, *(stats[key][field] for field in STAT_FIELDS))
+            for key in keys
+        ]
+        if not rows:
+            return
+        with self.connection:
+            self.connection.executemany(self.UPSERT_SQL, rows)
+            self._save_daily_counts()
+        self._daily.clear()
+        self._sync()
+
+    def record(self, key: StatsKey, event: str, value: int = 0, timestamp: Optional[float] = None):
+        """Count an answer or hint towards its day, for the per-day counters written by the next save."""
+        add_daily_count(self._daily, key, event, timestamp)
+
+    def _save_daily_counts(self):
+        """Add the per-day counts recorded since the last save. Runs inside the caller's transaction.
+
+        The first save of every day also deletes the days older than DAILY_COUNT_DAYS.
+        """
+        if self._daily:
+            self.connection.executemany(self.UPSERT_DAY_SQL, [
+                (*key, *counts) for key, counts in self._daily.items()
+            ])
+        today = int(time.time() // SECONDS_PER_DAY)
+        if self._pruned_day != today:
+            self.connection.execute("DELETE FROM user_days WHERE day <= ?", (today - DAILY_COUNT_DAYS,))
+            self._pruned_day = today
+
+    def load_daily_counts(self, since: int) -> Iterator[DailyCount]:
+        """Yield the stored per-day counters of the days starting at or after since."""
+        cursor = self.connection.execute(
+            "SELECT day, guild_id, user_id, correct, total, hints FROM user_days WHERE day >= ?",
+            (since // SECONDS_PER_DAY,)
+        )
+        for day, guild_id, user_id, correct, total, hints in cursor:
+            yield day * SECONDS_PER_DAY, guild_id, user_id, correct, total, hints
+
+    def _sync(self):
+        """Run a WAL checkpoint, which syncs the database, if the interval policy says a sync is due.
+
+        With DURABILITY_ALWAYS every commit is already synced by SQLite itself.
+        """
+        if self.durability.mode == DURABILITY_INTERVAL and self.durability.should_sync():
+            with METRICS.time('trivia_bot_stats_fsync_seconds', policy=self.durability.mode, target='checkpoint'):
+                self.connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class SharedSQLiteStatsBackend(SQLiteStatsBackend):
+    """An SQLite store that several bot processes can update at the same time.
+
+    Instead of writing each user's totals (where the last process to save
+    wins), this backend collects the increments recorded since the last save
+    and adds them to the stored values in one transaction:
+        correct = correct + excluded.correct
+    so concurrent processes never lose each other's updates. SQLite's file
+    locking serializes the transactions.
+
+    Every save also bumps a version counter and stamps it on the rows it
+    touched. load_changes() reads only the rows with a newer version than
+    the last read, through an index, so keeping every process up to date
+    with the others stays cheap.
+
+    Don't write to the same database with SQLiteStatsBackend at the same
+    time; its writes don't bump the version. It can be used to import a CSV
+    file first: python stats_storage.py trivia_stats.csv trivia_stats.db
+    """
+    shared = True
+
+    # Adds the recorded increments to the stored counters; deck_state is only replaced
+    # when the last parameter is true, because the deck state is a value, not a counter
+    UPSERT_DELTA_SQL = (
+        "INSERT INTO user_stats (guild_id, user_id, trivias_answered, correct, incorrect, hints_used, deck_state, version) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(guild_id, user_id) DO UPDATE SET "
+        "trivias_answered = trivias_answered + excluded.trivias_answered, "
+        "correct = correct + excluded.correct, "
+        "incorrect = incorrect + excluded.incorrect, "
+        "hints_used = hints_used + excluded.hints_used, "
+        "deck_state = CASE WHEN ? THEN excluded.deck_state ELSE deck_state END, "
+        "version = excluded.version"
+    )
+
+    # Replaces a user's row with imported totals, stamped with the version of the import
+    IMPORT_SQL = (
+        "INSERT INTO user_stats (guild_id, user_id, trivias_answered, correct, incorrect, hints_used, deck_state, version) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(guild_id, user_id) DO UPDATE SET "
+        "trivias_answered = excluded.trivias_answered, "
+        "correct = excluded.correct, "
+        "incorrect = excluded.incorrect, "
+        "hints_used = excluded.hints_used, "
+        "deck_state = excluded.deck_state, "
+        "version = excluded.version"
+    )
+
+    def __init__(self, filename: str = "trivia_stats.db", busy_timeout: float = 5.0,
+                 durability: Optional[DurabilityPolicy] = None, legacy_guild_id: Optional[int] = None):
+        """Open (and create if needed) the shared SQLite database.
+
+        Args:
+            filename (str): The database file to store stats in. Defaults to "trivia_stats.db".
+            busy_timeout (float): Seconds to wait for another process's transaction before failing.
+            durability (DurabilityPolicy, optional): When saves are synced. Defaults to every save.
+            legacy_guild_id (int, optional): The guild that users stored before stats were kept
+                                           per guild are moved to (DEFAULT_GUILD_ID for direct messages).
+        """
+        super().__init__(filename, durability, legacy_guild_id)
+        self.connection.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+        with self.connection:
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(user_stats)")}
+            if 'version' not in columns:
+                self.connection.execute("ALTER TABLE user_stats ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_user_stats_version ON user_stats (version)")
+            # A single row holding the version of the latest save
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS stats_version (id INTEGER PRIMARY KEY CHECK (id = 0), value INTEGER NOT NULL)"
+            )
+            self.connection.execute("INSERT OR IGNORE INTO stats_version (id, value) VALUES (0, 0)")
+        # Increments recorded since the last save, in the same shape as the stats dictionary
+        self._deltas: Dict[StatsKey, UserStats] = {}
+        self._deck_changed: Set[StatsKey] = set()  # Users whose deck state was set since the last save
+        self._seen_version = 0  # The newest version this process has read
+
+    def record(self, key: StatsKey, event: str, value: int = 0, timestamp: Optional[float] = None):
+        """Add one change to the increments of the next save, and count it towards its day."""
+        super().record(key, event, value, timestamp)
+        apply_event(self._deltas, key, event, value)
+        if event == EVENT_DECK:
+            self._deck_changed.add(key)
+
+    def load_all(self) -> Dict[StatsKey, UserStats]:
+        """Read every user row, and remember the newest version that was read."""
+        cursor = self.connection.execute(
+            "SELECT guild_id, user_id, trivias_answered, correct, incorrect, hints_used, deck_state, version FROM user_stats"
+        )
+        return self._merge_rows(cursor)
+
+    def load_changes(self) -> Dict[StatsKey, UserStats]:
+        """Read the rows saved (by any process) since the last read, with this process's unsaved increments added."""
+        cursor = self.connection.execute(
+            "SELECT guild_id, user_id, trivias_answered, correct, incorrect, hints_used, deck_state, version "
+            "FROM user_stats WHERE version > ?", (self._seen_version,)
+        )
+        return self._merge_rows(cursor)
+
+    def _merge_rows(self, rows: Iterable[Tuple[int, ...]]) -> Dict[StatsKey, UserStats]:
+        """Turn rows into stats dictionaries that include the unsaved increments, tracking the newest version."""
+        stats = {}
+        for row in rows:
+            key, version = (row[0], row[1]), row[-1]
+            user_stats = UserStats(*row[2:-1])
+            delta = self._deltas.get(key)
+            if delta is not None:
+                for field in STAT_FIELDS[:-1]:
+                    user_stats[field] += delta[field]
+                if key in self._deck_changed:
+                    user_stats['deck_state'] = delta['deck_state']
+            stats[key] = user_stats
+            self._seen_version = max(self._seen_version, version)
+        return stats
+
+    def save(self, stats: Dict[StatsKey, UserStats], keys: Iterable[StatsKey]):
+        """Add the recorded increments to the stored rows in a single transaction.
+
+        The stats and keys arguments are ignored: the increments recorded
+        through record() are what gets written, so totals computed by other
+        processes are never overwritten.
+        """
+        if not self._deltas:
+            return
+        with self.connection:
+            version = self._next_version()
+            self.connection.executemany(self.UPSERT_DELTA_SQL, [
+                (*key, *(delta[field] for field in STAT_FIELDS), version, key in self._deck_changed)
+                for key, delta in self._deltas.items()
+            ])
+            self._save_daily_counts()
+        self._deltas.clear()
+        self._deck_changed.clear()
+        self._daily.clear()
+        self._sync()
+
+    def import_stats(self, stats: Dict[StatsKey, UserStats]):
+        """Replace the rows of the imported users in a single transaction.
+
+        save() only adds recorded increments, so imported totals are written as
+        values instead, stamped with a new version so running processes read them.
+        """
+        with self.connection:
+            version = self._next_version()
+            self.connection.executemany(self.IMPORT_SQL, [
+                (*key, *(user_stats[field] for field in STAT_FIELDS), version) for key, user_stats in stats.items()
+            ])
+        self._sync()
+
+    def _next_version(self) -> int:
+        """Start a write transaction and bump the version counter. Runs inside the caller's transaction.
+
+        Returns:
+            int: The version to stamp on the rows written by this transaction.
+        """
+        # Take the write lock up front, so two processes can't both read the version and then both write
+        self.connection.execute("BEGIN IMMEDIATE")
+        self.connection.execute("UPDATE stats_version SET value = value + 1 WHERE id = 0")
+        return self.connection.execute("SELECT value FROM stats_version WHERE id = 0").fetchone()[0]
+
+
+def add_counts(counts: Dict[DailyKey, List[int]], key: DailyKey, correct: int, total: int, hints: int):
+    """Add to the per-day counters of one user and day, creating them if needed."""
+    day_counts = counts.get(key)
+    if day_counts is None:
+        counts[key] = [correct, total, hints]
+    else:
+        day_counts[0] += correct
+        day_counts[1] += total
+        day_counts[2] += hints
+
+
+def add_daily_count(counts: Dict[DailyKey, List[int]], key: StatsKey, event: str, timestamp: Optional[float] = None):
+    """Count one answer or hint towards the UTC day it was made on. Dealt questions are not counted.
+
+    Args:
+        counts (Dict[DailyKey, List[int]]): (day, guild_id, user_id) -> [correct, total, hints]
+        key (StatsKey): The guild ID and Discord user ID of the player
+        event (str): One of EVENT_CORRECT, EVENT_INCORRECT, EVENT_HINT or EVENT_DECK
+        timestamp (float, optional): UNIX time the change was made. Defaults to now.
+    """
+    if event == EVENT_DECK:
+        return
+    day = int((time.time() if timestamp is None else timestamp) // SECONDS_PER_DAY)
+    add_counts(counts, (day, *key), int(event == EVENT_CORRECT), int(event != EVENT_HINT), int(event == EVENT_HINT))
+
+
+def apply_event(stats: Dict[StatsKey, UserStats], key: StatsKey, event: str, value: int = 0):
+    """Apply a single journal event to a stats dictionary.
+
+    Args:
+        stats (Dict[StatsKey, UserStats]): The stats dictionary to update
+        key (StatsKey): The guild ID and Discord user ID of the player
+        event (str): One of EVENT_CORRECT, EVENT_INCORRECT, EVENT_HINT or EVENT_DECK
+        value (int): The new deck state for EVENT_DECK, unused otherwise
+    """
+    user_stats = stats.get(key)
+    if user_stats is None:
+        user_stats = stats[key] = UserStats()
+    if event == EVENT_DECK:
+        user_stats.deck_state = value
+    elif event == EVENT_HINT:
+        user_stats.hints_used += 1
+    else:
+        user_stats.trivias_answered += 1
+        if event == EVENT_CORRECT:
+            user_stats.correct += 1
+        else:
+            user_stats.incorrect += 1
+
+
+class JournalStatsBackend(StatsBackend):
+    """Stores every stats change in an append-only journal with periodic snapshots.
+
+    Each answer, hint or dealt question appends one short line (timestamp,
+    user ID, event code, the new deck state for dealt questions, and guild ID)
+    to the current journal segment, which is cheap and survives bursts of clicks.
+    After snapshot_every events a save writes a CSV snapshot of all counters and
+    starts a new segment. Older segments are then compacted: gzipped into the
+    archive directory if keep_history is set (so the full history stays available
+    for analytics), or deleted otherwise.
+
+    On startup the newest snapshot is loaded and the journal tail is replayed.
+
+    Directory layout:
+        snapshot-<n>.csv        counters covering every segment before n
+        snapshot-<n>_days.csv   per-day counters of the last DAILY_COUNT_DAYS days that are no
+                                longer in the history (segments deleted with keep_history off)
+        journal-<n>.log         live journal segments, replayed on startup
+        archive/journal-<n>.log.gz  compacted history
+        guild-keys              marks that every file has per-guild keys
+
+    A directory written before stats were kept per guild is migrated on open:
+    every snapshot, live segment and archived segment is rewritten with the
+    old users and events moved to legacy_guild_id, and the directory can't be
+    opened without one.
+    """
+
+    # Created once every file in the directory is known to have per-guild keys
+    GUILD_KEYS_MARKER = 'guild-keys'
+
+    def __init__(self, directory: str = "trivia_journal", snapshot_every: int = 10000,
+                 keep_history: bool = True, durability: Optional[DurabilityPolicy] = None,
+                 legacy_guild_id: Optional[int] = None):
+        """Open the journal directory, creating it if needed.
+
+        Args:
+            directory (str): The directory holding snapshots and journal segments.
+            snapshot_every (int): Number of events between snapshots.
+            keep_history (bool): If True, compacted segments are archived instead of deleted.
+                               Otherwise their per-day counters are kept with the snapshot,
+                               so windowed leaderboards survive a restart either way.
+            durability (DurabilityPolicy, optional): When appended events are synced. Defaults to every save.
+                                                   Snapshots are always synced, because compaction
+                                                   deletes the segments they replace.
+            legacy_guild_id (int, optional): The guild that users and events stored before stats were
+                                           kept per guild are moved to (DEFAULT_GUILD_ID for direct messages).
+
+        Raises:
+            ValueError: If the directory was written before stats were kept per guild and legacy_guild_id is None
+        """
+        self.directory = directory
+        self.durability = durability or DurabilityPolicy()
+        self.archive_directory = os.path.join(directory, 'archive')
+        self.snapshot_every = snapshot_every
+        self.keep_history = keep_history
+        self.legacy_guild_id = legacy_guild_id
+        os.makedirs(self.archive_directory, exist_ok=True)
+        self._events_since_snapshot = 0
+        self._segment = None  # Number of the segment currently being appended to
+        self._journal = None  # Open file of the current segment
+        if not os.path.exists(os.path.join(directory, self.GUILD_KEYS_MARKER)):
+            self._migrate_to_guild_keys()
+
+    def _migrate_to_guild_keys(self):
+        """Rewrite every file written before stats were kept per guild, then create the marker file.
+
+        Archived segments keep their modification time, which load_history uses to skip old archives.
+        """
+        migrated = 0
+        for number in self._numbers('snapshot'):
+            # Opening a snapshot written before stats were kept per guild rewrites it
+            CSVStatsBackend(self._path('snapshot', number), DurabilityPolicy(DURABILITY_ALWAYS), self.legacy_guild_id)
+        paths = [self._path('journal', number) for number in self._numbers('journal')]
+        paths.extend(sorted(glob.glob(os.path.join(self.archive_directory, 'journal-*.log.gz'))))
+        for path in paths:
+            if not _has_legacy_lines(path):
+                continue
+            lines = ''.join(f"{timestamp},{user_id},{event},{value},{guild_id}\n"
+                            for timestamp, guild_id, user_id, event, value in _read_journal(path, self.legacy_guild_id))
+            data = lines.encode()
+            if path.endswith('.gz'):
+                data = gzip.compress(data)
+            modified = os.stat(path)
+            temporary = path + '.tmp'
+            with open(temporary, 'wb') as file:
+                file.write(data)
+                self.durability.sync_file(file)
+            os.replace(temporary, path)
+            os.utime(path, (modified.st_atime, modified.st_mtime))
+            migrated += 1
+        with open(os.path.join(self.directory, self.GUILD_KEYS_MARKER), 'w'):
+            pass
+        self.durability.sync_directory(self.directory)
+        if migrated:
+            logger.info("Migrated journal to per-guild keys directory=%s segments=%d guild_id=%s",
+                        self.directory, migrated, self.legacy_guild_id)
+
+    def _path(self, kind: str, number: int) -> str:
+        """Return the path of a snapshot or journal segment file."""
+        extension = 'csv' if kind == 'snapshot' else 'log'
+        return os.path.join(self.directory, f"{kind}-{number:012d}.{extension}")
+
+    def _numbers(self, kind: str) -> list:
+        """Return the sorted numbers of all snapshot or journal segment files."""
+        extension = 'csv' if kind == 'snapshot' else 'log'
+        paths = glob.glob(os.path.join(self.directory, f"{kind}-*.{extension}"))
+        numbers = (os.path.basename(path)[len(kind) + 1:-len(extension) - 1] for path in paths)
+        # Skips the per-day counter files kept with snapshots (snapshot-<n>_days.csv)
+        return sorted(int(number) for number in numbers if number.isdigit())
+
+    def _open_segment(self, number: int):
+        """Close the current journal segment and start appending to segment number."""
+        if self._journal is not None:
+            self._journal.close()
+        self._segment = number
+        path = self._path('journal', number)
+        created = not os.path.exists(path)
+        self._journal = open(path, 'a', newline='')
+        # Make sure the new segment itself survives a crash, not only the events synced into it
+        if created and self.durability.mode != DURABILITY_OS:
+            self.durability.sync_directory(self.directory)
+
+    def _replay(self, before: Optional[int] = None) -> Tuple[Dict[StatsKey, UserStats], List[int], int]:
+        """Rebuild the stats from the newest snapshot and the journal segments written after it.
+
+        Args:
+            before (int, optional): Only replay segments numbered below this. Replays every segment if None.
+
+        Returns:
+            Tuple: The stats, the numbers of the replayed segments and the number of replayed events.
+        """
+        snapshots = self._numbers('snapshot')
+        base = snapshots[-1] if snapshots else 0
+        stats = {}
+        if snapshots:
+            stats = CSVStatsBackend(self._path('snapshot', base), legacy_guild_id=self.legacy_guild_id).load_all()
+        segments = [number for number in self._numbers('journal')
+                    if number >= base and (before is None or number < before)]
+        events = 0
+        for number in segments:
+            for _, guild_id, user_id, event, value in _read_journal(self._path('journal', number), self.legacy_guild_id):
+                apply_event(stats, (guild_id, user_id), event, value)
+                events += 1
+        return stats, segments, events
+
+    def load_all(self) -> Dict[StatsKey, UserStats]:
+        """Load the newest snapshot and replay every journal segment written after it."""
+        stats, segments, events = self._replay()
+        self._events_since_snapshot += events
+        # Keep appending to the newest segment
+        self._open_segment(segments[-1] if segments else max(self._numbers('snapshot') + [0]))
+        return stats
+
+    def record(self, key: StatsKey, event: str, value: int = 0, timestamp: Optional[float] = None):
+        """Append one event to the current journal segment, stamped with the time it was made."""
+        if self._journal is None:
+            self._open_segment(max(self._numbers('journal') + self._numbers('snapshot') + [0]))
+        guild_id, user_id = key
+        if timestamp is None:
+            timestamp = time.time()
+        self._journal.write(f"{int(timestamp)},{user_id},{event},{value},{guild_id}\n")
+        self._events_since_snapshot += 1
+
+    def save(self, stats: Dict[StatsKey, UserStats], keys: Iterable[StatsKey]):
+        """Push appended events to the OS, and snapshot once enough events have piled up.
+
+        The stats argument is not used: the events already hold every change, and
+        snapshots are rebuilt from the previous snapshot and the journal.
+        """
+        if self._journal is not None:
+            if self.durability.should_sync():
+                self.durability.sync_file(self._journal)
+            else:
+                self._journal.flush()
+        if self._events_since_snapshot >= self.snapshot_every:
+            # New events go to a new segment, and the snapshot covers every segment before it
+            number = (self._segment or 0) + 1
+            self._open_segment(number)
+            self._write_snapshot(number, self._replay(before=number)[0])
+
+    def import_stats(self, stats: Dict[StatsKey, UserStats]):
+        """Write a snapshot of the current stats with the imported users replacing their stored stats.
+
+        save() only writes the events passed to record(), so the imported totals
+        go into a snapshot instead; they have no events of their own to journal.
+        """
+        if self._journal is not None:
+            self._journal.flush()
+        merged = self._replay()[0]
+        merged.update(stats)
+        number = max(self._numbers('journal') + self._numbers('snapshot') + [0]) + 1
+        self._open_segment(number)
+        self._write_snapshot(number, merged)
+
+    def snapshot(self, stats: Dict[StatsKey, UserStats]):
+        """Write a snapshot of stats, start a new journal segment and compact the old ones.
+
+        The stats must include every event recorded so far.
+        """
+        number = (self._segment or 0) + 1
+        self._open_segment(number)
+        self._write_snapshot(number, stats)
+
+    def _write_snapshot(self, number: int, stats: Dict[StatsKey, UserStats]):
+        """Write snapshot number, covering every segment before it, and compact the older files."""
+        # CSVStatsBackend writes a temporary file first, so a crash never leaves a half-written snapshot.
+        # It is always synced: the segments it covers are removed right after.
+        snapshot = CSVStatsBackend(self._path('snapshot', number), DurabilityPolicy(DURABILITY_ALWAYS))
+        # The per-day counters go to the snapshot's days file, written by the same save
+        for key, counts in self._snapshot_daily_counts(number).items():
+            add_counts(snapshot._daily, key, *counts)
+        snapshot.save(stats, stats.keys())
+        self._events_since_snapshot = 0
+        self.compact(number)
+
+    def _snapshot_daily_counts(self, number: int) -> Dict[DailyKey, List[int]]:
+        """Return the per-day counters to keep with snapshot number, for the days windowed leaderboards still use.
+
+        They are the counters kept with the previous snapshot, plus, if keep_history is
+        off, the events of the segments the snapshot covers, which compaction deletes.
+        Archived segments stay readable through load_history, so their events are not counted.
+        """
+        since = (int(time.time() // SECONDS_PER_DAY) - DAILY_COUNT_DAYS + 1) * SECONDS_PER_DAY
+        counts: Dict[DailyKey, List[int]] = {}
+        previous = self._daily_counts_snapshot(before=number)
+        if previous is not None:
+            for timestamp, guild_id, user_id, correct, total, hints in previous.load_daily_counts(since):
+                add_counts(counts, (timestamp // SECONDS_PER_DAY, guild_id, user_id), correct, total, hints)
+        if not self.keep_history:
+            for segment in self._numbers('journal'):
+                if segment < number:
+                    for timestamp, guild_id, user_id, event, _ in _read_journal(self._path('journal', segment)):
+                        if timestamp >= since:
+                            add_daily_count(counts, (guild_id, user_id), event, timestamp)
+        return counts
+
+    def _daily_counts_snapshot(self, before: Optional[int] = None) -> Optional[CSVStatsBackend]:
+        """Return the newest snapshot (numbered below before, if given) that has per-day counters kept with it.
+
+        A snapshot can lack them if nothing needed keeping, or if a crash hit between
+        writing the snapshot and its counters; the segments are only compacted after both.
+        """
+        for number in reversed(self._numbers('snapshot')):
+            if before is None or number < before:
+                snapshot = CSVStatsBackend(self._path('snapshot', number))
+                if os.path.exists(snapshot.days_filename):
+                    return snapshot
+        return None
+
+    def load_daily_counts(self, since: int) -> Iterator[DailyCount]:
+        """Yield the per-day counters kept with the newest snapshot, then every event still in the history.
+
+        The counters cover the segments that compaction deleted (keep_history off), and the
+        events cover the archived and live segments, so no event is counted twice.
+        """
+        snapshot = self._daily_counts_snapshot()
+        if snapshot is not None:
+            yield from snapshot.load_daily_counts(since)
+        yield from super().load_daily_counts(since)
+
+    def compact(self, snapshot_number: int):
+        """Remove snapshots (with their per-day counters) and journal segments that are covered by a newer snapshot."""
+        for number in self._numbers('snapshot'):
+            if number < snapshot_number:
+                snapshot = CSVStatsBackend(self._path('snapshot', number))
+                if os.path.exists(snapshot.days_filename):
+                    os.remove(snapshot.days_filename)
+                os.remove(snapshot.filename)
+        for number in self._numbers('journal'):
+            if number < snapshot_number:
+                path = self._path('journal', number)
+                if self.keep_history:
+                    archived = os.path.join(self.archive_directory, os.path.basename(path) + '.gz')
+                    with open(path, 'rb') as source, gzip.open(archived, 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                os.remove(path)
+
+    def load_history(self, since: int = 0) -> Iterator[Tuple[int, int, int, str, int]]:
+        """Yield the recorded events since a point in time, archived segments first.
+
+        Archived segments last modified before since only hold older events, so
+        they are skipped without being decompressed.
+        Only history that was archived (keep_history=True) or is still live is available.
+        """
+        archived = sorted(glob.glob(os.path.join(self.archive_directory, 'journal-*.log.gz')))
+        paths = [path for path in archived if os.path.getmtime(path) >= since]
+        paths.extend(self._path('journal', number) for number in self._numbers('journal'))
+        for path in paths:
+            for entry in _read_journal(path, self.legacy_guild_id):
+                if entry[0] >= since:
+                    yield entry
+
+    def close(self):
+        """Flush and close the current journal segment."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def _is_legacy_line(parts: List[str]) -> bool:
+    """Return True for the split fields of a journal line written before stats were kept per guild."""
+    return ((len(parts) == 3 and parts[2] in (EVENT_CORRECT, EVENT_INCORRECT, EVENT_HINT))
+            or (len(parts) == 4 and parts[2] == EVENT_DECK))
+
+
+def _has_legacy_lines(path: str) -> bool:
+    """Return True if a plain or gzipped journal segment has lines written before stats were kept per guild."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', newline='') as file:
+        return any(_is_legacy_line(line.rstrip('\n').split(',')) for line in file)
+
+
+def _read_journal(path: str, legacy_guild_id: Optional[int] = None) -> Iterator[Tuple[int, int, int, str, int]]:
+    """Yield (timestamp, guild_id, user_id, event, value) tuples from a plain or gzipped journal segment.
+
+    Lines are "timestamp,user,event,value,guild". Lines written before stats were kept
+    per guild ("timestamp,user,event", or "timestamp,user,d,value" for dealt questions)
+    are read as legacy_guild_id events, and raise ValueError if it is None.
+    Lines that can't be parsed, such as a line torn by a crash mid-write, are skipped.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', newline='') as file:
+        for line in file:
+            parts = line.rstrip('\n').split(',')
+            if _is_legacy_line(parts):
+                if len(parts) == 3:
+                    parts.append('0')
+                parts.append(str(legacy_guild(legacy_guild_id, path)))
+            elif len(parts) != 5 or parts[2] not in (EVENT_CORRECT, EVENT_INCORRECT, EVENT_HINT, EVENT_DECK):
+                continue
+            try:
+                yield int(parts[0]), int(parts[4]), int(parts[1]), parts[2], int(parts[3])
+            except ValueError:
+                continue
+
+
+def iter_journal_history(directory: str = "trivia_journal",
+                         legacy_guild_id: Optional[int] = None) -> Iterator[Tuple[int, int, int, str, int]]:
+    """Yield every recorded (timestamp, guild_id, user_id, event, value) in order, archived segments first.
+
+    Args:
+        directory (str): The journal directory of a JournalStatsBackend
+        legacy_guild_id (int, optional): The guild to migrate a journal written before stats were kept per guild to
+
+    Only history that was archived (keep_history=True) or is still live is available.
+    """
+    yield from JournalStatsBackend(directory, legacy_guild_id=legacy_guild_id).load_history()
+
+
+def create_backend(kind: str = "csv", filename: str = None, durability: Optional[DurabilityPolicy] = None,
+                   legacy_guild_id: Optional[int] = None) -> StatsBackend:
+    """Create a storage backend by name.
+
+    Args:
+        kind (str): One of "csv", "sqlite", "shared-sqlite" or "journal"
+        filename (str, optional): The file (or directory, for the journal) to store stats in. Uses the backend's default if None.
+        durability (DurabilityPolicy, optional): When saves are synced. Defaults to every save.
+        legacy_guild_id (int, optional): The guild that stats stored before they were kept per guild are
+                                       moved to (DEFAULT_GUILD_ID for direct messages). Only needed once,
+                                       to open stats saved by an older version of the bot.
+
+    Returns:
+        StatsBackend: The configured backend
+
+    Raises:
+        ValueError: If kind is not a known backend name, or if the stats were saved before they were
+                    kept per guild and legacy_guild_id is None
+    """
+    backends = {'csv': CSVStatsBackend, 'sqlite': SQLiteStatsBackend, 'shared-sqlite': SharedSQLiteStatsBackend,
+                'journal': JournalStatsBackend}
+    if kind not in backends:
+        raise ValueError(f"Unknown stats backend: {kind!r} (expected one of {', '.join(backends)})")
+    if filename:
+        return backends[kind](filename, durability=durability, legacy_guild_id=legacy_guild_id)
+    return backends[kind](durability=durability, legacy_guild_id=legacy_guild_id)
+
+
+def import_csv_stats(csv_filename: str, backend: StatsBackend, legacy_guild_id: Optional[int] = None) -> int:
+    """Copy every user from an existing stats CSV file into another backend.
+
+    Args:
+        csv_filename (str): The CSV file to import, usually "trivia_stats.csv"
+        backend (StatsBackend): The backend to write the users to
+        legacy_guild_id (int, optional): The guild to put the users of a file written before stats
+                                       were kept per guild in. The file is migrated in place.
+
+    Returns:
+        int: The number of users imported
+    """
+    stats = CSVStatsBackend(csv_filename, legacy_guild_id=legacy_guild_id).load_all()
+    backend.import_stats(stats)
+    return len(stats)
+
+
+# Running this module directly performs a one-shot import of a CSV file into SQLite:
+#   python stats_storage.py trivia_stats.csv trivia_stats.db
+# Stats saved before they were kept per guild also need the guild they belong to:
+#   python stats_storage.py trivia_stats.csv trivia_stats.db --legacy-guild-id 123456789012345678
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a trivia stats CSV file into an SQLite database")
+    parser.add_argument("csv_file", help="The CSV stats file to import")
+    parser.add_argument("db_file", help="The SQLite database to import into")
+    parser.add_argument("--legacy-guild-id", type=int,
+                        help=f"Guild to move stats saved before they were kept per guild to ({DEFAULT_GUILD_ID} for DMs)")
+    args = parser.parse_args()
+    target = SQLiteStatsBackend(args.db_file, legacy_guild_id=args.legacy_guild_id)
+    count = import_csv_stats(args.csv_file, target, args.legacy_guild_id)
+    target.close()
+    print(f"Imported {count} users from {args.csv_file} into {args.db_file}")
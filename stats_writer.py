@@ -0,0 +1,132 @@
+# Import required libraries for the writer thread, futures, logging, and type hints
+import concurrent.futures
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import METRICS
+from stats_storage import StatsKey, UserStats
+
+logger = logging.getLogger(__name__)
+
+METRICS.describe('trivia_bot_stats_writes_total', 'Stats batches written by the writer thread, by outcome')
+METRICS.describe('trivia_bot_stats_writes_coalesced_total', 'Stats batches merged into a batch that was still waiting to be written')
+
+# One recorded stats change: (guild ID and user ID, event code, deck state for dealt questions,
+# UNIX time the change was made, which can be well before the batch is written)
+StatsEvent = Tuple[StatsKey, str, int, float]
+
+
+class StatsWriter:
+    """Runs every stats backend write on one dedicated thread.
+
+    StatsManager hands over a batch of changed users (copies of their stats,
+    taken on the event loop) and the events recorded since the last batch.
+    While a write is in flight, further batches are merged into a single
+    pending batch, so only the newest stats of each user are written once
+    the current write finishes, no matter how many flushes were requested.
+
+    Every submitted batch gets a concurrent.futures.Future that completes
+    when a write including it has finished, so callers on the event loop can
+    await it with asyncio.wrap_future instead of blocking on disk.
+    """
+
+    def __init__(self, write: Callable[[Dict[StatsKey, UserStats], List[StatsEvent]], None],
+                 name: str = "stats-writer"):
+        """Set up the writer. The thread is started by the first submit().
+
+        Args:
+            write (Callable): Called on the writer thread with the changed users and the
+                            recorded events of one (possibly merged) batch. It must hand
+                            the events to the backend before anything that can fail.
+            name (str): The name of the writer thread, shown in thread dumps.
+        """
+        self._write = write
+        self._condition = threading.Condition()
+        # The batch waiting for the current write to finish, and the future its submitters wait on
+        self._pending_rows: Dict[StatsKey, UserStats] = {}
+        self._pending_events: List[StatsEvent] = []
+        self._pending_future: Optional[concurrent.futures.Future] = None
+        # Keys of the batch currently being written
+        self._writing: Dict[StatsKey, UserStats] = {}
+        self._closed = False
+        self._name = name
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, rows: Dict[StatsKey, UserStats], events: List[StatsEvent]) -> concurrent.futures.Future:
+        """Queue a batch for writing and return a future that completes once it is written.
+
+        Args:
+            rows (Dict[StatsKey, UserStats]): Copies of the stats of the users that changed.
+                                                  They must not be modified after submitting.
+            events (List[StatsEvent]): The events recorded since the previous batch, in order
+
+        If a batch is already waiting, this one is merged into it: newer stats
+        replace older ones, events are appended, and both share one future.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The stats writer is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            if self._pending_future is None:
+                self._pending_future = concurrent.futures.Future()
+            elif self._pending_rows or self._pending_events:
+                METRICS.inc('trivia_bot_stats_writes_coalesced_total')
+            self._pending_rows.update(rows)
+            self._pending_events.extend(events)
+            self._condition.notify()
+            return self._pending_future
+
+    def is_unwritten(self, key: StatsKey) -> bool:
+        """Return True if changes of a user are still waiting to be written or being written."""
+        with self._condition:
+            return key in self._pending_rows or key in self._writing
+
+    def _run(self):
+        """Write pending batches one at a time until the writer is closed."""
+        while True:
+            with self._condition:
+                while self._pending_future is None and not self._closed:
+                    self._condition.wait()
+                if self._pending_future is None:
+                    return
+                rows, events, future = self._pending_rows, self._pending_events, self._pending_future
+                self._pending_rows, self._pending_events, self._pending_future = {}, [], None
+                self._writing = rows
+            try:
+                self._write(rows, events)
+            except Exception as error:
+                logger.exception("Error writing stats users=%d events=%d", len(rows), len(events))
+                METRICS.inc('trivia_bot_stats_writes_total', status='error')
+                # Put the users back (behind anything newer), so the next write retries them.
+                # The events are not retried: write() hands them to the backend before saving,
+                # and the backend keeps them until a save succeeds.
+                # Once closing, there is no next write and the batch is dropped.
+                with self._condition:
+                    if not self._closed:
+                        for key, user_stats in rows.items():
+                            self._pending_rows.setdefault(key, user_stats)
+                    self._writing = {}
+                future.set_exception(error)
+            else:
+                METRICS.inc('trivia_bot_stats_writes_total', status='ok')
+                with self._condition:
+                    self._writing = {}
+                future.set_result(None)
+
+    def close(self, timeout: Optional[float] = None):
+        """Write whatever is still pending, then stop the writer thread.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread to finish. Waits forever if None.
+        """
+        with self._condition:
+            self._closed = True
+            # Retry a batch whose last write failed, even if nothing new was submitted since
+            if self._pending_future is None and self._pending_rows:
+                self._pending_future = concurrent.futures.Future()
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,110 @@
+"""
+Randomized check of WindowedLeaderboards against a brute-force recount.
+
+Random answers and hints are added over a fake clock that sometimes jumps
+ahead by one or more days (including jumps longer than the whole window).
+At regular points every user's totals and every ranking are compared with
+a recount of the full event log, and a second instance is loaded from the
+same log and compared too. Each scenario also forces both ways a day change
+can be handled: moving the affected users one at a time, and rebuilding
+every index.
+
+Usage (from the repository root):
+    python -m unittest tests.test_windowed_leaderboards
+"""
+# Import required libraries for randomness, unit testing, and type hints
+import random
+import unittest
+from typing import Dict, List, Optional, Tuple
+from unittest import mock
+
+import windowed_leaderboards
+from windowed_leaderboards import SECONDS_PER_DAY, WindowedLeaderboards
+
+MIN_QUESTIONS = 2
+SCOPES = (1, 2, None)
+USERS = 60
+# Day jumps to pick from when the clock skips ahead: mostly single days, some longer than the window
+DAY_JUMPS = (1, 1, 1, 2, 5, 8, 29, 30, 31, 40)
+
+
+def recount(log: List[Tuple[float, Optional[int], int, int, int, int]], today: int,
+            length: int) -> Dict[Tuple[Optional[int], int], List[int]]:
+    """Sum the logged (timestamp, scope, user, correct, total, hints) entries of the last length days."""
+    totals: Dict[Tuple[Optional[int], int], List[int]] = {}
+    for timestamp, scope, user_id, correct, total, hints in log:
+        if int(timestamp // SECONDS_PER_DAY) > today - length:
+            counts = totals.setdefault((scope, user_id), [0, 0, 0])
+            counts[0] += correct
+            counts[1] += total
+            counts[2] += hints
+    return totals
+
+
+class WindowedLeaderboardsTest(unittest.TestCase):
+    """Compares WindowedLeaderboards with a recount of every event, across day changes and reloads."""
+
+    def check(self, windows: WindowedLeaderboards, log: list, now: float):
+        """Assert that every total, ranking and kept window matches a recount of the log."""
+        today = int(now // SECONDS_PER_DAY)
+        for period, length in windows.periods.items():
+            expected = recount(log, today, length)
+            for scope in SCOPES:
+                for user_id in range(1, USERS + 1):
+                    self.assertEqual(list(windows.totals(scope, user_id, period)),
+                                     expected.get((scope, user_id), [0, 0, 0]), (period, scope, user_id))
+                ranked = sorted((-(correct / total), -total, user_id)
+                                for (entry_scope, user_id), (correct, total, _) in expected.items()
+                                if entry_scope == scope and total >= MIN_QUESTIONS)
+                self.assertEqual(windows.index(scope, period).top(), [key[2] for key in ranked], (period, scope))
+        # Only users active within the longest window are kept
+        self.assertEqual(set(windows.windows), set(recount(log, today, windows.days)))
+
+    def run_scenario(self, seed: int, steps: int = 6000):
+        """Add random events over a jumping clock, checking and reloading along the way."""
+        rng = random.Random(seed)
+        now = [1_700_000_000.0]
+        windows = WindowedLeaderboards(MIN_QUESTIONS, clock=lambda: now[0])
+        log = []
+        for step in range(steps):
+            if rng.random() < 0.01:
+                now[0] += SECONDS_PER_DAY * rng.choice(DAY_JUMPS)
+            now[0] += rng.random() * 100
+            scope, user_id = rng.choice(SCOPES), rng.randint(1, USERS)
+            if rng.random() < 0.2:
+                windows.add(scope, user_id, hints=1)
+                log.append((now[0], scope, user_id, 0, 0, 1))
+            else:
+                correct = int(rng.random() < 0.6)
+                windows.add(scope, user_id, correct, 1)
+                log.append((now[0], scope, user_id, correct, 1, 0))
+            if step % 250 == 0:
+                self.check(windows, log, now[0])
+                # Loading the same log, in any order, must give the same windows
+                reloaded = WindowedLeaderboards(MIN_QUESTIONS, clock=lambda: now[0])
+                reloaded.load(rng.sample(log, len(log)))
+                self.check(reloaded, log, now[0])
+                # Sometimes carry on from the reloaded copy, so loaded windows get advanced too
+                if rng.random() < 0.3:
+                    windows = reloaded
+
+    def test_incremental_day_changes(self):
+        """Day changes move only the affected users (never rebuild)."""
+        with mock.patch.object(windowed_leaderboards, 'REBUILD_FRACTION', 0):
+            for seed in range(3):
+                self.run_scenario(seed)
+
+    def test_rebuilt_day_changes(self):
+        """Day changes always rebuild every index."""
+        with mock.patch.object(windowed_leaderboards, 'REBUILD_FRACTION', 10 ** 9):
+            for seed in range(3):
+                self.run_scenario(seed)
+
+    def test_default_day_changes(self):
+        """Day changes pick between moving and rebuilding as in production."""
+        for seed in range(3):
+            self.run_scenario(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 """
 Database of computer science trivia questions with hints.
 Each question is a dictionary containing:
+- category: The topic of the question, used to pick questions by category
 - question: The trivia question
 - correct_answer: The correct answer
 - incorrect_answers: List of incorrect answers
@@ -10,6 +11,7 @@ Each question is a dictionary containing:
 TRIVIA_QUESTIONS = [
     # Programming Languages
     {
+        "category": "Programming Languages",
         "question": "What does CPU stand for?",
         "correct_answer": "Central Processing Unit",
         "incorrect_answers": [
@@ -20,6 +22,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is the main component that processes instructions in a computer"
     },
     {
+        "category": "Programming Languages",
         "question": "Which programming language is known as the 'mother of all programming languages'?",
         "correct_answer": "FORTRAN",
         "incorrect_answers": [
@@ -30,6 +33,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This language was developed in the 1950s and is still used in scientific computing"
     },
     {
+        "category": "Programming Languages",
         "question": "What does HTML stand for?",
         "correct_answer": "HyperText Markup Language",
         "incorrect_answers": [
@@ -40,6 +44,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This language is used to structure content on the web"
     },
     {
+        "category": "Programming Languages",
         "question": "Which company developed Python?",
         "correct_answer": "Guido van Rossum",
         "incorrect_answers": [
@@ -50,6 +55,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is the name of the individual who created Python, not a company"
     },
     {
+        "category": "Programming Languages",
         "question": "What is the smallest unit of digital information?",
         "correct_answer": "Bit",
         "incorrect_answers": [
@@ -60,6 +66,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a single binary digit, either 0 or 1"
     },
     {
+        "category": "Programming Languages",
         "question": "Which of these is NOT a programming paradigm?",
         "correct_answer": "Binary Programming",
         "incorrect_answers": [
@@ -70,6 +77,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This term refers to a way of organizing and structuring code"
     },
     {
+        "category": "Programming Languages",
         "question": "What does RAM stand for?",
         "correct_answer": "Random Access Memory",
         "incorrect_answers": [
@@ -80,6 +88,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is the temporary memory that your computer uses while running programs"
     },
     {
+        "category": "Programming Languages",
         "question": "Which of these is a type of computer virus?",
         "correct_answer": "Trojan Horse",
         "incorrect_answers": [
@@ -90,6 +99,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This type of malware disguises itself as legitimate software"
     },
     {
+        "category": "Programming Languages",
         "question": "What is the process of finding and fixing errors in code called?",
         "correct_answer": "Debugging",
         "incorrect_answers": [
@@ -100,6 +110,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This term comes from removing actual bugs from early computers"
     },
     {
+        "category": "Programming Languages",
         "question": "Which of these is NOT a web browser?",
         "correct_answer": "Microsoft Word",
         "incorrect_answers": [
@@ -110,6 +121,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a word processing application, not a web browser"
     },
     {
+        "category": "Programming Languages",
         "question": "What does URL stand for?",
         "correct_answer": "Uniform Resource Locator",
         "incorrect_answers": [
@@ -120,6 +132,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is the address you type to visit a website"
     },
     {
+        "category": "Programming Languages",
         "question": "Which of these is a type of computer network?",
         "correct_answer": "LAN",
         "incorrect_answers": [
@@ -130,6 +143,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This stands for Local Area Network"
     },
     {
+        "category": "Programming Languages",
         "question": "What is the process of converting source code into machine code called?",
         "correct_answer": "Compilation",
         "incorrect_answers": [
@@ -140,6 +154,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This process creates an executable program from your code"
     },
     {
+        "category": "Programming Languages",
         "question": "Which of these is NOT a data structure?",
         "correct_answer": "Computer",
         "incorrect_answers": [
@@ -150,6 +165,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a physical device, not a way to organize data"
     },
     {
+        "category": "Programming Languages",
         "question": "What does SQL stand for?",
         "correct_answer": "Structured Query Language",
         "incorrect_answers": [
@@ -161,6 +177,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Programming Languages
     {
+        "category": "Programming Languages",
         "question": "Which programming language was created by James Gosling?",
         "correct_answer": "Java",
         "incorrect_answers": [
@@ -171,6 +188,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This language's mascot is a coffee cup"
     },
     {
+        "category": "Programming Languages",
         "question": "What does PHP stand for?",
         "correct_answer": "PHP: Hypertext Preprocessor",
         "incorrect_answers": [
@@ -181,6 +199,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a server-side scripting language commonly used for web development"
     },
     {
+        "category": "Programming Languages",
         "question": "Which language is known as the 'mother of all modern programming languages'?",
         "correct_answer": "C",
         "incorrect_answers": [
@@ -191,6 +210,7 @@ TRIVIA_QUESTIONS = [
         "hint": "Many modern languages like C++, Java, and Python were influenced by this language"
     },
     {
+        "category": "Programming Languages",
         "question": "What does CSS stand for?",
         "correct_answer": "Cascading Style Sheets",
         "incorrect_answers": [
@@ -201,6 +221,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This language is used to style web pages"
     },
     {
+        "category": "Programming Languages",
         "question": "Which programming language is named after a snake?",
         "correct_answer": "Python",
         "incorrect_answers": [
@@ -212,6 +233,7 @@ TRIVIA_QUESTIONS = [
     },
     # Computer Hardware
     {
+        "category": "Computer Hardware",
         "question": "What does GPU stand for?",
         "correct_answer": "Graphics Processing Unit",
         "incorrect_answers": [
@@ -222,6 +244,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This component is specialized for handling graphics and parallel processing"
     },
     {
+        "category": "Computer Hardware",
         "question": "Which of these is NOT a type of computer port?",
         "correct_answer": "USB-C",
         "incorrect_answers": [
@@ -232,6 +255,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a newer type of connection that can handle both data and power"
     },
     {
+        "category": "Computer Hardware",
         "question": "What is the main function of a motherboard?",
         "correct_answer": "Connect all computer components",
         "incorrect_answers": [
@@ -242,6 +266,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This component is the main circuit board of a computer"
     },
     {
+        "category": "Computer Hardware",
         "question": "Which of these is a type of computer storage?",
         "correct_answer": "SSD",
         "incorrect_answers": [
@@ -252,6 +277,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a solid-state storage device that's faster than traditional hard drives"
     },
     {
+        "category": "Computer Hardware",
         "question": "What does HDD stand for?",
         "correct_answer": "Hard Disk Drive",
         "incorrect_answers": [
@@ -263,6 +289,7 @@ TRIVIA_QUESTIONS = [
     },
     # Computer Networks
     {
+        "category": "Computer Networks",
         "question": "What does DNS stand for?",
         "correct_answer": "Domain Name System",
         "incorrect_answers": [
@@ -273,6 +300,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This system converts human-readable domain names into IP addresses"
     },
     {
+        "category": "Computer Networks",
         "question": "Which of these is NOT a network topology?",
         "correct_answer": "Square",
         "incorrect_answers": [
@@ -283,6 +311,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a shape, not a way to arrange network devices"
     },
     {
+        "category": "Computer Networks",
         "question": "What is the maximum speed of a standard Ethernet connection?",
         "correct_answer": "1000 Mbps",
         "incorrect_answers": [
@@ -293,6 +322,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is also known as Gigabit Ethernet"
     },
     {
+        "category": "Computer Networks",
         "question": "Which protocol is used to send email?",
         "correct_answer": "SMTP",
         "incorrect_answers": [
@@ -303,6 +333,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This stands for Simple Mail Transfer Protocol"
     },
     {
+        "category": "Computer Networks",
         "question": "What does VPN stand for?",
         "correct_answer": "Virtual Private Network",
         "incorrect_answers": [
@@ -314,6 +345,7 @@ TRIVIA_QUESTIONS = [
     },
     # Computer Security
     {
+        "category": "Computer Security",
         "question": "What is the most common type of computer virus?",
         "correct_answer": "Trojan Horse",
         "incorrect_answers": [
@@ -324,6 +356,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This type of malware disguises itself as legitimate software"
     },
     {
+        "category": "Computer Security",
         "question": "Which of these is NOT a type of encryption?",
         "correct_answer": "Binary",
         "incorrect_answers": [
@@ -334,6 +367,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a number system, not a security method"
     },
     {
+        "category": "Computer Security",
         "question": "What is the purpose of a firewall?",
         "correct_answer": "Block unauthorized access",
         "incorrect_answers": [
@@ -344,6 +378,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a security system that monitors and controls network traffic"
     },
     {
+        "category": "Computer Security",
         "question": "Which of these is a type of password attack?",
         "correct_answer": "Brute Force",
         "incorrect_answers": [
@@ -354,6 +389,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This method tries every possible combination until it finds the right password"
     },
     {
+        "category": "Computer Security",
         "question": "What does SSL stand for?",
         "correct_answer": "Secure Sockets Layer",
         "incorrect_answers": [
@@ -365,6 +401,7 @@ TRIVIA_QUESTIONS = [
     },
     # Computer History
     {
+        "category": "Computer History",
         "question": "Who is known as the 'father of the computer'?",
         "correct_answer": "Charles Babbage",
         "incorrect_answers": [
@@ -375,6 +412,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This person designed the first mechanical computer in the 1830s"
     },
     {
+        "category": "Computer History",
         "question": "Which company created the first personal computer?",
         "correct_answer": "IBM",
         "incorrect_answers": [
@@ -385,6 +423,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This company released the IBM PC in 1981"
     },
     {
+        "category": "Computer History",
         "question": "What was the first computer mouse made of?",
         "correct_answer": "Wood",
         "incorrect_answers": [
@@ -395,6 +434,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This was created by Douglas Engelbart in the 1960s"
     },
     {
+        "category": "Computer History",
         "question": "Which was the first computer to use a graphical user interface?",
         "correct_answer": "Xerox Alto",
         "incorrect_answers": [
@@ -405,6 +445,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This computer was developed in the 1970s and inspired the Macintosh"
     },
     {
+        "category": "Computer History",
         "question": "What was the first computer virus called?",
         "correct_answer": "Creeper",
         "incorrect_answers": [
@@ -416,6 +457,7 @@ TRIVIA_QUESTIONS = [
     },
     # Computer Science Concepts
     {
+        "category": "Computer Science Concepts",
         "question": "What is the time complexity of binary search?",
         "correct_answer": "O(log n)",
         "incorrect_answers": [
@@ -426,6 +468,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This algorithm divides the search space in half with each step"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "Which of these is NOT a sorting algorithm?",
         "correct_answer": "Binary",
         "incorrect_answers": [
@@ -436,6 +479,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a number system, not a way to organize data"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "What is the purpose of a stack in programming?",
         "correct_answer": "Store data in LIFO order",
         "incorrect_answers": [
@@ -446,6 +490,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This data structure follows the Last In, First Out principle"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "Which of these is a type of computer memory?",
         "correct_answer": "Cache",
         "incorrect_answers": [
@@ -456,6 +501,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a small, fast memory that stores frequently accessed data"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "What is the purpose of an operating system?",
         "correct_answer": "Manage computer resources",
         "incorrect_answers": [
@@ -467,6 +513,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Computer Science Concepts
     {
+        "category": "Computer Science Concepts",
         "question": "What is the time complexity of bubble sort?",
         "correct_answer": "O(n²)",
         "incorrect_answers": [
@@ -477,6 +524,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This sorting algorithm repeatedly steps through the list and swaps adjacent elements"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "Which of these is NOT a type of computer network?",
         "correct_answer": "WAN",
         "incorrect_answers": [
@@ -487,6 +535,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a type of network that covers a large geographic area"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "What is the purpose of a compiler?",
         "correct_answer": "Convert source code to machine code",
         "incorrect_answers": [
@@ -497,6 +546,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This program translates high-level programming language into low-level machine code"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "Which of these is a type of computer memory?",
         "correct_answer": "ROM",
         "incorrect_answers": [
@@ -507,6 +557,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is Read-Only Memory that stores permanent data"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "What is the purpose of an algorithm?",
         "correct_answer": "Solve a problem step by step",
         "incorrect_answers": [
@@ -518,6 +569,7 @@ TRIVIA_QUESTIONS = [
     },
     # Web Development
     {
+        "category": "Web Development",
         "question": "What does JavaScript primarily run on?",
         "correct_answer": "Web browser",
         "incorrect_answers": [
@@ -528,6 +580,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This programming language is commonly used to make web pages interactive"
     },
     {
+        "category": "Web Development",
         "question": "Which of these is NOT a web development framework?",
         "correct_answer": "Java",
         "incorrect_answers": [
@@ -538,6 +591,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a programming language, not a framework"
     },
     {
+        "category": "Web Development",
         "question": "What is the purpose of CSS?",
         "correct_answer": "Style web pages",
         "incorrect_answers": [
@@ -548,6 +602,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This language controls the appearance and layout of web pages"
     },
     {
+        "category": "Web Development",
         "question": "Which of these is a type of web server?",
         "correct_answer": "Apache",
         "incorrect_answers": [
@@ -558,6 +613,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is one of the most popular web server software"
     },
     {
+        "category": "Web Development",
         "question": "What is the purpose of a cookie in web development?",
         "correct_answer": "Store user data",
         "incorrect_answers": [
@@ -569,6 +625,7 @@ TRIVIA_QUESTIONS = [
     },
     # Database Systems
     {
+        "category": "Database Systems",
         "question": "Which of these is NOT a type of database?",
         "correct_answer": "HTML",
         "incorrect_answers": [
@@ -579,6 +636,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a markup language, not a database system"
     },
     {
+        "category": "Database Systems",
         "question": "What is the purpose of a database index?",
         "correct_answer": "Speed up data retrieval",
         "incorrect_answers": [
@@ -589,6 +647,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This structure helps quickly locate data in a database"
     },
     {
+        "category": "Database Systems",
         "question": "Which of these is a NoSQL database?",
         "correct_answer": "MongoDB",
         "incorrect_answers": [
@@ -599,6 +658,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This database stores data in a document-based format"
     },
     {
+        "category": "Database Systems",
         "question": "What is the purpose of a database transaction?",
         "correct_answer": "Ensure data consistency",
         "incorrect_answers": [
@@ -609,6 +669,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This ensures that database operations are atomic and reliable"
     },
     {
+        "category": "Database Systems",
         "question": "Which of these is NOT a database operation?",
         "correct_answer": "RENDER",
         "incorrect_answers": [
@@ -620,6 +681,7 @@ TRIVIA_QUESTIONS = [
     },
     # Artificial Intelligence
     {
+        "category": "Artificial Intelligence",
         "question": "What is machine learning?",
         "correct_answer": "Training computers to learn from data",
         "incorrect_answers": [
@@ -630,6 +692,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This field focuses on creating systems that can learn and improve from experience"
     },
     {
+        "category": "Artificial Intelligence",
         "question": "Which of these is NOT a type of machine learning?",
         "correct_answer": "Binary Learning",
         "incorrect_answers": [
@@ -640,6 +703,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is not a recognized category of machine learning"
     },
     {
+        "category": "Artificial Intelligence",
         "question": "What is the purpose of a neural network?",
         "correct_answer": "Process information like the human brain",
         "incorrect_answers": [
@@ -650,6 +714,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is inspired by the structure of biological neural networks"
     },
     {
+        "category": "Artificial Intelligence",
         "question": "Which of these is a type of AI application?",
         "correct_answer": "Computer Vision",
         "incorrect_answers": [
@@ -660,6 +725,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This field focuses on enabling computers to understand visual information"
     },
     {
+        "category": "Artificial Intelligence",
         "question": "What is the purpose of natural language processing?",
         "correct_answer": "Understand human language",
         "incorrect_answers": [
@@ -671,6 +737,7 @@ TRIVIA_QUESTIONS = [
     },
     # Mobile Development
     {
+        "category": "Mobile Development",
         "question": "Which of these is NOT a mobile operating system?",
         "correct_answer": "Windows XP",
         "incorrect_answers": [
@@ -681,6 +748,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a desktop operating system"
     },
     {
+        "category": "Mobile Development",
         "question": "What is the purpose of a mobile app?",
         "correct_answer": "Provide functionality on mobile devices",
         "incorrect_answers": [
@@ -691,6 +759,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is software designed to run on mobile devices"
     },
     {
+        "category": "Mobile Development",
         "question": "Which of these is a mobile development framework?",
         "correct_answer": "React Native",
         "incorrect_answers": [
@@ -701,6 +770,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This framework allows you to build mobile apps using JavaScript"
     },
     {
+        "category": "Mobile Development",
         "question": "What is the purpose of mobile responsive design?",
         "correct_answer": "Make websites work on mobile devices",
         "incorrect_answers": [
@@ -711,6 +781,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This ensures websites look good on all screen sizes"
     },
     {
+        "category": "Mobile Development",
         "question": "Which of these is NOT a mobile app store?",
         "correct_answer": "Amazon",
         "incorrect_answers": [
@@ -722,6 +793,7 @@ TRIVIA_QUESTIONS = [
     },
     # Cloud Computing
     {
+        "category": "Cloud Computing",
         "question": "What is cloud computing?",
         "correct_answer": "Using remote servers over the internet",
         "incorrect_answers": [
@@ -732,6 +804,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This allows you to access computing resources over the internet"
     },
     {
+        "category": "Cloud Computing",
         "question": "Which of these is NOT a cloud service provider?",
         "correct_answer": "Oracle",
         "incorrect_answers": [
@@ -742,6 +815,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This company is primarily known for databases, not cloud services"
     },
     {
+        "category": "Cloud Computing",
         "question": "What is the purpose of cloud storage?",
         "correct_answer": "Store data on remote servers",
         "incorrect_answers": [
@@ -752,6 +826,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This allows you to store and access data over the internet"
     },
     {
+        "category": "Cloud Computing",
         "question": "Which of these is a type of cloud service?",
         "correct_answer": "SaaS",
         "incorrect_answers": [
@@ -762,6 +837,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This stands for Software as a Service"
     },
     {
+        "category": "Cloud Computing",
         "question": "What is the purpose of cloud computing?",
         "correct_answer": "Access computing resources remotely",
         "incorrect_answers": [
@@ -773,6 +849,7 @@ TRIVIA_QUESTIONS = [
     },
     # Cybersecurity
     {
+        "category": "Cybersecurity",
         "question": "What is a 'zero-day' vulnerability?",
         "correct_answer": "A security flaw unknown to the vendor",
         "incorrect_answers": [
@@ -783,6 +860,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This type of vulnerability is called 'zero-day' because developers have zero days to fix it before it's exploited"
     },
     {
+        "category": "Cybersecurity",
         "question": "Which of these is NOT a type of cyber attack?",
         "correct_answer": "Data Mining",
         "incorrect_answers": [
@@ -793,6 +871,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a legitimate data analysis technique, not a malicious attack"
     },
     {
+        "category": "Cybersecurity",
         "question": "What is the purpose of two-factor authentication?",
         "correct_answer": "Add an extra layer of security",
         "incorrect_answers": [
@@ -803,6 +882,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This requires both something you know and something you have to verify your identity"
     },
     {
+        "category": "Cybersecurity",
         "question": "Which of these is a type of encryption key?",
         "correct_answer": "Public Key",
         "incorrect_answers": [
@@ -813,6 +893,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This key can be freely shared and is used to encrypt messages"
     },
     {
+        "category": "Cybersecurity",
         "question": "What is the purpose of a honeypot?",
         "correct_answer": "Trap cyber attackers",
         "incorrect_answers": [
@@ -824,6 +905,7 @@ TRIVIA_QUESTIONS = [
     },
     # Game Development
     {
+        "category": "Game Development",
         "question": "What is a game engine?",
         "correct_answer": "Software framework for game development",
         "incorrect_answers": [
@@ -834,6 +916,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This provides the core functionality needed to create video games"
     },
     {
+        "category": "Game Development",
         "question": "Which of these is NOT a game development concept?",
         "correct_answer": "Data Mining",
         "incorrect_answers": [
@@ -844,6 +927,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a data analysis technique, not a game development concept"
     },
     {
+        "category": "Game Development",
         "question": "What is the purpose of a sprite in game development?",
         "correct_answer": "Represent game objects visually",
         "incorrect_answers": [
@@ -854,6 +938,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a 2D image or animation used in games"
     },
     {
+        "category": "Game Development",
         "question": "Which of these is a popular game engine?",
         "correct_answer": "Unity",
         "incorrect_answers": [
@@ -864,6 +949,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This engine is known for its cross-platform capabilities"
     },
     {
+        "category": "Game Development",
         "question": "What is the purpose of game physics?",
         "correct_answer": "Simulate realistic movement",
         "incorrect_answers": [
@@ -875,6 +961,7 @@ TRIVIA_QUESTIONS = [
     },
     # Software Engineering
     {
+        "category": "Software Engineering",
         "question": "What is the purpose of version control?",
         "correct_answer": "Track changes in code",
         "incorrect_answers": [
@@ -885,6 +972,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This system helps manage different versions of software"
     },
     {
+        "category": "Software Engineering",
         "question": "Which of these is NOT a software development methodology?",
         "correct_answer": "Data Mining",
         "incorrect_answers": [
@@ -895,6 +983,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a data analysis technique, not a development methodology"
     },
     {
+        "category": "Software Engineering",
         "question": "What is the purpose of unit testing?",
         "correct_answer": "Test individual components",
         "incorrect_answers": [
@@ -905,6 +994,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This tests small, isolated parts of the code"
     },
     {
+        "category": "Software Engineering",
         "question": "Which of these is a type of software architecture?",
         "correct_answer": "Microservices",
         "incorrect_answers": [
@@ -915,6 +1005,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This architecture breaks down applications into small, independent services"
     },
     {
+        "category": "Software Engineering",
         "question": "What is the purpose of continuous integration?",
         "correct_answer": "Automate code integration",
         "incorrect_answers": [
@@ -926,6 +1017,7 @@ TRIVIA_QUESTIONS = [
     },
     # Computer Graphics
     {
+        "category": "Computer Graphics",
         "question": "What is ray tracing?",
         "correct_answer": "Simulate light behavior in graphics",
         "incorrect_answers": [
@@ -936,6 +1028,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This technique creates realistic lighting effects in computer graphics"
     },
     {
+        "category": "Computer Graphics",
         "question": "Which of these is NOT a graphics format?",
         "correct_answer": "TXT",
         "incorrect_answers": [
@@ -946,6 +1039,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a text file format, not an image format"
     },
     {
+        "category": "Computer Graphics",
         "question": "What is the purpose of texture mapping?",
         "correct_answer": "Add surface detail to 3D models",
         "incorrect_answers": [
@@ -956,6 +1050,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This technique applies 2D images to 3D surfaces"
     },
     {
+        "category": "Computer Graphics",
         "question": "Which of these is a 3D modeling software?",
         "correct_answer": "Blender",
         "incorrect_answers": [
@@ -966,6 +1061,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a free and open-source 3D creation suite"
     },
     {
+        "category": "Computer Graphics",
         "question": "What is the purpose of anti-aliasing?",
         "correct_answer": "Smooth jagged edges in graphics",
         "incorrect_answers": [
@@ -977,6 +1073,7 @@ TRIVIA_QUESTIONS = [
     },
     # Computer Vision
     {
+        "category": "Computer Vision",
         "question": "What is image recognition?",
         "correct_answer": "Identify objects in images",
         "incorrect_answers": [
@@ -987,6 +1084,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This technology allows computers to understand and identify objects in images"
     },
     {
+        "category": "Computer Vision",
         "question": "Which of these is NOT a computer vision task?",
         "correct_answer": "Data Mining",
         "incorrect_answers": [
@@ -997,6 +1095,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a data analysis technique, not a computer vision task"
     },
     {
+        "category": "Computer Vision",
         "question": "What is the purpose of edge detection?",
         "correct_answer": "Find boundaries in images",
         "incorrect_answers": [
@@ -1007,6 +1106,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This technique identifies significant changes in image brightness"
     },
     {
+        "category": "Computer Vision",
         "question": "Which of these is a computer vision library?",
         "correct_answer": "OpenCV",
         "incorrect_answers": [
@@ -1017,6 +1117,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a popular library for computer vision and image processing"
     },
     {
+        "category": "Computer Vision",
         "question": "What is the purpose of facial recognition?",
         "correct_answer": "Identify people from images",
         "incorrect_answers": [
@@ -1028,6 +1129,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Programming Languages Questions
     {
+        "category": "Programming Languages",
         "question": "Which programming language is known for its 'write once, run anywhere' slogan?",
         "correct_answer": "Java",
         "incorrect_answers": [
@@ -1038,6 +1140,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This language runs on a virtual machine"
     },
     {
+        "category": "Programming Languages",
         "question": "What does IDE stand for?",
         "correct_answer": "Integrated Development Environment",
         "incorrect_answers": [
@@ -1048,6 +1151,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This is a software application that provides comprehensive tools for development"
     },
     {
+        "category": "Programming Languages",
         "question": "Which language is commonly used for system programming?",
         "correct_answer": "C",
         "incorrect_answers": [
@@ -1058,6 +1162,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This language provides low-level access to memory and hardware"
     },
     {
+        "category": "Programming Languages",
         "question": "What is the purpose of garbage collection?",
         "correct_answer": "Automatically manage memory",
         "incorrect_answers": [
@@ -1068,6 +1173,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This feature automatically frees memory that's no longer needed"
     },
     {
+        "category": "Programming Languages",
         "question": "Which language is known for its extensive use in data science?",
         "correct_answer": "Python",
         "incorrect_answers": [
@@ -1079,6 +1185,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Computer Hardware Questions
     {
+        "category": "Computer Hardware",
         "question": "What is the purpose of a heatsink?",
         "correct_answer": "Cool computer components",
         "incorrect_answers": [
@@ -1089,6 +1196,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This component helps prevent overheating by dissipating heat"
     },
     {
+        "category": "Computer Hardware",
         "question": "What is the purpose of a power supply unit?",
         "correct_answer": "Convert power for computer components",
         "incorrect_answers": [
@@ -1099,6 +1207,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This component converts AC power to DC power for the computer"
     },
     {
+        "category": "Computer Hardware",
         "question": "Which of these is a type of computer cooling system?",
         "correct_answer": "Liquid Cooling",
         "incorrect_answers": [
@@ -1109,6 +1218,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This system uses liquid to transfer heat away from components"
     },
     {
+        "category": "Computer Hardware",
         "question": "What is the purpose of a sound card?",
         "correct_answer": "Process audio signals",
         "incorrect_answers": [
@@ -1120,6 +1230,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Computer Networks Questions
     {
+        "category": "Computer Networks",
         "question": "What is the purpose of a router?",
         "correct_answer": "Direct network traffic",
         "incorrect_answers": [
@@ -1130,6 +1241,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This device forwards data packets between computer networks"
     },
     {
+        "category": "Computer Networks",
         "question": "Which protocol is used for secure web browsing?",
         "correct_answer": "HTTPS",
         "incorrect_answers": [
@@ -1140,6 +1252,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This protocol adds encryption to standard web traffic"
     },
     {
+        "category": "Computer Networks",
         "question": "What is the purpose of a firewall?",
         "correct_answer": "Control network access",
         "incorrect_answers": [
@@ -1150,6 +1263,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This security system monitors and controls incoming and outgoing network traffic"
     },
     {
+        "category": "Computer Networks",
         "question": "Which of these is a type of wireless network?",
         "correct_answer": "Wi-Fi",
         "incorrect_answers": [
@@ -1160,6 +1274,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This technology allows devices to connect to the internet without cables"
     },
     {
+        "category": "Computer Networks",
         "question": "What is the purpose of a network switch?",
         "correct_answer": "Connect network devices",
         "incorrect_answers": [
@@ -1171,6 +1286,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Computer Security Questions
     {
+        "category": "Computer Security",
         "question": "What is the purpose of encryption?",
         "correct_answer": "Protect data privacy",
         "incorrect_answers": [
@@ -1181,6 +1297,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This process converts data into a secure format"
     },
     {
+        "category": "Computer Security",
         "question": "Which of these is a type of malware?",
         "correct_answer": "Ransomware",
         "incorrect_answers": [
@@ -1191,6 +1308,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This malicious software encrypts files and demands payment"
     },
     {
+        "category": "Computer Security",
         "question": "What is the purpose of a VPN?",
         "correct_answer": "Create secure connections",
         "incorrect_answers": [
@@ -1201,6 +1319,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This creates an encrypted tunnel for data transmission"
     },
     {
+        "category": "Computer Security",
         "question": "Which of these is a security best practice?",
         "correct_answer": "Regular password updates",
         "incorrect_answers": [
@@ -1211,6 +1330,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This helps maintain account security over time"
     },
     {
+        "category": "Computer Security",
         "question": "What is the purpose of biometric authentication?",
         "correct_answer": "Verify identity using unique features",
         "incorrect_answers": [
@@ -1222,6 +1342,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Computer History Questions
     {
+        "category": "Computer History",
         "question": "Who is known as the 'mother of programming'?",
         "correct_answer": "Ada Lovelace",
         "incorrect_answers": [
@@ -1232,6 +1353,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This person wrote the first algorithm intended for machine processing"
     },
     {
+        "category": "Computer History",
         "question": "Which was the first commercial microprocessor?",
         "correct_answer": "Intel 4004",
         "incorrect_answers": [
@@ -1242,6 +1364,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This processor was released by Intel in 1971"
     },
     {
+        "category": "Computer History",
         "question": "What was the first computer to use a mouse?",
         "correct_answer": "Xerox Alto",
         "incorrect_answers": [
@@ -1252,6 +1375,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This computer was developed in the 1970s"
     },
     {
+        "category": "Computer History",
         "question": "Which company created the first personal computer?",
         "correct_answer": "IBM",
         "incorrect_answers": [
@@ -1262,6 +1386,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This company released the IBM PC in 1981"
     },
     {
+        "category": "Computer History",
         "question": "What was the first computer virus called?",
         "correct_answer": "Creeper",
         "incorrect_answers": [
@@ -1273,6 +1398,7 @@ TRIVIA_QUESTIONS = [
     },
     # Additional Computer Science Concepts Questions
     {
+        "category": "Computer Science Concepts",
         "question": "What is the purpose of a binary tree?",
         "correct_answer": "Organize hierarchical data",
         "incorrect_answers": [
@@ -1283,6 +1409,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This data structure has at most two children per node"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "Which of these is a type of algorithm?",
         "correct_answer": "Binary Search",
         "incorrect_answers": [
@@ -1293,6 +1420,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This algorithm divides the search space in half with each step"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "What is the purpose of recursion?",
         "correct_answer": "Solve problems by breaking them down",
         "incorrect_answers": [
@@ -1303,6 +1431,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This technique involves a function calling itself"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "Which of these is a type of data structure?",
         "correct_answer": "Hash Table",
         "incorrect_answers": [
@@ -1313,6 +1442,7 @@ TRIVIA_QUESTIONS = [
         "hint": "This structure provides fast access to data using key-value pairs"
     },
     {
+        "category": "Computer Science Concepts",
         "question": "What is the purpose of object-oriented programming?",
         "correct_answer": "Organize code into reusable objects",
         "incorrect_answers": [
@@ -0,0 +1,367 @@
+# Import required libraries for compact counter arrays, timing, and type hints
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from leaderboard_index import LeaderboardIndex
+
+# Leaderboard periods: the lifetime leaderboard, and rolling windows of whole UTC days
+PERIOD_ALL = 'all'
+PERIOD_DAYS = {'daily': 1, 'weekly': 7, 'monthly': 30}
+PERIODS = (PERIOD_ALL,) + tuple(PERIOD_DAYS)
+# How each period is named in leaderboard headers and command choices
+PERIOD_TITLES = {PERIOD_ALL: 'All Time', 'daily': 'Today (UTC)', 'weekly': 'Last 7 Days', 'monthly': 'Last 30 Days'}
+
+SECONDS_PER_DAY = 86400
+
+# The counters kept for every day, in the order they are stored
+_CORRECT, _TOTAL, _HINTS = range(3)
+_FIELDS = 3
+
+# A day change moving more than 1/REBUILD_FRACTION of the windows rebuilds the indexes instead
+REBUILD_FRACTION = 8
+
+# A windowed scope and user: (guild ID, or None for totals across guilds; user ID)
+WindowKey = Tuple[Optional[int], int]
+# One change to add to the windows: (timestamp, scope, user ID, correct, total, hints)
+WindowEntry = Tuple[float, Optional[int], int, int, int, int]
+
+
+class UserWindow:
+    """The recent per-day counters of one user in one scope.
+
+    buckets is a ring buffer holding the correct answers, total answers and
+    hints of each of the last `days` days: day d lives at slot d % days.
+    sums holds the same three counters summed over each period, so reading a
+    user's weekly totals never adds up their days.
+    """
+    __slots__ = ('day', 'buckets', 'sums')
+
+    def __init__(self, day: int, days: int, periods: int):
+        """Create an empty window whose newest day is day.
+
+        Args:
+            day (int): The day number (days since the epoch, UTC) of the newest bucket
+            days (int): The number of day buckets in the ring
+            periods (int): The number of periods summed
+        """
+        self.day = day
+        self.buckets = array('I', [0]) * (days * _FIELDS)
+        self.sums = array('I', [0]) * (periods * _FIELDS)
+
+
+class WindowedLeaderboards:
+    """Leaderboards over rolling windows of recent days, such as the last 7 days.
+
+    Every user who answered in the longest window has one UserWindow per scope
+    (guild, or None for totals across guilds), so memory is bounded by the
+    active users times the window length, however long the bot has been running.
+    Each period of each scope has its own LeaderboardIndex, moved one user at a
+    time by add(), just like the lifetime leaderboards in StatsManager.
+
+    The users active on each day are remembered until that day leaves the longest
+    window. When the day changes, only the users active on the days that fall out
+    of a period are touched: their windows are advanced (subtracting the expired
+    days from the sums and clearing their slots for reuse) and they are moved in
+    the indexes, or dropped once nothing is left. Every other window keeps its
+    sums unchanged and is advanced lazily the next time it is used, so expiring
+    a day costs O(1) per change recorded on that day instead of a pass over
+    every user. If most users are affected anyway, the indexes are rebuilt
+    with one sort each instead, which is cheaper than moving every user.
+    """
+
+    def __init__(self, min_questions: int = 10, periods: Optional[Dict[str, int]] = None,
+                 clock: Callable[[], float] = time.time):
+        """Initialize empty windows.
+
+        Args:
+            min_questions (int): The number of questions a user must have answered in a period to be ranked.
+            periods (Dict[str, int], optional): Period names and their lengths in days. Defaults to PERIOD_DAYS.
+            clock (Callable[[], float]): Returns the current UNIX time; replaceable for tests and benchmarks.
+        """
+        self.min_questions = min_questions
+        self.periods = dict(PERIOD_DAYS if periods is None else periods)
+        # Position of every period in UserWindow.sums, and its length in days
+        self._slots = {period: slot for slot, period in enumerate(self.periods)}
+        self._lengths = list(self.periods.values())
+        self.days = max(self._lengths)  # Day buckets per user: enough for the longest period
+        self._longest = self._lengths.index(self.days)
+        self.clock = clock
+        self.today = self._day(clock())
+        self.windows: Dict[WindowKey, UserWindow] = {}
+        # The users active on each day still in the longest window: day number -> (scope, user ID) keys
+        self._active_days: Dict[int, Set[WindowKey]] = {}
+        self._zeros = array('I', [0]) * (self.days * _FIELDS)  # Copied over slots that are reused
+        # Ranked index of every (scope, period) with at least one user
+        self.indexes: Dict[Tuple[Optional[int], str], LeaderboardIndex] = {}
+
+    @staticmethod
+    def _day(timestamp: float) -> int:
+        """Return the UTC day number of a UNIX timestamp."""
+        return int(timestamp // SECONDS_PER_DAY)
+
+    def window_start(self) -> int:
+        """Return the UNIX time the longest window starts at: the oldest history that still counts."""
+        return (self._day(self.clock()) - self.days + 1) * SECONDS_PER_DAY
+
+    def _advance(self, window: UserWindow, day: int):
+        """Move a window forward so its newest bucket is day, expiring the days that fall out.
+
+        Only the days leaving a period are subtracted from its sums, and only the
+        slots the new days reuse are cleared, so the work is bounded by the number
+        of days that passed (and by the window length after a long gap).
+        """
+        old = window.day
+        if day <= old:
+            return
+        window.day = day
+        buckets, sums, days = window.buckets, window.sums, self.days
+        if day - old >= days:
+            # Every day in the ring has expired
+            buckets[:] = self._zeros
+            sums[:] = self._zeros[:len(sums)]
+            return
+        for slot, length in enumerate(self._lengths):
+            # Days old - length + 1 up to day - length were in the period and no longer are
+            base = slot * _FIELDS
+            for expired in range(old - length + 1, min(old, day - length) + 1):
+                bucket = (expired % days) * _FIELDS
+                if buckets[bucket + _TOTAL] or buckets[bucket + _HINTS]:
+                    sums[base + _CORRECT] -= buckets[bucket + _CORRECT]
+                    sums[base + _TOTAL] -= buckets[bucket + _TOTAL]
+                    sums[base + _HINTS] -= buckets[bucket + _HINTS]
+        self._clear_days(buckets, old, day)
+
+    def _clear_days(self, buckets: array, old: int, day: int):
+        """Clear the slots of days old + 1 up to day (fewer than self.days of them) for reuse.
+
+        The slots are contiguous except where they wrap around the end of the ring,
+        so this takes at most two slice assignments.
+        """
+        days = self.days
+        first = (old + 1) % days
+        end = first + day - old
+        if end <= days:
+            buckets[first * _FIELDS:end * _FIELDS] = self._zeros[:(end - first) * _FIELDS]
+        else:
+            buckets[first * _FIELDS:] = self._zeros[:(days - first) * _FIELDS]
+            buckets[:(end - days) * _FIELDS] = self._zeros[:(end - days) * _FIELDS]
+
+    def _add_to_window(self, window: UserWindow, day: int, correct: int, total: int, hints: int):
+        """Add counters to one day of a window that has already been advanced to at least that day."""
+        if day <= window.day - self.days:
+            return
+        bucket = (day % self.days) * _FIELDS
+        buckets, sums = window.buckets, window.sums
+        buckets[bucket + _CORRECT] += correct
+        buckets[bucket + _TOTAL] += total
+        buckets[bucket + _HINTS] += hints
+        for slot, length in enumerate(self._lengths):
+            if day > window.day - length:
+                base = slot * _FIELDS
+                sums[base + _CORRECT] += correct
+                sums[base + _TOTAL] += total
+                sums[base + _HINTS] += hints
+
+    def _window(self, key: WindowKey, day: int) -> UserWindow:
+        """Return a user's window advanced to day, creating an empty one, and mark the user active on day."""
+        window = self.windows.get(key)
+        if window is None:
+            window = self.windows[key] = UserWindow(day, self.days, len(self._lengths))
+        else:
+            self._advance(window, day)
+        active = self._active_days.get(day)
+        if active is None:
+            active = self._active_days[day] = set()
+        active.add(key)
+        return window
+
+    def _is_empty(self, window: UserWindow) -> bool:
+        """Return True if nothing is left in a window's longest period, so it can be dropped."""
+        base = self._longest * _FIELDS
+        return not window.sums[base + _TOTAL] and not window.sums[base + _HINTS]
+
+    def _check_day(self):
+        """Expire the days that ended since the last call, if a new day has started.
+
+        The clock moving backwards never un-expires anything: changes then count
+        towards the newest day seen.
+        """
+        today = self._day(self.clock())
+        if today > self.today:
+            self._roll(today)
+
+    def _roll(self, today: int):
+        """Expire the days that fall out of each period between the last known day and today.
+
+        Only the users active on those days are advanced and moved in the indexes.
+        """
+        previous, self.today = self.today, today
+        affected: Set[WindowKey] = set()
+        for length in self._lengths:
+            # Days previous - length + 1 up to today - length leave this period
+            for day in range(previous - length + 1, min(previous, today - length) + 1):
+                affected.update(self._active_days.get(day, ()))
+        for day in [day for day in self._active_days if day <= today - self.days]:
+            del self._active_days[day]
+        if len(affected) * REBUILD_FRACTION > len(self.windows):
+            self._rebuild(today, affected)
+            return
+        for key in affected:
+            window = self.windows.get(key)
+            if window is None:
+                continue
+            self._advance(window, today)
+            scope, user_id = key
+            if self._is_empty(window):
+                del self.windows[key]
+                for period in self._slots:
+                    index = self.indexes.get((scope, period))
+                    if index is not None:
+                        index.remove(user_id)
+            else:
+                self._update_indexes(key, window)
+
+    def _update_indexes(self, key: WindowKey, window: UserWindow):
+        """Move a user to their current position in every period's index of their scope."""
+        scope, user_id = key
+        sums = window.sums
+        for period, slot in self._slots.items():
+            base = slot * _FIELDS
+            index = self.indexes.get((scope, period))
+            if index is None:
+                index = self.indexes[(scope, period)] = LeaderboardIndex(self.min_questions)
+            index.update(user_id, sums[base + _CORRECT], sums[base + _TOTAL])
+
+    def add(self, scope: Optional[int], user_id: int, correct: int = 0, total: int = 0, hints: int = 0):
+        """Count changes to a user's counters as happening now.
+
+        Args:
+            scope (int, optional): The guild the changes happened in, or None for the totals across guilds
+            user_id (int): The Discord user ID of the player
+            correct, total, hints (int): Amounts to add to the correct answers, total answers and hints
+
+        If answers were added, the user is moved to their new position in every period's index.
+        """
+        self._check_day()
+        key = (scope, user_id)
+        window = self._window(key, self.today)
+        self._add_to_window(window, self.today, correct, total, hints)
+        if total:
+            self._update_indexes(key, window)
+
+    def load(self, entries: Iterable[WindowEntry]):
+        """Replace the windows with past changes, for example replayed from a journal on startup.
+
+        Args:
+            entries (Iterable[WindowEntry]): (timestamp, scope, user_id, correct, total, hints)
+                                             tuples in any order. Entries older than the
+                                             window are skipped; future ones count as today.
+        """
+        days = self.days
+        today = self._day(self.clock())
+        first_day = today - days + 1
+        self.today = today
+        self.windows = {}
+        self._active_days = {}
+        # Only fill the day buckets here; the sums are computed once per window afterwards
+        for timestamp, scope, user_id, correct, total, hints in entries:
+            day = min(self._day(timestamp), today)
+            if day < first_day:
+                continue
+            key = (scope, user_id)
+            window = self.windows.get(key)
+            if window is None:
+                window = self.windows[key] = UserWindow(day, days, len(self._lengths))
+            elif day > window.day:
+                if day - window.day >= days:
+                    window.buckets[:] = self._zeros
+                else:
+                    self._clear_days(window.buckets, window.day, day)
+                window.day = day
+            elif day <= window.day - days:
+                continue
+            active = self._active_days.get(day)
+            if active is None:
+                active = self._active_days[day] = set()
+            active.add(key)
+            bucket = (day % days) * _FIELDS
+            buckets = window.buckets
+            buckets[bucket + _CORRECT] += correct
+            buckets[bucket + _TOTAL] += total
+            buckets[bucket + _HINTS] += hints
+        for window in self.windows.values():
+            # Sum the days in each period ending at the window's newest day; the rebuild advances it to today
+            buckets, sums = window.buckets, window.sums
+            for day in range(max(window.day - days + 1, first_day), window.day + 1):
+                bucket = (day % days) * _FIELDS
+                if buckets[bucket + _TOTAL] or buckets[bucket + _HINTS]:
+                    for slot, length in enumerate(self._lengths):
+                        if day > window.day - length:
+                            base = slot * _FIELDS
+                            sums[base + _CORRECT] += buckets[bucket + _CORRECT]
+                            sums[base + _TOTAL] += buckets[bucket + _TOTAL]
+                            sums[base + _HINTS] += buckets[bucket + _HINTS]
+        self._rebuild(today, list(self.windows))
+
+    def _rebuild(self, today: int, stale: Iterable[WindowKey]):
+        """Rebuild every index with one sort.
+
+        Args:
+            today (int): The current day number
+            stale (Iterable[WindowKey]): The windows whose sums may include expired days. They are
+                                         advanced to today first, and dropped if nothing is left.
+        """
+        for key in stale:
+            window = self.windows.get(key)
+            if window is not None:
+                self._advance(window, today)
+                if self._is_empty(window):
+                    del self.windows[key]
+        entries_by_index: Dict[Tuple[Optional[int], str], List[Tuple[int, int, int]]] = {}
+        for (scope, user_id), window in self.windows.items():
+            sums = window.sums
+            for period, slot in self._slots.items():
+                base = slot * _FIELDS
+                entries_by_index.setdefault((scope, period), []).append(
+                    (user_id, sums[base + _CORRECT], sums[base + _TOTAL]))
+        self.indexes = {}
+        for index_key, index_entries in entries_by_index.items():
+            index = self.indexes[index_key] = LeaderboardIndex(self.min_questions)
+            index.rebuild(index_entries)
+
+    def _check_period(self, period: str) -> int:
+        """Return the position of a period in the sums, or raise ValueError if it isn't a windowed period."""
+        slot = self._slots.get(period)
+        if slot is None:
+            raise ValueError(f"Unknown leaderboard period: {period!r} (expected one of {', '.join(self.periods)})")
+        return slot
+
+    def index(self, scope: Optional[int], period: str) -> LeaderboardIndex:
+        """Return the ranked index of a period in a scope, with every ended day expired.
+
+        Raises:
+            ValueError: If period is not one of the windowed periods
+        """
+        self._check_period(period)
+        self._check_day()
+        index = self.indexes.get((scope, period))
+        return index if index is not None else LeaderboardIndex(self.min_questions)
+
+    def totals(self, scope: Optional[int], user_id: int, period: str) -> Tuple[int, int, int]:
+        """Return a user's (correct, total, hints) in a period, all 0 if they were not active in it.
+
+        Raises:
+            ValueError: If period is not one of the windowed periods
+        """
+        base = self._check_period(period) * _FIELDS
+        self._check_day()
+        window = self.windows.get((scope, user_id))
+        if window is None:
+            return 0, 0, 0
+        sums = window.sums
+        return sums[base + _CORRECT], sums[base + _TOTAL], sums[base + _HINTS]
+
+    def __len__(self) -> int:
+        """Return the number of (scope, user) windows currently kept."""
+        return len(self.windows)